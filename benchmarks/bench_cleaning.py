@@ -0,0 +1,170 @@
+"""Benchmark process_and_clean_data on synthetic lead tables.
+
+Times the current pipeline against the per-row .apply version it replaced
+and checks that both return the same rows, in the same order, with the same
+index. Phone dedup is switched off for the comparison, since the old version
+had none.
+
+    python benchmarks/bench_cleaning.py [--rows 10000 100000 1000000]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from functools import partial
+from typing import Any
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lead_scraper import process_and_clean_data  # noqa: E402
+from normalization import is_generic_site, normalize_name  # noqa: E402
+
+BASE_NAMES = [
+    f"{first} {second}"
+    for first in ("Star", "Kacchi", "Sultan's", "Nando's", "Pizza", "Dhaka", "Green", "Royal", "Café", "Sushi")
+    for second in ("Kabab", "Dine", "House", "Ltd", "Group", "Restaurant", "BD", "Corp")
+]
+BRANCH_SUFFIXES = ["", " - Gulshan", " | Banani", ", Dhanmondi", " (Mirpur)", " Limited", " Inc.", "  Branch"]
+
+
+def make_leads(rows: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Leads shaped like LeadStore.current_records(), with branches and gaps."""
+    rng = random.Random(seed)
+    leads = []
+    for i in range(rows):
+        base = rng.choice(BASE_NAMES)
+        if rng.random() < 0.7:
+            base += f" {rng.randrange(rows // 20 + 1)}"
+        name = base + rng.choice(BRANCH_SUFFIXES)
+        if rng.random() < 0.03:
+            name = rng.choice(["", None])
+        slug = base.split()[0].lower().strip("'")
+        leads.append(
+            {
+                "Business Name": name,
+                "Phone Number": rng.choice(
+                    [
+                        "",
+                        "",
+                        None,
+                        "12345",
+                        f"+880 17{rng.randrange(10**8):08d}",
+                        f"01{rng.randrange(10**9):09d}",
+                        f"(212) 555-{rng.randrange(10**4):04d}",
+                    ]
+                ),
+                "Website": rng.choice(
+                    [
+                        "",
+                        "",
+                        "",
+                        None,
+                        f"https://{slug}{rng.randrange(rows // 10 + 1)}.com",
+                        f"https://facebook.com/{slug}",
+                        f"https://www.instagram.com/{slug}",
+                    ]
+                ),
+                "Address": f"House {i}, Road {rng.randrange(30)}, Dhaka",
+                "Email": rng.choice(["", "", "", None, f"info{rng.randrange(rows // 10 + 1)}@{slug}.com"]),
+            }
+        )
+    return leads
+
+
+def legacy_process_and_clean_data(raw_data: list[dict[str, Any]]) -> pd.DataFrame:
+    """process_and_clean_data as it was before the vectorized rewrite."""
+    if not raw_data:
+        return pd.DataFrame(
+            columns=["Business Name", "Phone Number", "Website", "Address", "Email"]
+        )
+
+    df = pd.DataFrame(raw_data)
+
+    required_cols = ["Business Name", "Phone Number", "Website", "Address", "Email"]
+    for col in required_cols:
+        if col not in df.columns:
+            df[col] = ""
+
+    df["normalized_name"] = df["Business Name"].apply(normalize_name)
+
+    email_mask = (df["Email"] != "") & (df["Email"].notna())
+    if email_mask.any():
+        emails_df = df[email_mask].drop_duplicates(subset=["Email"], keep="first")
+        others_df = df[~email_mask]
+        df = pd.concat([emails_df, others_df])
+
+    website_mask = (df["Website"] != "") & (df["Website"].notna())
+    site_dedup_mask = website_mask & ~df["Website"].apply(is_generic_site)
+    if site_dedup_mask.any():
+        sites_df = df[site_dedup_mask].drop_duplicates(subset=["Website"], keep="first")
+        no_sites_df = df[~site_dedup_mask]
+        df = pd.concat([sites_df, no_sites_df])
+
+    df["info_score"] = (
+        (df["Phone Number"].fillna("").str.len() > 0).astype(int) +
+        (df["Website"].fillna("").str.len() > 0).astype(int) +
+        (df["Email"].fillna("").str.len() > 0).astype(int)
+    )
+    df = df.sort_values(by="info_score", ascending=False)
+    df = df.drop_duplicates(subset=["normalized_name"], keep="first")
+
+    df = df.drop(columns=["normalized_name", "info_score"])
+
+    df["has_contact"] = (
+        (df["Phone Number"].fillna("").str.len() > 0)
+        | (df["Website"].fillna("").str.len() > 0)
+        | (df["Email"].fillna("").str.len() > 0)
+    )
+
+    df = df[df["has_contact"]].drop(columns=["has_contact"])
+
+    def validate_phone(phone: Any) -> str:
+        if pd.isna(phone) or phone == "":
+            return str(phone)
+        cleaned = re.sub(r"[^\d\+]", "", str(phone))
+        if 10 <= len(cleaned) <= 15:
+            return str(phone)
+        return ""
+
+    df["Phone Number"] = df["Phone Number"].apply(validate_phone)
+    business_names = df["Business Name"].fillna("")
+    df = df[business_names.str.len() > 0]
+
+    return df
+
+
+def timed(func, raw_data: list[dict[str, Any]]) -> tuple[pd.DataFrame, float]:
+    start = time.perf_counter()
+    result = func(raw_data)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'legacy':>10} {'current':>10} {'speedup':>8} {'kept':>8}  identical")
+    for rows in args.rows:
+        raw_data = make_leads(rows, args.seed)
+        expected, legacy_seconds = timed(legacy_process_and_clean_data, raw_data)
+        result, seconds = timed(partial(process_and_clean_data, dedup_phones=False), raw_data)
+        try:
+            pd.testing.assert_frame_equal(result, expected)
+            identical = "yes"
+        except AssertionError as e:
+            identical = f"NO: {e}"
+        print(
+            f"{rows:>9} {legacy_seconds:>9.2f}s {seconds:>9.2f}s "
+            f"{legacy_seconds / seconds:>7.1f}x {len(result):>8}  {identical}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Peak memory of chunked archive dedup versus loading the archive into pandas.
+
+Writes a synthetic JSONL archive, then deduplicates it in two child processes
+so each reports its own peak RSS: once with dedup_archive and once by loading
+every row and running process_and_clean_data, like the Excel export does.
+
+    python benchmarks/bench_dedup.py [--rows 1000000] [--chunk-size 50000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+
+def write_archive(path: str, rows: int) -> None:
+    from bench_cleaning import make_leads
+
+    with open(path, "w", encoding="utf-8") as f:
+        for seed, start in enumerate(range(0, rows, 100_000)):
+            for lead in make_leads(min(100_000, rows - start), seed):
+                f.write(json.dumps(lead, ensure_ascii=False) + "\n")
+
+
+def run_mode(mode: str, archive: str, output: str, chunk_size: int) -> None:
+    from dedup import dedup_archive, peak_memory_mb, read_lead_chunks
+
+    start = time.perf_counter()
+    if mode == "stream":
+        stats = dedup_archive(archive, output, chunk_size)
+        written = stats["written"]
+    else:
+        from lead_scraper import process_and_clean_data
+
+        leads = [lead for chunk in read_lead_chunks(archive, chunk_size) for lead in chunk]
+        df = process_and_clean_data(leads)
+        df.to_csv(output, index=False)
+        written = len(df)
+    print(json.dumps({"seconds": time.perf_counter() - start, "written": written, "peak_mb": peak_memory_mb()}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--mode", choices=["stream", "memory"], help=argparse.SUPPRESS)
+    parser.add_argument("--archive", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.archive, args.out, args.chunk_size)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = os.path.join(tmp, "archive.jsonl")
+        write_archive(archive, args.rows)
+        print(f"{args.rows} rows, {os.path.getsize(archive) / 1e6:.0f} MB of JSONL")
+        for mode in ("stream", "memory"):
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--mode", mode,
+                    "--archive", archive,
+                    "--out", os.path.join(tmp, f"{mode}.csv"),
+                    "--chunk-size", str(args.chunk_size),
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+            print(
+                f"{mode:>7}: {stats['seconds']:6.1f}s  peak {stats['peak_mb']:7.0f} MB  "
+                f"{stats['written']} leads written"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Micro-benchmark for ContactExtractor on recorded page texts.
+
+Compares the per-regex searches the scrapers used to run on each Maps detail
+page against one ContactExtractor.scan, and against the first-match scan
+scrape_listing_details runs when the DOM left every field empty. Page texts are built by repeating the
+recorded fixtures, so the larger sizes stand in for long review-heavy pages.
+
+    python benchmarks/bench_extraction.py [--repeat 200]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction import (  # noqa: E402
+    ADDRESS_REGEX,
+    BD_ADDRESS_REGEX,
+    BD_PHONE_REGEX,
+    EMAIL_REGEX,
+    PHONE_REGEX,
+    UNICODE_DIGITS,
+    WEBSITE_REGEX,
+    ContactExtractor,
+)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DETAIL_KINDS = ("phone", "bd_phone", "website", "bd_address", "address")
+
+
+def legacy_detail_fields(body_text: str) -> dict[str, str]:
+    """The first-match lookups scrape_listing_details ran before ContactExtractor."""
+    body_text_normalized = body_text.translate(UNICODE_DIGITS)
+    phone = re.search(PHONE_REGEX, body_text) or re.search(PHONE_REGEX, body_text_normalized)
+    bd_phone = re.search(BD_PHONE_REGEX, body_text_normalized)
+    website = re.search(WEBSITE_REGEX, body_text)
+    address = re.search(ADDRESS_REGEX, body_text)
+    bd_address = re.search(BD_ADDRESS_REGEX, body_text)
+    return {
+        "phone": (phone or bd_phone).group(0) if (phone or bd_phone) else "",
+        "website": website.group(0) if website else "",
+        "address": (bd_address or address).group(0) if (bd_address or address) else "",
+    }
+
+
+def legacy_all_contacts(body_text: str) -> int:
+    """Every match of every pattern, done the old way: one findall per regex."""
+    body_text_normalized = body_text.translate(UNICODE_DIGITS)
+    return sum(
+        len(re.findall(pattern, text))
+        for pattern, text in (
+            (PHONE_REGEX, body_text),
+            (PHONE_REGEX, body_text_normalized),
+            (BD_PHONE_REGEX, body_text_normalized),
+            (EMAIL_REGEX, body_text),
+            (WEBSITE_REGEX, body_text),
+            (ADDRESS_REGEX, body_text),
+            (BD_ADDRESS_REGEX, body_text),
+        )
+    )
+
+
+def per_call_us(func, arg, min_seconds: float = 0.5) -> float:
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        func(arg)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="Largest fixture repeat count")
+    args = parser.parse_args()
+
+    extractor = ContactExtractor()
+    for name in ("maps_detail.txt", "serp_snippet.txt"):
+        with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+            base = f.read()
+        print(f"\n{name}")
+        print(
+            f"{'chars':>9} {'first-match':>13} {'findall x7':>13} {'scan':>13} "
+            f"{'scan first':>13} {'matches':>8}"
+        )
+        for repeat in sorted({1, max(1, args.repeat // 10), args.repeat}):
+            text = base * repeat
+            matches = extractor.scan(text)
+            found = sum(len(group) for group in vars(matches).values())
+            print(
+                f"{len(text):>9} "
+                f"{per_call_us(legacy_detail_fields, text):>10.1f} us "
+                f"{per_call_us(legacy_all_contacts, text):>10.1f} us "
+                f"{per_call_us(extractor.scan, text):>10.1f} us "
+                f"{per_call_us(lambda t: extractor.scan(t, DETAIL_KINDS, first=True), text):>10.1f} us "
+                f"{found:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
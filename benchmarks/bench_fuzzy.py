@@ -0,0 +1,97 @@
+"""Throughput of the near-duplicate merge stage on synthetic lead tables.
+
+Business names are random syllable words plus a trade, so distinct
+businesses rarely look alike. A share of rows are near-duplicate variants of
+an earlier row (branch suffix, dropped "&", a typo), and the report shows how
+many of them were merged.
+
+    python benchmarks/bench_fuzzy.py [--rows 10000 100000] [--threshold 0.65]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup import merge_near_duplicates  # noqa: E402
+
+SYLLABLES = [c + v for c in "bdfghjklmnprstvz" for v in ("a", "e", "i", "o", "u", "ar", "an")]
+TRADES = ["Restaurant", "Kabab & Grill", "Traders", "Pharmacy", "Electronics", "Tailors", "Sweets", "Cafe", "Clinic", "Motors"]
+AREAS = ["Dhanmondi", "Gulshan", "Banani", "Mirpur", "Uttara", "Motijheel"]
+
+
+def make_business(rng: random.Random, used: set[str]) -> dict[str, Any]:
+    word = ""
+    while not word or word in used:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+    used.add(word)
+    name = f"{word} {rng.choice(TRADES)}"
+    return {
+        "Business Name": name,
+        "Phone Number": f"+880 17{rng.randrange(10**8):08d}" if rng.random() < 0.7 else "",
+        "Website": f"https://{word.lower()}.com" if rng.random() < 0.4 else "",
+        "Address": f"House {rng.randrange(100)}, {rng.choice(AREAS)}",
+        "Email": f"info@{word.lower()}.com" if rng.random() < 0.2 else "",
+    }
+
+
+def make_variant(lead: dict[str, Any], rng: random.Random) -> dict[str, Any]:
+    variant = dict(lead)
+    name = lead["Business Name"]
+    edit = rng.randrange(3)
+    if edit == 0:
+        name = f"{name} {rng.choice(AREAS)}"
+    elif edit == 1:
+        name = name.replace(" & ", " ") + " Ltd"
+    else:
+        i = rng.randrange(1, name.index(" ") - 1)
+        name = name[:i] + name[i + 1] + name[i] + name[i + 2 :]
+    variant["Business Name"] = name
+    # Variants found through another search often miss some contact fields
+    for field in ("Phone Number", "Website", "Email"):
+        if rng.random() < 0.4:
+            variant[field] = ""
+    return variant
+
+
+def make_table(rows: int, duplicate_share: float, seed: int = 0) -> tuple[pd.DataFrame, int]:
+    rng = random.Random(seed)
+    leads: list[dict[str, Any]] = []
+    used: set[str] = set()
+    variants = 0
+    while len(leads) < rows:
+        if leads and rng.random() < duplicate_share:
+            leads.append(make_variant(rng.choice(leads), rng))
+            variants += 1
+        else:
+            leads.append(make_business(rng, used))
+    return pd.DataFrame(leads), variants
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--threshold", type=float, default=0.65)
+    parser.add_argument("--duplicates", type=float, default=0.1, help="Share of near-duplicate rows")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'seconds':>8} {'rows/s':>8} {'pairs':>9} {'variants':>9} {'merged':>7} {'skipped':>8}")
+    for rows in args.rows:
+        df, variants = make_table(rows, args.duplicates)
+        start = time.perf_counter()
+        _, stats = merge_near_duplicates(df, args.threshold)
+        seconds = time.perf_counter() - start
+        print(
+            f"{rows:>8} {seconds:>8.2f} {rows / seconds:>8.0f} {stats['candidate_pairs']:>9} "
+            f"{variants:>9} {stats['merged']:>7} {stats['skipped_blocks']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
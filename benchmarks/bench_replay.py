@@ -0,0 +1,399 @@
+"""Offline benchmark of the Maps and dork scrapers against replayed pages.
+
+Every request is answered by a local replay server (see replay.py) instead of
+Google, so runs are repeatable and need no network. By default a synthetic
+Maps results feed, place pages and SERP pages are built from the recorded
+texts in benchmarks/fixtures; pass --fixtures with a directory or HAR file
+recorded by ``lead_scraper.py --record`` to replay real pages instead.
+
+Each round runs in a fresh process with Playwright's protocol log on, and
+reports wall time per phase (from lead_scraper.metrics), leads/minute and
+CDP commands per lead. The CDP count includes the Fetch.* commands request
+routing adds, so only compare it between replay runs. Save a baseline and compare later runs against it:
+
+    python benchmarks/bench_replay.py --rounds 3 --save baseline.json
+    python benchmarks/bench_replay.py --rounds 3 --compare baseline.json
+
+The comparison exits with status 1 when a scenario gets slower, sends more CDP
+commands per lead, or finds fewer leads than the baseline allows.
+"""
+
+import argparse
+import asyncio
+import html
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+
+from replay import ReplayRouter, SnapshotStore  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "fixtures")
+SCENARIOS = ("maps", "dork")
+
+MAPS_KEYWORDS = "restaurants"
+MAPS_LOCATION = "Dhaka"
+DORK_KEYWORDS = "real estate"
+DORK_QUERY = 'site:facebook.com "@gmail.com"'
+
+NAME_WORDS = ["Star", "Kacchi", "Sultan's", "Royal", "Green", "Dhaka", "Nawab", "Lake", "Haji", "Bismillah"]
+KIND_WORDS = ["Kabab", "Dine", "House", "Biryani", "Restaurant", "Grill", "Cafe", "Kitchen"]
+
+MAPS_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{title} - Google Maps</title>
+<style>div[role=feed] {{ height: 600px; overflow-y: auto; }} .item {{ height: 120px; }}</style>
+</head><body>
+<div role="feed"></div>
+<script>
+const listings = {listings};
+const feed = document.querySelector('div[role="feed"]');
+let shown = 0;
+let loading = false;
+function more() {{
+    for (const listing of listings.slice(shown, shown + {batch})) {{
+        const item = document.createElement("div");
+        item.className = "item";
+        const link = document.createElement("a");
+        link.href = listing.href;
+        link.setAttribute("aria-label", listing.name);
+        link.textContent = listing.name;
+        item.appendChild(link);
+        feed.appendChild(item);
+    }}
+    shown = Math.min(shown + {batch}, listings.length);
+    if (shown >= listings.length && !document.getElementById("end")) {{
+        const end = document.createElement("p");
+        end.id = "end";
+        end.textContent = "You've reached the end of the list.";
+        feed.appendChild(end);
+    }}
+    loading = false;
+}}
+more();
+// Lazy loading, like the real feed: the next batch arrives shortly after a scroll
+feed.addEventListener("scroll", () => {{
+    if (!loading && feed.scrollTop + feed.clientHeight >= feed.scrollHeight - 200) {{
+        loading = true;
+        setTimeout(more, {delay_ms});
+    }}
+}});
+</script>
+</body></html>
+"""
+
+PLACE_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{name} - Google Maps</title></head><body>
+<h1>{name}</h1>
+<button data-item-id="address" aria-label="Address: {address}">{address}</button>
+{authority}
+{phone}
+<div>{body}</div>
+</body></html>
+"""
+
+SERP_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{query} - Google Search</title></head><body>
+<div id="search"><div id="rso">
+{results}
+</div></div>
+{next_link}
+</body></html>
+"""
+
+SERP_RESULT = """<div class="g">
+<a href="{href}"><h3>{title}</h3></a>
+<div>{snippet}</div>
+</div>"""
+
+
+def _read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def _business_name(i: int) -> str:
+    return (
+        f"{NAME_WORDS[i % len(NAME_WORDS)]} {KIND_WORDS[i // len(NAME_WORDS) % len(KIND_WORDS)]} {i}"
+    )
+
+
+def maps_search_url(keywords: str, location: str) -> str:
+    return f"https://www.google.com/maps/search/{f'{keywords} in {location}'.replace(' ', '+')}"
+
+
+def dork_search_url(keywords: str, dork_query: str, page: int = 0) -> str:
+    url = f"https://www.google.com/search?q={f'{keywords} {dork_query}'.strip().replace(' ', '+')}"
+    return url + f"&start={page * 10}" if page else url
+
+
+def build_fixture_site(listings: int = 40, serp_pages: int = 3) -> SnapshotStore:
+    """Synthetic Maps feed, place pages and SERP pages built from the text fixtures.
+
+    Every third place page has no phone button and every fifth no website
+    button, so the body-text fallbacks in scrape_listing_details run too.
+    """
+    store = SnapshotStore()
+    detail_text = _read_fixture("maps_detail.txt")
+    snippet_text = _read_fixture("serp_snippet.txt")
+
+    feed = []
+    for i in range(listings):
+        name = _business_name(i)
+        slug = name.lower().replace("'", "").replace(" ", "")
+        href = f"https://www.google.com/maps/place/{name.replace(' ', '+')}/data=!4m2!3m1!1s0x{i:x}"
+        feed.append({"href": href, "name": name})
+        phone = f"+880 1711-{200000 + i:06d}"
+        body = detail_text.replace("Star Kabab & Restaurant", name).replace(
+            "01711222333", f"01711{200000 + i:06d}"
+        )
+        store.add(
+            href,
+            PLACE_PAGE.format(
+                name=html.escape(name),
+                address=html.escape(f"House-{i}, Road {i % 30}, Dhanmondi, Dhaka 1205"),
+                authority=(
+                    ""
+                    if i % 5 == 0
+                    else f'<a data-item-id="authority" href="https://{slug}.com.bd/">{slug}.com.bd</a>'
+                ),
+                phone=(
+                    ""
+                    if i % 3 == 0
+                    else f'<button data-item-id="phone:tel:{phone}" aria-label="Phone: {phone}">{phone}</button>'
+                ),
+                body="".join(f"<div>{html.escape(line)}</div>" for line in body.splitlines()),
+            ),
+        )
+    store.add(
+        maps_search_url(MAPS_KEYWORDS, MAPS_LOCATION),
+        MAPS_PAGE.format(
+            title=html.escape(f"{MAPS_KEYWORDS} in {MAPS_LOCATION}"),
+            listings=json.dumps(feed),
+            batch=10,
+            delay_ms=100,
+        ),
+    )
+
+    query = f"{DORK_KEYWORDS} {DORK_QUERY}"
+    for page in range(serp_pages):
+        results = []
+        for j in range(10):
+            i = page * 10 + j
+            name = _business_name(i)
+            slug = name.lower().replace("'", "").replace(" ", "")
+            snippet = (
+                snippet_text.replace("Star Real Estate", name)
+                .replace("starrealestatebd", slug)
+                .replace("starrealestate.bd", slug)
+                .replace("8801811223344", f"88018112{i:05d}")
+            )
+            lines = snippet.splitlines()
+            results.append(
+                SERP_RESULT.format(
+                    href=f"https://www.facebook.com/{slug}",
+                    title=html.escape(lines[0]),
+                    snippet=html.escape(" ".join(lines[1:])),
+                )
+            )
+        next_link = ""
+        if page + 1 < serp_pages:
+            next_href = dork_search_url(DORK_KEYWORDS, DORK_QUERY, page + 1).removeprefix(
+                "https://www.google.com"
+            )
+            next_link = f'<a id="pnnext" href="{html.escape(next_href)}">Next</a>'
+        store.add(
+            dork_search_url(DORK_KEYWORDS, DORK_QUERY, page),
+            SERP_PAGE.format(
+                query=html.escape(query), results="\n".join(results), next_link=next_link
+            ),
+        )
+    return store
+
+
+async def run_scenario(scenario: str, store: SnapshotStore, args: argparse.Namespace) -> dict[str, Any]:
+    import lead_scraper
+    from lead_scraper import BrowserPool, scrape_google_dork, scrape_google_maps
+
+    lead_scraper.wait_policy.min_jitter = lead_scraper.wait_policy.max_jitter = args.jitter
+    limiter = lead_scraper.rate_limiter
+    limiter.rate = limiter.max_rate = args.requests_per_second
+    limiter.burst = max(1, int(args.requests_per_second))
+    router = ReplayRouter(store)
+    pool = BrowserPool(headless=True, replay=router)
+    try:
+        await pool.start()
+        start = time.perf_counter()
+        if scenario == "maps":
+            leads = await scrape_google_maps(
+                keywords=args.keywords or MAPS_KEYWORDS,
+                location=args.location or MAPS_LOCATION,
+                max_scrolls=args.max_scrolls,
+                results_limit=args.results_limit,
+                detail_concurrency=args.detail_concurrency,
+                pool=pool,
+            )
+        else:
+            leads = await scrape_google_dork(
+                keywords=args.keywords or DORK_KEYWORDS,
+                dork_query=args.dork_query or DORK_QUERY,
+                max_scrolls=args.serp_pages,
+                results_limit=args.results_limit,
+                pool=pool,
+            )
+        search_seconds = time.perf_counter() - start
+    finally:
+        await pool.close()
+        router.close()
+
+    # Total seconds per instrumented phase; detail workers overlap, so these
+    # can add up to more than the search itself
+    phases = {
+        name: phase["total"]
+        for name, phase in lead_scraper.metrics.summary()["phases"].items()
+    }
+    return {
+        "leads": len(leads),
+        "phases": {"search": search_seconds, **phases},
+        "counters": lead_scraper.metrics.counters,
+        "replay": router.summary(),
+    }
+
+
+def run_round(scenario: str, args: argparse.Namespace) -> dict[str, Any]:
+    """One scenario in a child process, with CDP commands counted from its protocol log."""
+    with tempfile.TemporaryDirectory() as tmp:
+        protocol_log = os.path.join(tmp, "protocol.log")
+        command = [sys.executable, __file__, "--child", scenario, *sys.argv[1:]]
+        env = {**os.environ, "DEBUG": "pw:protocol", "DEBUG_FILE": protocol_log}
+        result = subprocess.run(command, capture_output=True, text=True, env=env)
+        if result.returncode != 0:
+            raise RuntimeError(f"{scenario} round failed:\n{result.stderr[-2000:]}")
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        cdp_calls = 0
+        if os.path.exists(protocol_log):
+            with open(protocol_log, encoding="utf-8", errors="replace") as f:
+                cdp_calls = sum("SEND ►" in line for line in f)
+    stats["cdp_calls"] = cdp_calls
+    return stats
+
+
+def summarize(rounds: list[dict[str, Any]]) -> dict[str, Any]:
+    search = [r["phases"]["search"] for r in rounds]
+    leads = rounds[-1]["leads"]
+    phases = {
+        phase: statistics.mean(r["phases"].get(phase, 0.0) for r in rounds)
+        for phase in rounds[-1]["phases"]
+    }
+    return {
+        "rounds": len(rounds),
+        "leads": leads,
+        "search_min": min(search),
+        "search_mean": statistics.mean(search),
+        "search_stddev": statistics.stdev(search) if len(search) > 1 else 0.0,
+        "leads_per_minute": statistics.mean(r["leads"] / r["phases"]["search"] * 60 for r in rounds),
+        "cdp_per_lead": statistics.mean(r["cdp_calls"] / max(1, r["leads"]) for r in rounds),
+        "phases": phases,
+        "replay_misses": rounds[-1]["replay"]["misses"],
+    }
+
+
+def regressions(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    found = []
+    for scenario, current in results.items():
+        before = baseline.get(scenario)
+        if before is None:
+            continue
+        if current["search_mean"] > before["search_mean"] * (1 + tolerance):
+            found.append(
+                f"{scenario}: search {current['search_mean']:.2f}s vs {before['search_mean']:.2f}s"
+            )
+        if current["cdp_per_lead"] > before["cdp_per_lead"] * (1 + tolerance):
+            found.append(
+                f"{scenario}: {current['cdp_per_lead']:.1f} CDP calls/lead vs {before['cdp_per_lead']:.1f}"
+            )
+        if current["leads"] < before["leads"]:
+            found.append(f"{scenario}: {current['leads']} leads vs {before['leads']}")
+    return found
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=SCENARIOS, nargs="+", default=list(SCENARIOS))
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--fixtures", help="Recorded snapshot directory or HAR file")
+    parser.add_argument("--listings", type=int, default=40, help="Synthetic Maps listings")
+    parser.add_argument("--serp-pages", type=int, default=3)
+    parser.add_argument("--max-scrolls", type=int, default=10)
+    parser.add_argument("--results-limit", type=int, default=100)
+    parser.add_argument("--detail-concurrency", type=int, default=4)
+    parser.add_argument("--jitter", type=float, default=0.0, help="Wait policy jitter floor (seconds)")
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=1000.0,
+        help="Rate limit for the replayed host (default: effectively off)",
+    )
+    parser.add_argument("--keywords", help="Search keywords the recorded fixtures were made with")
+    parser.add_argument("--location", help="Maps location the recorded fixtures were made with")
+    parser.add_argument("--dork-query", help="Dork query the recorded fixtures were made with")
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file written by --save")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--child", choices=SCENARIOS, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.child:
+        logging.getLogger().setLevel(logging.WARNING)
+        store = (
+            SnapshotStore.load(args.fixtures)
+            if args.fixtures
+            else build_fixture_site(args.listings, args.serp_pages)
+        )
+        print(json.dumps(asyncio.run(run_scenario(args.child, store, args))))
+        return
+
+    results = {}
+    print(
+        f"{'scenario':>8} {'leads':>6} {'min':>8} {'mean':>8} {'stddev':>7} "
+        f"{'leads/min':>10} {'CDP/lead':>9}  phases (mean seconds)"
+    )
+    for scenario in args.scenario:
+        rounds = [run_round(scenario, args) for _ in range(max(1, args.rounds))]
+        summary = results[scenario] = summarize(rounds)
+        phases = ", ".join(f"{name} {seconds:.2f}" for name, seconds in summary["phases"].items())
+        print(
+            f"{scenario:>8} {summary['leads']:>6} {summary['search_min']:>7.2f}s "
+            f"{summary['search_mean']:>7.2f}s {summary['search_stddev']:>6.2f}s "
+            f"{summary['leads_per_minute']:>10.1f} {summary['cdp_per_lead']:>9.1f}  {phases}"
+        )
+        if summary["replay_misses"]:
+            print(f"{'':>8} {summary['replay_misses']} requests had no recorded response")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        found = regressions(results, baseline, args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass
 from typing import Any
 
 
@@ -12,18 +12,46 @@ class SearchConfig:
     search_type: str = "maps"
     dork_query: str = ""
     target: str = "email"
+    detail_concurrency: int = 4
+    listing_queue_size: int = 20
+    context_max_uses: int = 20
+    context_max_errors: int = 3
+    block_resources: bool = False
+    wait_timeout_ms: int = 10000
+    network_idle_timeout_ms: int = 3000
+    min_jitter: float = 0.2
+    max_jitter: float = 0.6
+    detail_cache_path: str = "listing_cache.sqlite"
+    detail_cache_ttl_hours: float = 168.0
+    checkpoint_every: int = 10
+    fuzzy_dedup_threshold: float = 0.0
+    phone_country: str = ""
+    requests_per_second: float = 1.0
+    request_burst: int = 4
+    max_requests_per_second: float = 4.0
+    captcha_mode: str = "auto"
+    captcha_cooldown: float = 30.0
+    max_captcha_rotations: int = 5
+    enrich_websites: bool = False
+    enrich_max_pages: int = 5
+    enrich_max_depth: int = 1
+    enrich_cache_ttl_hours: float = 720.0
+    shard_dork: bool = False
+    dork_locations: str = ""
+    dork_sites: str = ""
+    dork_email_domains: str = ""
+    max_dork_shards: int = 12
+    dork_shard_concurrency: int = 3
+    tile_maps: bool = False
+    tile_bounds: str = ""
+    tile_grid: int = 3
+    max_tile_depth: int = 2
+    max_tiles: int = 48
+    tile_concurrency: int = 3
+    skip_known_places: bool = True
 
     def to_dict(self) -> dict[str, Any]:
-        return {
-            "keywords": self.keywords,
-            "client_type": self.client_type,
-            "location": self.location,
-            "max_scrolls": self.max_scrolls,
-            "results_limit": self.results_limit,
-            "search_type": self.search_type,
-            "dork_query": self.dork_query,
-            "target": self.target,
-        }
+        return asdict(self)
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "SearchConfig":
@@ -0,0 +1,391 @@
+import csv
+import itertools
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import urllib.parse
+import zlib
+from array import array
+from collections import Counter
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from normalization import (
+    canonical_phones,
+    dedup_keys,
+    info_score,
+    is_generic_site,
+    normalize_names,
+    validate_phones,
+)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+LEAD_COLUMNS = ["Business Name", "Phone Number", "Website", "Address", "Email"]
+
+
+def peak_memory_mb() -> float | None:
+    """Peak resident memory of this process so far, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def read_lead_chunks(path: str, chunk_size: int = 50_000) -> Iterator[list[dict[str, Any]]]:
+    """Yield the leads in ``path`` a chunk at a time, in file order.
+
+    Reads CSV, JSONL (the batch runner's output), Excel workbooks and LeadStore
+    SQLite files, so no format needs the whole archive in memory at once.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from _chunked(csv.DictReader(f), chunk_size)
+    elif ext in (".jsonl", ".json"):
+        with open(path, encoding="utf-8") as f:
+            yield from _chunked((json.loads(line) for line in f if line.strip()), chunk_size)
+    elif ext == ".xlsx":
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True)
+        try:
+            sheet_rows = workbook.active.iter_rows(values_only=True)
+            header = [str(h) for h in next(sheet_rows, ())]
+            yield from _chunked(
+                (
+                    {col: "" if value is None else value for col, value in zip(header, row)}
+                    for row in sheet_rows
+                ),
+                chunk_size,
+            )
+        finally:
+            workbook.close()
+    elif ext == ".sqlite":
+        conn = sqlite3.connect(path)
+        try:
+            cursor = conn.execute("SELECT data FROM leads ORDER BY id")
+            while batch := cursor.fetchmany(chunk_size):
+                yield [json.loads(data) for (data,) in batch]
+        finally:
+            conn.close()
+    else:
+        raise ValueError(f"Unsupported lead archive format: {path}")
+
+
+def _chunked(rows: Iterable[dict[str, Any]], chunk_size: int) -> Iterator[list[dict[str, Any]]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class KeyIndex:
+    """In-memory winner index over dedup keys, sized for millions of rows.
+
+    Keys are stored as their 64-bit hash rather than the full string, and
+    per-row state lives in flat arrays: one score byte and one current flag
+    per row. Winners follow the same rule as LeadStore.add.
+    """
+
+    def __init__(self):
+        self._winners: dict[int, int] = {}
+        self._scores = array("B")
+        self.current = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    @property
+    def key_count(self) -> int:
+        return len(self._winners)
+
+    def add(self, keys: list[str], score: int) -> bool:
+        """Record the next row and return True if it is now the best copy."""
+        row = len(self._scores)
+        self._scores.append(score)
+        self.current.append(0)
+
+        hashed = [hash(key) for key in keys]
+        matches = {}
+        for h in hashed:
+            match = self._winners.get(h)
+            if match is not None:
+                matches[match] = self._scores[match]
+
+        # Ties go to the lead we already had, like keep="first" in a batch dedup
+        best = max(matches, key=lambda i: (matches[i], -i)) if matches else None
+        is_winner = best is None or score > matches[best]
+        if is_winner:
+            self.current[row] = 1
+            for match in matches:
+                self.current[match] = 0
+        winner = row if is_winner else best
+        for h in hashed:
+            self._winners[h] = winner
+        return is_winner
+
+
+def _clean_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """The per-row cleanup process_and_clean_data does after deduplicating."""
+    has_contact = (
+        (df["Phone Number"].fillna("").astype(str).str.len() > 0)
+        | (df["Website"].fillna("").astype(str).str.len() > 0)
+        | (df["Email"].fillna("").astype(str).str.len() > 0)
+    )
+    df = df[has_contact].copy()
+    df["Phone Number"] = validate_phones(df["Phone Number"])
+    return df[df["Business Name"].fillna("").astype(str).str.len() > 0]
+
+
+def dedup_archive(
+    input_path: str,
+    output_path: str,
+    chunk_size: int = 50_000,
+    default_country: str | None = None,
+) -> dict[str, Any]:
+    """Deduplicate a lead archive too large to load into one DataFrame.
+
+    The first pass reads ``input_path`` chunk by chunk and only keeps the key
+    index. The second pass reads it again and streams the winning rows, in
+    their original order, to a CSV or JSONL ``output_path``.
+    """
+    out_ext = os.path.splitext(output_path)[1].lower()
+    if out_ext not in (".csv", ".jsonl"):
+        raise ValueError(f"Deduplicated output must be .csv or .jsonl: {output_path}")
+
+    index = KeyIndex()
+    columns = dict.fromkeys(LEAD_COLUMNS)
+    for chunk in read_lead_chunks(input_path, chunk_size):
+        for lead in chunk:
+            index.add(dedup_keys(lead, default_country), info_score(lead))
+            columns.update(dict.fromkeys(lead))
+        logger.info(f"Indexed {len(index)} rows ({index.key_count} keys)")
+
+    written = 0
+    row = 0
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(columns)) if out_ext == ".csv" else None
+        if writer is not None:
+            writer.writeheader()
+        for chunk in read_lead_chunks(input_path, chunk_size):
+            winners = [lead for i, lead in enumerate(chunk, row) if index.current[i]]
+            row += len(chunk)
+            if not winners:
+                continue
+            df = _clean_chunk(pd.DataFrame(winners, columns=list(columns)).fillna(""))
+            records = df.to_dict("records")
+            if writer is not None:
+                writer.writerows(records)
+            else:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            written += len(records)
+
+    return {
+        "rows": len(index),
+        "unique": index.current.count(1),
+        "written": written,
+        "keys": index.key_count,
+        "peak_memory_mb": peak_memory_mb(),
+    }
+
+
+# MinHash signature size for near-duplicate blocking: BANDS bands of
+# ROWS_PER_BAND hashes. Names whose trigram Jaccard similarity is 0.65 share at
+# least one band about 96% of the time; at 0.3 about 24%.
+MINHASH_BANDS = 12
+MINHASH_ROWS_PER_BAND = 4
+_MINHASH_RNG = np.random.default_rng(0x1EAD)
+_MINHASH_A = _MINHASH_RNG.integers(1, 2**63, MINHASH_BANDS * MINHASH_ROWS_PER_BAND, dtype=np.uint64) | np.uint64(1)
+_MINHASH_B = _MINHASH_RNG.integers(0, 2**63, MINHASH_BANDS * MINHASH_ROWS_PER_BAND, dtype=np.uint64)
+
+
+def name_trigrams(name: str) -> frozenset[str]:
+    padded = f" {name} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def name_numbers(name: str) -> frozenset[str]:
+    return frozenset(re.findall(r"\d+", name))
+
+
+def trigram_similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    """Jaccard similarity of two trigram sets."""
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+def minhash_band_keys(gram_sets: list[frozenset[str]]) -> np.ndarray:
+    """LSH band keys, one row per trigram set; similar sets likely share a column value.
+
+    Rows with no trigrams get all-zero keys and should be left out of blocking.
+    """
+    lengths = np.fromiter(map(len, gram_sets), dtype=np.int64, count=len(gram_sets))
+    hashes = np.fromiter(
+        (zlib.crc32(g.encode()) for grams in gram_sets for g in grams),
+        dtype=np.uint64,
+        count=int(lengths.sum()),
+    )
+    present = lengths > 0
+    starts = (np.cumsum(lengths) - lengths)[present]
+    keys = np.zeros((len(gram_sets), MINHASH_BANDS), dtype=np.uint64)
+    if not present.any():
+        return keys
+
+    signature = np.empty((len(_MINHASH_A), len(starts)), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for k, (a, b) in enumerate(zip(_MINHASH_A, _MINHASH_B)):
+            signature[k] = np.minimum.reduceat(hashes * a + b, starts)
+        bands = signature.reshape(MINHASH_BANDS, MINHASH_ROWS_PER_BAND, -1)
+        band_keys = bands[:, 0]
+        for row in range(1, MINHASH_ROWS_PER_BAND):
+            band_keys = band_keys * np.uint64(0x9E3779B97F4A7C15) + bands[:, row]
+    keys[present] = band_keys.T
+    return keys
+
+
+def _blocks_of(values: np.ndarray, rows: np.ndarray) -> list[np.ndarray]:
+    """Groups of two or more ``rows`` that share a value, each in row order."""
+    order = np.argsort(values, kind="stable")
+    values, rows = values[order], rows[order]
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    ends = np.r_[starts[1:], len(values)]
+    shared = ends - starts > 1
+    return [rows[start:end] for start, end in zip(starts[shared], ends[shared])]
+
+
+def site_domain(url: Any) -> str:
+    """Host of a non-generic website without its www. prefix."""
+    url = str(url).strip().lower()
+    if not url or is_generic_site(url):
+        return ""
+    host = urllib.parse.urlsplit(url if "//" in url else f"//{url}").hostname or ""
+    return host.removeprefix("www.")
+
+
+def _is_blank(value: Any) -> bool:
+    return value is None or value != value or str(value) == ""  # None, NaN or ""
+
+
+class _DisjointSet:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            # The earlier row stays the root, which keeps cluster order stable
+            self.parent[max(a, b)] = min(a, b)
+
+
+def merge_near_duplicates(
+    df: pd.DataFrame,
+    threshold: float = 0.65,
+    contact_threshold: float = 0.4,
+    max_block_size: int = 500,
+    default_country: str | None = None,
+) -> tuple[pd.DataFrame, dict[str, int]]:
+    """Merge leads whose names are near-duplicates into their richest record.
+
+    Rows are only compared inside blocks: a shared MinHash band of the
+    trigrams of the normalized name's less common words, a shared phone
+    number, or a shared business website domain. A pair matches when the
+    names contain the same numbers and their trigram similarity reaches
+    ``threshold``, or ``contact_threshold`` if the pair also shares a phone
+    or domain. Blocks larger than ``max_block_size`` are skipped rather than
+    compared pairwise. Each cluster keeps its highest-info_score row, with
+    empty fields filled in from the other rows, in its original place.
+    Phones are compared by their E.164 form, reading numbers without a
+    country code as ``default_country`` numbers.
+    """
+    stats = {"rows": len(df), "candidate_pairs": 0, "merged": 0, "skipped_blocks": 0}
+    if len(df) < 2:
+        return df, stats
+
+    names = normalize_names(df["Business Name"])
+    # Words like "restaurant" in most names would make unrelated places look
+    # alike, so compare names on their less common words
+    word_counts = Counter(word for name in names for word in set(name.split()))
+    common = max(20, len(names) // 100)
+    distinctive = [
+        " ".join(w for w in name.split() if word_counts[w] <= common) or name for name in names
+    ]
+    grams = [name_trigrams(name) for name in distinctive]
+    numbers = [name_numbers(name) for name in names]
+    phones = canonical_phones(df["Phone Number"], default_country).tolist()
+    domains = [site_domain(w) for w in df["Website"].fillna("").tolist()]
+
+    blocks: list[np.ndarray] = []
+    band_keys = minhash_band_keys(grams)
+    named = np.flatnonzero([bool(g) for g in grams])
+    for band in range(MINHASH_BANDS):
+        blocks += _blocks_of(band_keys[named, band], named)
+    for values in (phones, domains):
+        values_array = np.array(values, dtype=object)
+        filled = np.flatnonzero(values_array != "")
+        blocks += _blocks_of(values_array[filled].astype(str), filled)
+
+    candidates: set[tuple[int, int]] = set()
+    for block in blocks:
+        if len(block) > max_block_size:
+            stats["skipped_blocks"] += 1
+        else:
+            candidates.update(itertools.combinations(block.tolist(), 2))
+    stats["candidate_pairs"] = len(candidates)
+
+    clusters = _DisjointSet(len(df))
+    for i, j in candidates:
+        # "Dine 1" and "Dine 2" look alike but are usually different places
+        if numbers[i] != numbers[j]:
+            continue
+        similarity = trigram_similarity(grams[i], grams[j])
+        shares_contact = (phones[i] and phones[i] == phones[j]) or (
+            domains[i] and domains[i] == domains[j]
+        )
+        if similarity >= threshold or (shares_contact and similarity >= contact_threshold):
+            clusters.union(i, j)
+
+    members_by_root: dict[int, list[int]] = {}
+    for i in range(len(df)):
+        members_by_root.setdefault(clusters.find(i), []).append(i)
+
+    records = df.to_dict("records")
+    scores = [info_score(lead) for lead in records]
+    keep = []
+    for members in members_by_root.values():
+        richest = max(members, key=lambda i: (scores[i], -i))
+        merged = records[richest]
+        for i in members:
+            for field_name, value in records[i].items():
+                if _is_blank(merged.get(field_name)) and not _is_blank(value):
+                    merged[field_name] = value
+        keep.append(richest)
+        stats["merged"] += len(members) - 1
+
+    keep.sort()
+    result = pd.DataFrame([records[i] for i in keep], index=df.index[keep], columns=df.columns)
+    return result, stats
@@ -0,0 +1,282 @@
+import asyncio
+import logging
+import re
+import urllib.parse
+from html.parser import HTMLParser
+from typing import Any, Awaitable, Callable
+
+from extraction import SCAN_EMAIL_REGEX, ContactExtractor
+from fetcher import TieredFetcher
+from metrics import Metrics
+from normalization import is_generic_site
+from storage import SiteCache
+
+logger = logging.getLogger(__name__)
+
+# Words in a link's URL or text that point at pages listing contact details
+CONTACT_HINTS = (
+    "contact", "about", "impressum", "team", "reach", "support", "location",
+    "yogajog", "jogajog", "যোগাযোগ",
+)
+# Addresses that look like emails but are image names, placeholders or trackers
+JUNK_EMAIL_SUFFIXES = (
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", "@example.com", "@domain.com",
+    "@email.com", "sentry.io", "wixpress.com",
+)
+SKIPPED_TAGS = {"script", "style", "noscript", "svg", "template"}
+MAX_PAGE_CHARS = 500_000
+
+_EMAIL_SCANNER = re.compile(SCAN_EMAIL_REGEX)
+
+
+class _PageParser(HTMLParser):
+    """Collect a page's visible text and its links with their anchor text."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.text: list[str] = []
+        self.links: list[tuple[str, str]] = []
+        self._skip_depth = 0
+        self._href: str | None = None
+        self._anchor: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "a":
+            self._href = dict(attrs).get("href")
+            self._anchor = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "a" and self._href:
+            self.links.append((self._href.strip(), " ".join(self._anchor).strip()))
+            self._href = None
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        self.text.append(data)
+        if self._href is not None:
+            self._anchor.append(data)
+
+
+def site_key(url: str) -> str:
+    """Key a website by host, so every branch sharing a site is crawled once."""
+    host = urllib.parse.urlsplit(url).netloc.lower()
+    return "site:" + host.removeprefix("www.")
+
+
+def _same_site(url: str, home: str) -> bool:
+    return site_key(url) == site_key(home)
+
+
+def _is_contact_link(url: str, text: str) -> bool:
+    haystack = f"{urllib.parse.urlsplit(url).path} {text}".lower()
+    return any(hint in haystack for hint in CONTACT_HINTS)
+
+
+def _lists_contacts(html: str) -> bool:
+    """Whether a contact page's raw HTML shows any address or number at all."""
+    return "mailto:" in html or "tel:" in html or _EMAIL_SCANNER.search(html) is not None
+
+
+class WebsiteEnricher:
+    """Crawl leads' own websites for emails, phones and social profiles.
+
+    Each site gets its home page plus the likely contact/about pages it links
+    to, up to ``max_depth`` links away and ``max_pages`` pages. Requests share
+    one pooled HTTP client (Playwright's APIRequestContext, so no browser is
+    needed), with ``concurrency`` requests in flight overall and at most
+    ``per_domain`` per site. Pages that only render with JavaScript, and
+    contact pages that show no contacts without it, are fetched again with
+    ``browser_fetch`` (see fetcher.TieredFetcher). Pages are cached for the
+    run and each site's findings are kept in ``cache`` across runs.
+    """
+
+    def __init__(
+        self,
+        extractor: ContactExtractor,
+        profile_filter: Callable[[str], bool],
+        max_pages: int = 5,
+        max_depth: int = 1,
+        concurrency: int = 8,
+        per_domain: int = 2,
+        timeout_ms: int = 15000,
+        user_agent: str | None = None,
+        cache: SiteCache | None = None,
+        metrics: Metrics | None = None,
+        browser_fetch: Callable[[str], Awaitable[str | None]] | None = None,
+    ):
+        self.extractor = extractor
+        self.profile_filter = profile_filter
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.per_domain = per_domain
+        self.cache = cache
+        self.metrics = metrics or Metrics()
+        self.fetcher = TieredFetcher(browser_fetch, timeout_ms, user_agent, metrics=self.metrics)
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._domain_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._pages: dict[str, tuple[str, list[tuple[str, str]]] | None] = {}
+        self._sites: dict[str, asyncio.Task[dict[str, str]]] = {}
+        self.enriched = 0
+
+    async def start(self) -> None:
+        await self.fetcher.start()
+
+    async def close(self) -> None:
+        await self.fetcher.close()
+
+    async def __aenter__(self) -> "WebsiteEnricher":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def _fetch(
+        self, url: str, expect: Callable[[str], bool] | None = None
+    ) -> tuple[str, list[tuple[str, str]]] | None:
+        """Return a page's text and links, or None if it isn't a readable HTML page."""
+        if url in self._pages:
+            return self._pages[url]
+        domain_semaphore = self._domain_semaphores.setdefault(
+            site_key(url), asyncio.Semaphore(max(1, self.per_domain))
+        )
+        page = None
+        async with domain_semaphore, self._semaphore:
+            result = await self.fetcher.fetch(url, expect)
+        if result is not None:
+            try:
+                parser = _PageParser()
+                parser.feed(result.html[:MAX_PAGE_CHARS])
+                # Relative links resolve against where redirects ended up
+                links = [
+                    (urllib.parse.urljoin(result.url, href), text)
+                    for href, text in parser.links
+                ]
+                page = (" ".join(parser.text), links)
+            except Exception as e:
+                logger.debug(f"Could not parse {url[:80]}: {e}")
+        self._pages[url] = page
+        return page
+
+    async def crawl(
+        self, website: str, max_pages: int | None = None, max_depth: int | None = None
+    ) -> dict[str, str]:
+        """Return the Email, Phone Number, Facebook and Instagram found on ``website``.
+
+        Concurrent calls for the same site share one crawl.
+        """
+        if not website.startswith(("http://", "https://")):
+            website = "https://" + website
+        key = site_key(website)
+        task = self._sites.get(key)
+        if task is None:
+            task = self._sites[key] = asyncio.ensure_future(
+                self._crawl_site(key, website, max_pages, max_depth)
+            )
+        return await task
+
+    async def _crawl_site(
+        self, key: str, home: str, max_pages: int | None, max_depth: int | None
+    ) -> dict[str, str]:
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        max_pages = self.max_pages if max_pages is None else max_pages
+        max_depth = self.max_depth if max_depth is None else max_depth
+
+        emails: list[str] = []
+        phones: list[str] = []
+        socials: dict[str, str] = {}
+        visited: set[str] = set()
+        fetched = 0
+        frontier = [home]
+        for depth in range(max_depth + 1):
+            batch = [url for url in dict.fromkeys(frontier) if url not in visited]
+            batch = batch[: max(0, max_pages - len(visited))]
+            if not batch:
+                break
+            visited.update(batch)
+            # Linked contact pages should list contacts; if not, they may need JavaScript
+            expect = _lists_contacts if depth else None
+            pages = await asyncio.gather(*(self._fetch(url, expect) for url in batch))
+            frontier = []
+            for page in pages:
+                if page is None:
+                    continue
+                fetched += 1
+                text, links = page
+                with self.metrics.timer("enrich_extraction"):
+                    contacts = self.extractor.scan(text)
+                emails += [m.value for m in contacts.emails]
+                phone = contacts.first("phone", "bd_phone")
+                if phone:
+                    phones.append(phone.value)
+                for url, anchor in links:
+                    lowered = url.lower()
+                    if lowered.startswith("mailto:"):
+                        emails.append(urllib.parse.unquote(url[7:].split("?")[0]))
+                    elif lowered.startswith("tel:"):
+                        phones.append(urllib.parse.unquote(url[4:]))
+                    elif "facebook.com" in lowered or "fb.com" in lowered:
+                        if "Facebook" not in socials and self.profile_filter(url):
+                            socials["Facebook"] = url
+                    elif "instagram.com" in lowered:
+                        if "Instagram" not in socials and self.profile_filter(url):
+                            socials["Instagram"] = url
+                    elif _same_site(url, home) and _is_contact_link(url, anchor):
+                        frontier.append(url.split("#")[0])
+
+        found = {
+            "Email": _best_email(emails, home),
+            "Phone Number": phones[0].strip() if phones else "",
+            "Facebook": socials.get("Facebook", ""),
+            "Instagram": socials.get("Instagram", ""),
+        }
+        # A site that failed to load is tried again next run rather than cached as empty
+        if self.cache is not None and fetched:
+            self.cache.put(key, found)
+        return found
+
+    async def enrich(
+        self, lead: dict[str, Any], max_pages: int | None = None, max_depth: int | None = None
+    ) -> bool:
+        """Fill in ``lead``'s missing contact fields from its website; True if any were."""
+        website = str(lead.get("Website") or "")
+        if not website or is_generic_site(website) or "google." in website.lower():
+            return False
+        found = await self.crawl(website, max_pages, max_depth)
+        changed = False
+        for field, value in found.items():
+            if value and not lead.get(field):
+                lead[field] = value
+                changed = True
+        if changed:
+            self.enriched += 1
+            self.metrics.inc("leads_enriched")
+        return changed
+
+    def summary(self) -> dict[str, Any]:
+        """Return the crawl counters for this run."""
+        return {
+            "sites": len(self._sites),
+            "leads_enriched": self.enriched,
+            **self.fetcher.summary(),
+        }
+
+
+def _best_email(emails: list[str], home: str) -> str:
+    """Pick the first real address, preferring one at the site's own domain."""
+    valid = [
+        e.strip().lower()
+        for e in emails
+        if "@" in e and not e.strip().lower().endswith(JUNK_EMAIL_SUFFIXES)
+    ]
+    domain = (urllib.parse.urlsplit(home).hostname or "").removeprefix("www.")
+    own = [e for e in valid if e.endswith("@" + domain) or e.endswith("." + domain)]
+    return (own or valid or [""])[0]
@@ -0,0 +1,156 @@
+import re
+from dataclasses import dataclass, field
+from typing import Iterable
+
+PHONE_REGEX = r"(\+[\d\u00C0-\u00FF\u2070-\u209F\u2080-\u208F]{1,3}[-.\s]?\(?[\d\u00C0-\u00FF\u2070-\u209F\u2080-\u208F]{3}\)?[-.\s]?[\d\u00C0-\u00FF\u2070-\u209F\u2080-\u208F]{3}[-.\s]?[\d\u00C0-\u00FF\u2070-\u209F\u2080-\u208F]{4})"
+EMAIL_REGEX = r"([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})"
+# Scanning every position of a page retries the same word once per character
+# for these kinds. Anchoring them to the start of a run (and never giving back
+# a label) finds the same matches without the rescans.
+SCAN_EMAIL_REGEX = r"(?<![a-zA-Z0-9._%+-])[a-zA-Z0-9._%+-]++@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+
+_FANCY_DIGITS = "𝟎𝟏𝟐𝟑𝟒𝟓𝟔𝟕𝟖𝟗𝟘𝟙𝟚𝟛𝟜𝟝𝟞𝟟𝟠𝟡𝟢𝟣𝟤𝟥𝟦𝟧𝟨𝟩𝟪𝟫𝟬𝟭𝟮𝟯𝟰𝟱𝟲𝟳𝟴𝟵０１２３４５６７８９₀₁₂₃₄₅₆₇₈₉⓪①②③④⑤⑥⑦⑧⑨"
+UNICODE_DIGITS = str.maketrans(
+    _FANCY_DIGITS,
+    "0123456789012345678901234567890123456789012345678901234567890123456789",
+)
+
+_FANCY_DIGIT_SET = frozenset(_FANCY_DIGITS)
+
+BD_PHONE_REGEX = r"(?:\+?88)?[01][\d\u00C0-\u00FF\u2070-\u209F\u2080-\u208F]{9}"
+
+WEBSITE_REGEX = r"(?:https?://)?(?:www\.)?([a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}(?!\s*\d)"
+SCAN_WEBSITE_REGEX = r"(?<![a-zA-Z0-9.-])(?:https?://)?(?:www\.)?(?:[a-zA-Z0-9-]++\.)+[a-zA-Z]{2,}(?!\s*\d)"
+ADDRESS_REGEX = r"\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln)[,\s]+[A-Za-z\s]+,?\s*(?:NY|NJ|CT|PA)?\s*\d{5}"
+BD_ADDRESS_REGEX = r"(?i:House-?\d+[\s,]+[A-Za-z]+(?:Road|Rd|Street|St|Avenue|Ave|Banani|Gulshan|Dhanmondi|Mirpur|Baridhara)[,\s]*,?\s*Dhaka\s*\d*)"
+
+# Alternatives are tried in this order at each position, so earlier kinds win
+# overlaps: an email's domain is never reported as a website, for example.
+CONTACT_PATTERNS = {
+    "email": SCAN_EMAIL_REGEX,
+    "bd_address": BD_ADDRESS_REGEX,
+    "address": r"(?<!\d)" + ADDRESS_REGEX,
+    "phone": PHONE_REGEX,
+    "bd_phone": BD_PHONE_REGEX,
+    "website": SCAN_WEBSITE_REGEX,
+}
+
+_KIND_FIELDS = {
+    "email": "emails",
+    "bd_address": "addresses",
+    "address": "addresses",
+    "phone": "phones",
+    "bd_phone": "phones",
+    "website": "websites",
+}
+
+
+@dataclass
+class ContactMatch:
+    kind: str
+    value: str
+    start: int
+    end: int
+
+
+@dataclass
+class Contacts:
+    """Every contact found in a text, in the order it appears."""
+
+    phones: list[ContactMatch] = field(default_factory=list)
+    emails: list[ContactMatch] = field(default_factory=list)
+    websites: list[ContactMatch] = field(default_factory=list)
+    addresses: list[ContactMatch] = field(default_factory=list)
+
+    def first(self, *kinds: str) -> ContactMatch | None:
+        """Return the earliest match of the first listed kind that has any."""
+        for kind in kinds:
+            for match in getattr(self, _KIND_FIELDS[kind]):
+                if match.kind == kind:
+                    return match
+        return None
+
+
+def _without_captures(pattern: str) -> str:
+    """Turn capturing groups into non-capturing ones so named groups stay last."""
+    return re.sub(r"(?<!\\)\((?!\?)", "(?:", pattern)
+
+
+class ContactExtractor:
+    """Find phones, emails, websites and addresses in page text in one scan.
+
+    All patterns are compiled once into a single alternation. Text is
+    normalized once with UNICODE_DIGITS, which maps one character to one
+    character, so match positions are valid in the original text too.
+    """
+
+    def __init__(self, patterns: dict[str, str] | None = None):
+        self.patterns = dict(CONTACT_PATTERNS if patterns is None else patterns)
+        self._scanner = self._compile(self.patterns)
+        self._kind_scanners: dict[frozenset[str], re.Pattern[str]] = {}
+        self._kind_regexes = {kind: re.compile(pattern) for kind, pattern in self.patterns.items()}
+
+    @staticmethod
+    def _compile(patterns: dict[str, str]) -> re.Pattern[str]:
+        return re.compile(
+            "|".join(
+                f"(?P<{kind}>{_without_captures(pattern)})"
+                for kind, pattern in patterns.items()
+            )
+        )
+
+    def _scanner_for(self, kinds: frozenset[str]) -> re.Pattern[str]:
+        scanner = self._kind_scanners.get(kinds)
+        if scanner is None:
+            # Emails stay in the alternation so their domains never read as websites
+            searched = (kinds | {"email"}) if "website" in kinds else kinds
+            scanner = self._kind_scanners[kinds] = self._compile(
+                {kind: pattern for kind, pattern in self.patterns.items() if kind in searched}
+            )
+        return scanner
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        # translate() walks the whole page in Python-level chunks; most pages
+        # have no styled digits at all, so check for them first.
+        if text.isascii() or _FANCY_DIGIT_SET.isdisjoint(text):
+            return text
+        return text.translate(UNICODE_DIGITS)
+
+    def scan(self, text: str, kinds: Iterable[str] | None = None, first: bool = False) -> Contacts:
+        """Return every contact in ``text`` with its position.
+
+        With ``kinds``, only those kinds are looked for, with a smaller
+        alternation. With ``first``, only the earliest match of each kind is
+        returned, found with one search per kind; a single-pattern search skips
+        ahead on its literal prefix, which is much faster than trying the whole
+        alternation at every position when a few fields are all that's needed.
+        """
+        wanted = frozenset(self.patterns if kinds is None else kinds)
+        text = self.normalize(text)
+        contacts = Contacts()
+        if first:
+            for kind in self.patterns:
+                if kind not in wanted:
+                    continue
+                for match in self._kind_regexes[kind].finditer(text):
+                    # Neither half of an email is a website, as in the full scan
+                    if kind == "website" and "@" in (
+                        text[match.start() - 1 : match.start()] + text[match.end() : match.end() + 1]
+                    ):
+                        continue
+                    getattr(contacts, _KIND_FIELDS[kind]).append(
+                        ContactMatch(kind, match.group().strip(), match.start(), match.end())
+                    )
+                    break
+            return contacts
+
+        scanner = self._scanner if kinds is None else self._scanner_for(wanted)
+        for match in scanner.finditer(text):
+            kind = match.lastgroup
+            if kind not in wanted:
+                continue
+            getattr(contacts, _KIND_FIELDS[kind]).append(
+                ContactMatch(kind, match.group().strip(), match.start(), match.end())
+            )
+        return contacts
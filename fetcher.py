@@ -0,0 +1,193 @@
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from playwright.async_api import async_playwright
+
+from metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+# Statuses bot walls and CDN challenges answer plain clients with
+CHALLENGE_STATUSES = {403, 429, 503}
+# Empty mount points of client-rendered apps (React, Next.js, Vue, Angular, Wix)
+APP_SHELL_REGEX = re.compile(
+    r"<div id=[\"'](?:root|app|__next|__nuxt)[\"'][^>]*>\s*</div>|<app-root[^>]*>\s*</app-root>",
+    re.IGNORECASE,
+)
+JS_REQUIRED_REGEX = re.compile(
+    r"(?:enable|requires?|turn on) javascript|javascript (?:is )?(?:disabled|required)"
+    r"|checking your browser|just a moment\.\.\.",
+    re.IGNORECASE,
+)
+TAG_REGEX = re.compile(r"<(script|style)\b.*?</\1>|<[^>]+>", re.IGNORECASE | re.DOTALL)
+
+
+@dataclass
+class FetchResult:
+    """A fetched page and the tier that produced it."""
+
+    url: str
+    html: str
+    status: int
+    tier: str
+    seconds: float
+
+
+def escalation_reason(status: int, html: str, min_text_chars: int = 200) -> str | None:
+    """Say why a plain HTTP response needs a browser, or None if it can be used as is."""
+    if status in CHALLENGE_STATUSES:
+        return "challenge"
+    head = html[:20000]
+    if JS_REQUIRED_REGEX.search(head):
+        return "js_required"
+    if APP_SHELL_REGEX.search(html):
+        return "app_shell"
+    if "<script" in head.lower() and len(" ".join(TAG_REGEX.sub(" ", html).split())) < min_text_chars:
+        return "js_gated"
+    return None
+
+
+class TieredFetcher:
+    """Fetch pages over plain pooled HTTP first and with a browser only when needed.
+
+    The HTTP tier is Playwright's APIRequestContext, which keeps connections
+    alive without starting a browser. A response is escalated to
+    ``browser_fetch`` (a coroutine returning the rendered HTML, or None) when
+    it looks like a bot challenge or a JavaScript-rendered shell, or when it
+    fails the caller's ``expect`` check. Without ``browser_fetch`` the HTTP
+    response is returned as is.
+
+    Each tier's latency goes to ``metrics`` as the ``fetch_http`` and
+    ``fetch_browser`` phases, and escalations are counted by reason.
+    """
+
+    def __init__(
+        self,
+        browser_fetch: Callable[[str], Awaitable[str | None]] | None = None,
+        timeout_ms: int = 15000,
+        user_agent: str | None = None,
+        min_text_chars: int = 200,
+        metrics: Metrics | None = None,
+    ):
+        self.browser_fetch = browser_fetch
+        self.timeout_ms = timeout_ms
+        self.user_agent = user_agent
+        self.min_text_chars = min_text_chars
+        self.metrics = metrics or Metrics()
+        # Requests made per tier, and pages each tier ended up serving
+        self.counts = {
+            "http": 0, "browser": 0, "served_http": 0, "served_browser": 0,
+            "escalated": 0, "failed": 0,
+        }
+        self.seconds = {"http": 0.0, "browser": 0.0}
+        self._playwright: Any = None
+        self._client: Any = None
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._playwright = await async_playwright().start()
+            self._client = await self._playwright.request.new_context(
+                user_agent=self.user_agent,
+                ignore_https_errors=True,
+                timeout=self.timeout_ms,
+                extra_http_headers={"Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.5"},
+            )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.dispose()
+            self._client = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def __aenter__(self) -> "TieredFetcher":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _observe(self, tier: str, seconds: float) -> None:
+        self.counts[tier] += 1
+        self.seconds[tier] += seconds
+        self.metrics.observe(f"fetch_{tier}", seconds)
+
+    async def _fetch_http(self, url: str) -> FetchResult | None:
+        if self._client is None:
+            raise RuntimeError("TieredFetcher used before start()")
+        start = time.perf_counter()
+        try:
+            response = await self._client.get(url, max_redirects=5, fail_on_status_code=False)
+            try:
+                content_type = response.headers.get("content-type", "")
+                html = await response.text() if "html" in content_type else ""
+                return FetchResult(
+                    response.url, html, response.status, "http", time.perf_counter() - start
+                )
+            finally:
+                await response.dispose()
+        except Exception as e:
+            logger.debug(f"HTTP fetch failed for {url[:80]}: {e}")
+            return None
+        finally:
+            self._observe("http", time.perf_counter() - start)
+
+    async def _fetch_browser(self, url: str) -> FetchResult | None:
+        start = time.perf_counter()
+        try:
+            html = await self.browser_fetch(url)  # type: ignore[misc]
+        except Exception as e:
+            logger.debug(f"Browser fetch failed for {url[:80]}: {e}")
+            html = None
+        seconds = time.perf_counter() - start
+        self._observe("browser", seconds)
+        return FetchResult(url, html, 200, "browser", seconds) if html else None
+
+    async def fetch(
+        self, url: str, expect: Callable[[str], bool] | None = None
+    ) -> FetchResult | None:
+        """Return ``url``'s HTML from the cheapest tier that gets a usable page."""
+        result = await self._fetch_http(url)
+        # Dead hosts, real 404s and 500s won't look any different in a browser
+        if result is None or (result.status >= 400 and result.status not in CHALLENGE_STATUSES):
+            self.counts["failed"] += 1
+            return None
+        if not result.html:
+            # Not an HTML page (a PDF, an image, an empty body)
+            return None
+        reason = escalation_reason(result.status, result.html, self.min_text_chars)
+        if reason is None and expect is not None and not expect(result.html):
+            reason = "missing_content"
+        if reason is None or self.browser_fetch is None:
+            if result.status >= 400:
+                self.counts["failed"] += 1
+                return None
+            self.counts["served_http"] += 1
+            return result
+
+        self.counts["escalated"] += 1
+        self.metrics.inc(f"fetch_escalated_{reason}")
+        rendered = await self._fetch_browser(url)
+        if rendered is None:
+            # A thin HTTP page is still better than nothing
+            if result.status < 400:
+                self.counts["served_http"] += 1
+                return result
+            self.counts["failed"] += 1
+            return None
+        self.counts["served_browser"] += 1
+        return rendered
+
+    def summary(self) -> dict[str, Any]:
+        """Per-tier counts and seconds, and an estimate of the browser time avoided."""
+        browser_mean = self.seconds["browser"] / self.counts["browser"] if self.counts["browser"] else 0.0
+        return {
+            **self.counts,
+            "http_seconds": round(self.seconds["http"], 2),
+            "browser_seconds": round(self.seconds["browser"], 2),
+            "browser_seconds_avoided": round(self.counts["served_http"] * browser_mean, 2),
+        }
@@ -1,17 +1,41 @@
+import argparse
 import asyncio
+import csv
+import itertools
+import json
 import logging
 import os
 import random
 import re
 import time
 import urllib.parse
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import wraps
-from typing import Any, Callable, TypeVar
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
 
+import numpy as np
 import pandas as pd
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
 from playwright_stealth import Stealth
 
+from config import SearchConfig
+from dedup import dedup_archive, merge_near_duplicates
+from enrichment import WebsiteEnricher
+from extraction import ContactExtractor
+from metrics import Metrics
+from normalization import (
+    canonical_phones,
+    country_for_location,
+    generic_site_mask,
+    normalize_names,
+    validate_phones,
+)
+from replay import ReplayRouter, SnapshotRecorder, SnapshotStore
+from storage import CheckpointStore, DetailCache, LeadStore, PlaceIndex, SiteCache
+from tiling import MapTile, bounds_from_viewport, grid_tiles, known_bounds, parse_bounds, parse_viewport
+
 T = TypeVar("T")
 F = TypeVar("F", bound=Callable[..., Any])
 
@@ -23,73 +47,307 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class TokenBucket:
+    """Tokens refill at ``rate`` per second, up to ``burst`` saved for later.
+
+    Waiters queue on a lock, so concurrent tabs are served in arrival order
+    and a burst is never handed out twice.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Take one token, sleeping until one is available; returns the seconds waited."""
+        start = time.monotonic()
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+        return time.monotonic() - start
+
+    def drain(self) -> None:
+        """Drop saved-up tokens so the next request waits a full interval."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
 class RateLimiter:
-    """Simple rate limiter to prevent request spam."""
+    """Per-host token buckets whose rate adapts to how the host responds.
+
+    Clean responses raise a host's rate by ``increase`` requests/second, up to
+    ``max_rate``; captcha pages and errors multiply it by ``decrease`` (down to
+    ``min_rate``), and a captcha also empties the bucket. This additive-increase,
+    multiplicative-decrease loop settles just under what the host tolerates.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 4,
+        min_rate: float = 0.05,
+        max_rate: float = 4.0,
+        increase: float = 0.05,
+        decrease: float = 0.5,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._buckets: dict[str, TokenBucket] = {}
+
+    @staticmethod
+    def host(url: str) -> str:
+        host = urllib.parse.urlsplit(url).netloc.lower() if "//" in url else url.lower()
+        return host.removeprefix("www.")
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = self.host(url)
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate = min(max(self.rate, self.min_rate), self.max_rate)
+            bucket = self._buckets[host] = TokenBucket(rate, self.burst)
+        return bucket
+
+    async def wait(self, url: str) -> None:
+        """Wait for ``url``'s host to allow another request."""
+        waited = await self.bucket(url).acquire()
+        metrics.observe("rate_limit_wait", waited)
+
+    def report(self, url: str, ok: bool = True, blocked: bool = False) -> None:
+        """Adapt ``url``'s host rate to a clean response, an error or a captcha."""
+        bucket = self.bucket(url)
+        if ok and not blocked:
+            bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+            return
+        bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+        metrics.inc("rate_limit_backoffs")
+        if blocked:
+            bucket.drain()
+        logger.debug(
+            f"Slowing {self.host(url)} to {bucket.rate:.2f} requests/s "
+            f"({'captcha' if blocked else 'error'})"
+        )
 
-    def __init__(self, min_delay: float = 1.0, max_delay: float = 3.0):
-        self.min_delay = min_delay
-        self.max_delay = max_delay
-        self.last_request_time = 0.0
-
-    async def wait(self) -> None:
-        """Wait appropriate time before next request."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_delay:
-            wait_time = (
-                self.min_delay
-                - elapsed
-                + random.uniform(0, self.max_delay - self.min_delay)
-            )
-            await asyncio.sleep(wait_time)
-        self.last_request_time = time.time()
+    def summary(self) -> dict[str, float]:
+        """Current requests/second per host."""
+        return {host: round(bucket.rate, 3) for host, bucket in self._buckets.items()}
+
+
+class WaitPolicy:
+    """Condition-based waits with a timeout cap and a random jitter floor.
+
+    The floor keeps some human-like randomness between actions even when the
+    condition is met immediately.
+    """
+
+    def __init__(
+        self,
+        timeout_ms: int = 10000,
+        network_idle_ms: int = 3000,
+        min_jitter: float = 0.2,
+        max_jitter: float = 0.6,
+    ):
+        self.timeout_ms = timeout_ms
+        self.network_idle_ms = network_idle_ms
+        self.min_jitter = min_jitter
+        self.max_jitter = max_jitter
+
+    def jitter(self) -> float:
+        """Return a random pause between the jitter bounds."""
+        return random.uniform(self.min_jitter, max(self.min_jitter, self.max_jitter))
+
+    async def wait(self, label: str, condition: Awaitable[Any]) -> bool:
+        """Await ``condition`` (which carries its own timeout), then the jitter floor."""
+        floor = self.jitter()
+        start = time.monotonic()
+        met = True
+        try:
+            await condition
+        except Exception:
+            met = False
+        waited = time.monotonic() - start
+        if waited < floor:
+            await asyncio.sleep(floor - waited)
+        logger.debug(
+            f"Waited {waited:.2f}s for {label} ({'met' if met else 'timed out'})"
+        )
+        return met
 
+    async def network_idle(self, page: Any, label: str) -> bool:
+        """Wait for network idle, capped at ``network_idle_ms``."""
+        return await self.wait(
+            label,
+            page.wait_for_load_state("networkidle", timeout=self.network_idle_ms),
+        )
+
+
+class BlockedError(Exception):
+    """Google answered with a captcha or "unusual traffic" page instead of content."""
+
+
+def classify_error(exc: BaseException) -> str:
+    """Sort a scraping failure into the class that decides how it is retried."""
+    if isinstance(exc, BlockedError):
+        return "blocked"
+    if isinstance(exc, (PlaywrightTimeoutError, TimeoutError)):
+        return "timeout"
+    message = str(exc).lower()
+    if "has been closed" in message or "target closed" in message or "disconnected" in message:
+        return "target_closed"
+    if "net::err_" in message or "ns_error_" in message:
+        return "network"
+    # Playwright reports exceptions thrown inside page.evaluate as "TypeError: ..." text
+    if isinstance(exc, (KeyError, ValueError, TypeError)) or "typeerror:" in message:
+        return "parse"
+    if "timeout" in message:
+        return "timeout"
+    return "other"
+
+
+# Attempts per error class, and how much longer than usual to back off before retrying
+RETRY_RULES: dict[str, tuple[int, float]] = {
+    "timeout": (3, 1.0),
+    "network": (3, 1.0),
+    # The next attempt opens a fresh page, so there is little to wait for
+    "target_closed": (2, 0.25),
+    # Hammering a captcha only makes it stick; wait much longer, once
+    "blocked": (2, 8.0),
+    # The same DOM parses the same way the second time
+    "parse": (1, 0.0),
+    "other": (2, 1.0),
+}
 
-def retry_on_failure(max_retries: int = 3, delay: float = 1.0) -> Callable[[F], F]:
-    """Decorator to retry async functions on failure."""
+
+class RetryPolicy:
+    """Retries with exponential backoff and jitter, tuned per error class.
+
+    A run-wide budget caps retries at ``min_budget`` plus ``budget_ratio`` of
+    all calls, so a streak of bad listings fails fast instead of stalling
+    every worker in backoff sleeps.
+    """
+
+    def __init__(
+        self,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        budget_ratio: float = 0.2,
+        min_budget: int = 10,
+        rules: dict[str, tuple[int, float]] | None = None,
+    ):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.min_budget = min_budget
+        self.rules = dict(RETRY_RULES if rules is None else rules)
+        self.calls = 0
+        self.retries = 0
+        self.recovered = 0
+        self.gave_up = 0
+        self.budget_exhausted = 0
+        self.errors: dict[str, int] = {}
+
+    def backoff(self, error_class: str, attempt: int) -> float:
+        """Seconds to sleep after failed ``attempt`` (1-based): half fixed, half jitter."""
+        multiplier = self.rules.get(error_class, self.rules["other"])[1]
+        cap = min(self.max_delay, self.base_delay * multiplier * 2 ** (attempt - 1))
+        return random.uniform(cap / 2, cap)
+
+    def budget_left(self) -> bool:
+        return self.retries < self.min_budget + self.budget_ratio * self.calls
+
+    async def run(
+        self,
+        operation: Callable[[], Awaitable[T]],
+        label: str = "operation",
+        url: str | None = None,
+    ) -> T:
+        """Await ``operation()`` until it succeeds or the policy gives up, then re-raise.
+
+        With a ``url``, every outcome is also reported to the rate limiter.
+        """
+        self.calls += 1
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = await operation()
+            except Exception as e:
+                error_class = classify_error(e)
+                self.errors[error_class] = self.errors.get(error_class, 0) + 1
+                metrics.inc(f"errors_{error_class}")
+                if url is not None:
+                    current_rate_limiter().report(url, ok=False, blocked=error_class == "blocked")
+                max_attempts = self.rules.get(error_class, self.rules["other"])[0]
+                if attempt >= max_attempts:
+                    self.gave_up += 1
+                    metrics.inc("retry_gave_up")
+                    raise
+                if not self.budget_left():
+                    self.budget_exhausted += 1
+                    metrics.inc("retry_budget_exhausted")
+                    raise
+                delay = self.backoff(error_class, attempt)
+                self.retries += 1
+                metrics.inc("retries")
+                metrics.inc(f"retries_{error_class}")
+                logger.debug(
+                    f"{label} failed ({error_class}, attempt {attempt}/{max_attempts}): "
+                    f"{e}; retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+            else:
+                if url is not None:
+                    current_rate_limiter().report(url)
+                if attempt > 1:
+                    self.recovered += 1
+                    metrics.inc("retry_recovered")
+                return result
+
+    def summary(self) -> dict[str, Any]:
+        """Calls, retries and outcomes so far, with failures counted per error class."""
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "recovered": self.recovered,
+            "gave_up": self.gave_up,
+            "budget_exhausted": self.budget_exhausted,
+            "errors": dict(self.errors),
+        }
+
+
+def retry_on_failure(
+    policy: RetryPolicy | None = None, label: str | None = None
+) -> Callable[[F], F]:
+    """Decorator that runs an async function under ``policy`` (the shared one by default)."""
 
     def decorator(func: F) -> F:
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            last_exception: Exception | None = None
-            for attempt in range(max_retries):
-                try:
-                    return await func(*args, **kwargs)
-                except Exception as e:
-                    last_exception = e
-                    if attempt < max_retries - 1:
-                        logger.warning(
-                            f"Attempt {attempt + 1}/{max_retries} failed: {e}. Retrying..."
-                        )
-                        await asyncio.sleep(delay * (attempt + 1))
-                    else:
-                        logger.error(f"All {max_retries} attempts failed")
-            raise last_exception  # type: ignore[arg-type]
+            return await (policy or retry_policy).run(
+                lambda: func(*args, **kwargs), label or func.__name__
+            )
 
         return wrapper  # type: ignore[return-value]
 
     return decorator  # type: ignore[return-value]
 
 
-SEARCH_CONFIG = {
-    "keywords": "",
-    "client_type": "",
-    "location": "",
-    "max_scrolls": 15,
-    "results_limit": 100,
-    "search_type": "maps",
-    "dork_query": "",
-    "target": "email",
-}
-
-PHONE_REGEX = r"(\+[\d\u00C0-\u00FF\u2070-\u209F\u2080-\u208F]{1,3}[-.\s]?\(?[\d\u00C0-\u00FF\u2070-\u209F\u2080-\u208F]{3}\)?[-.\s]?[\d\u00C0-\u00FF\u2070-\u209F\u2080-\u208F]{3}[-.\s]?[\d\u00C0-\u00FF\u2070-\u209F\u2080-\u208F]{4})"
-EMAIL_REGEX = r"([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})"
-
-UNICODE_DIGITS = str.maketrans(
-    "𝟎𝟏𝟐𝟑𝟒𝟓𝟔𝟕𝟖𝟗𝟘𝟙𝟚𝟛𝟜𝟝𝟞𝟟𝟠𝟡𝟢𝟣𝟤𝟥𝟦𝟧𝟨𝟩𝟪𝟫𝟬𝟭𝟮𝟯𝟰𝟱𝟲𝟳𝟴𝟵０１２３４５６７８９₀₁₂₃₄₅₆₇₈₉⓪①②③④⑤⑥⑦⑧⑨",
-    "0123456789012345678901234567890123456789012345678901234567890123456789",
-)
-
-BD_PHONE_REGEX = r"(?:\+?88)?[01][\d\u00C0-\u00FF\u2070-\u209F\u2080-\u208F]{9}"
+# Settings for interactive runs, and the defaults batch jobs start from
+SEARCH_CONFIG: dict[str, Any] = SearchConfig().to_dict()
 
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -103,7 +361,175 @@ USER_AGENTS = [
 
 DEFAULT_VIEWPORT = {"width": 1920, "height": 1080}  # type: ignore[assignment]
 
-rate_limiter = RateLimiter(min_delay=2.0, max_delay=5.0)
+VIEWPORTS = [
+    {"width": 1920, "height": 1080},
+    {"width": 1366, "height": 768},
+    {"width": 1536, "height": 864},
+    {"width": 1440, "height": 900},
+]
+
+# Requests we never read from when block_resources is on
+BLOCKED_RESOURCE_TYPES = ["image", "media", "font"]
+BLOCKED_URL_PATTERNS = [
+    # Map tiles and Street View imagery
+    "/maps/vt",
+    "/kh/v=",
+    "khms",
+    "streetviewpixels",
+    # Analytics and ads
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "connect.facebook.net",
+    "play.google.com/log",
+    "/gen_204",
+]
+
+# Every /maps/place link in the results feed, read in a single round-trip
+FEED_LISTINGS_JS = """
+() => Array.from(
+    document.querySelectorAll('a[href*="/maps/place"]'),
+    (a) => ({href: a.getAttribute("href"), aria_label: a.getAttribute("aria-label")}),
+)
+"""
+
+# Text, title and links of every SERP result block, read in a single round-trip
+SERP_BLOCKS_JS = """
+([selector, fallbackSelector]) => {
+    let blocks = document.querySelectorAll(selector);
+    if (!blocks.length) {
+        blocks = document.querySelectorAll(fallbackSelector);
+    }
+    return Array.from(blocks, (block) => {
+        const title = block.querySelector("h3");
+        return {
+            text: block.innerText,
+            title: title ? title.innerText : "",
+            links: Array.from(block.querySelectorAll("a"), (a) => ({
+                href: a.getAttribute("href"),
+                has_h3: a.querySelector("h3") !== null,
+            })),
+        };
+    });
+}
+"""
+
+# Scroll the results feed and report how many children it had beforehand
+FEED_SCROLL_JS = """
+(selector) => {
+    const el = document.querySelector(selector);
+    if (!el) {
+        return -1;
+    }
+    const count = el.children.length;
+    el.scrollBy(0, 2000);
+    return count;
+}
+"""
+
+# True once the feed has more children than before, or shows the end marker
+FEED_GREW_JS = """
+([selector, previousCount]) => {
+    const el = document.querySelector(selector);
+    if (el && el.children.length > previousCount) {
+        return true;
+    }
+    return document.body.innerText.includes("You've reached the end of the list.");
+}
+"""
+
+# Any contact row on a place page means the detail panel has rendered
+DETAIL_READY_SELECTOR = 'button[data-item-id], a[data-item-id]'
+
+# Everything scrape_listing_details reads from a place page, in a single round-trip
+DETAIL_PAGE_JS = """
+() => {
+    const attr = (selector, name) => {
+        const el = document.querySelector(selector);
+        return el ? el.getAttribute(name) : null;
+    };
+    const skipped = ["google.com", "maps.google", "apple.com", "microsoft.com"];
+    let externalHref = null;
+    for (const a of document.querySelectorAll("a[href]")) {
+        const href = a.getAttribute("href");
+        if (href && href.startsWith("http")
+                && skipped.every((x) => !href.toLowerCase().includes(x))) {
+            externalHref = href;
+            break;
+        }
+    }
+    return {
+        phone_item_id: attr('button[data-item-id^="phone:"]', "data-item-id"),
+        phone_label: attr('button[data-item-id^="phone:"]', "aria-label"),
+        authority_href: attr('a[data-item-id="authority"]', "href"),
+        external_href: externalHref,
+        address_label: attr('button[data-item-id="address"]', "aria-label"),
+        body_text: document.body ? document.body.innerText : "",
+    };
+}
+"""
+
+# True on Google's captcha / "unusual traffic" pages, checked without sending the HTML back
+CAPTCHA_CHECK_JS = """
+() => {
+    if (location.pathname.startsWith("/sorry")) {
+        return true;
+    }
+    if (document.querySelector(
+            "form#captcha-form, iframe[src*='google.com/recaptcha'], div.g-recaptcha")) {
+        return true;
+    }
+    if (document.querySelector("#search, #rso")) {
+        return false;
+    }
+    // textContent skips layout, unlike innerText, and the notice is near the top
+    const text = document.body ? document.body.textContent.slice(0, 5000) : "";
+    return text.includes("detected unusual traffic") || text.includes("not a robot");
+}
+"""
+
+rate_limiter = RateLimiter()
+retry_policy = RetryPolicy()
+wait_policy = WaitPolicy()
+contact_extractor = ContactExtractor()
+metrics = Metrics()
+
+# Batch jobs run concurrently with their own settings, so run_job keeps each
+# job's policies in context variables, which every task the job starts inherits
+_job_wait_policy: ContextVar[WaitPolicy | None] = ContextVar("job_wait_policy", default=None)
+_job_block_resources: ContextVar[bool | None] = ContextVar("job_block_resources", default=None)
+_job_rate_limiter: ContextVar[RateLimiter | None] = ContextVar("job_rate_limiter", default=None)
+# Limiters for jobs whose request rates differ from the shared limiter's, by
+# (requests_per_second, request_burst, max_requests_per_second)
+_job_rate_limiters: dict[tuple[float, int, float], RateLimiter] = {}
+
+
+def current_wait_policy() -> WaitPolicy:
+    """The running batch job's wait policy, or the shared one outside a job."""
+    return _job_wait_policy.get() or wait_policy
+
+
+def current_rate_limiter() -> RateLimiter:
+    """The running batch job's rate limiter, or the shared one outside a job."""
+    return _job_rate_limiter.get() or rate_limiter
+
+
+def rate_limiter_for(job: SearchConfig) -> RateLimiter:
+    """The limiter for ``job``'s request rates.
+
+    Jobs with the same rates share one limiter, so their requests to a host
+    are paced together; jobs with the shared limiter's rates use it.
+    """
+    settings = (job.requests_per_second, job.request_burst, job.max_requests_per_second)
+    if settings == (rate_limiter.rate, rate_limiter.burst, rate_limiter.max_rate):
+        return rate_limiter
+    limiter = _job_rate_limiters.get(settings)
+    if limiter is None:
+        rate, burst, max_rate = settings
+        limiter = _job_rate_limiters[settings] = RateLimiter(rate, burst, max_rate=max_rate)
+    return limiter
 
 
 def is_valid_profile_url(url: str) -> bool:
@@ -191,9 +617,13 @@ def is_valid_profile_url(url: str) -> bool:
 async def human_like_scroll(
     page: Any, scroll_pauses: list[float] | None = None
 ) -> None:
-    """Perform human-like scrolling behavior on a page."""
+    """Perform human-like scrolling behavior on a page.
+
+    Pauses default to the wait policy's jitter floor instead of fixed sleeps.
+    """
+    waits = current_wait_policy()
     if scroll_pauses is None:
-        scroll_pauses = [0.3, 0.5, 0.8, 0.4, 0.6, 0.7, 0.3, 0.5, 0.9]
+        scroll_pauses = [waits.jitter() for _ in range(9)]
 
     for i, pause in enumerate(scroll_pauses):
         scroll_amount = 300 + (i * 73) % 500
@@ -201,11 +631,11 @@ async def human_like_scroll(
         await asyncio.sleep(pause)
         if i % 3 == 0:
             await page.evaluate("window.scrollBy(0, -100)")
-            await asyncio.sleep(0.2)
+            await asyncio.sleep(waits.min_jitter)
 
 
 async def scrape_listing_details(
-    page: Any, context: Any, listing_element: Any
+    page: Any, context: Any, listing: dict[str, str]
 ) -> dict[str, str] | None:
     """Open listing in new tab and extract details."""
     business_data: dict[str, str] = {
@@ -215,169 +645,126 @@ async def scrape_listing_details(
         "Address": "",
     }
 
-    try:
-        aria_label = await listing_element.get_attribute("aria-label")
-        if aria_label:
-            business_data["Business Name"] = aria_label.split(" - ")[0].strip()[:100]
-    except Exception:
-        logger.debug("Failed to get aria-label from listing element")
+    aria_label = listing.get("aria_label")
+    if aria_label:
+        business_data["Business Name"] = aria_label.split(" - ")[0].strip()[:100]
 
     if not business_data["Business Name"]:
         return None
 
-    try:
-        href = await listing_element.get_attribute("href")
-        if not href:
-            return None
+    href = listing.get("href")
+    if not href:
+        return None
 
+    try:
         # Check if context is still valid
-        if hasattr(context, "new_page"):
-            new_page = await context.new_page()
-        else:
+        if not hasattr(context, "new_page"):
             logger.debug("Context is not valid for creating new page")
             return business_data
 
-        try:
-            await new_page.goto(href, timeout=30000)
-            await asyncio.sleep(2)
-            
+        async def load_details() -> dict[str, Any]:
+            # A fresh tab per attempt, so a crashed or closed one is never reused
+            new_page = await context.new_page()
             try:
-                await new_page.wait_for_load_state("domcontentloaded", timeout=5000)
-            except Exception:
-                pass
-        except Exception as e:
-            logger.debug(f"Failed to navigate to {href}: {e}")
-            await new_page.close()
-            return business_data
+                await current_rate_limiter().wait(href)
+                with metrics.timer("detail_goto"):
+                    await new_page.goto(href, wait_until="domcontentloaded", timeout=30000)
+                    waits = current_wait_policy()
+                    await waits.wait(
+                        "detail panel",
+                        new_page.wait_for_selector(
+                            DETAIL_READY_SELECTOR, timeout=waits.timeout_ms
+                        ),
+                    )
+                if "/sorry/" in new_page.url:
+                    raise BlockedError(f"Redirected to {new_page.url[:80]}")
+                # One round-trip for every field we read from the detail page
+                with metrics.timer("dom_extraction"):
+                    return await new_page.evaluate(DETAIL_PAGE_JS)
+            finally:
+                await new_page.close()
 
         try:
-            phone_button = await new_page.query_selector(
-                'button[data-item-id^="phone:"]'
-            )
-            if phone_button:
-                data_item = await phone_button.get_attribute("data-item-id")
-                if data_item and "tel:" in data_item:
-                    phone = data_item.split("tel:")[-1].strip()
-                    if phone:
-                        business_data["Phone Number"] = phone
-                if not business_data["Phone Number"]:
-                    aria = await phone_button.get_attribute("aria-label")
-                    if aria and ":" in aria:
-                        phone_part = aria.split(":")[-1].strip()
-                        if phone_part:
-                            business_data["Phone Number"] = phone_part
-        except Exception:
-            logger.debug("Failed to extract phone from button")
-
-        try:
-            # Most reliable: look for the Website button specifically
-            website_button = await new_page.query_selector('a[data-item-id="authority"]')
-            if website_button:
-                href = await website_button.get_attribute("href")
-                if href:
-                    business_data["Website"] = href
-
-            if not business_data["Website"]:
-                website_links = await new_page.query_selector_all("a[href]")
-                for link in website_links:
-                    try:
-                        href = await link.get_attribute("href")
-                        if href and href.startswith("http"):
-                            href_lower = href.lower()
-                            # Filter out common non-business URLs
-                            if all(x not in href_lower for x in ["google.com", "maps.google", "apple.com", "microsoft.com"]):
-                                business_data["Website"] = href
-                                break
-                    except Exception:
-                        pass
-        except Exception:
-            logger.debug("Failed to extract website from links")
+            details = await retry_policy.run(load_details, "detail page", href)
+        except Exception as e:
+            metrics.inc("detail_page_failures")
+            logger.debug(f"Failed to load details for {href}: {e}")
+            return business_data
 
-        try:
-            address_button = await new_page.query_selector(
-                'button[data-item-id="address"]'
-            )
-            if address_button:
-                aria = await address_button.get_attribute("aria-label")
-                if aria and "ঠিকানা:" in aria:
-                    address = aria.split("ঠিকানা:")[-1].strip()
-                    if address:
-                        business_data["Address"] = address[:200]
-                elif aria:
-                    business_data["Address"] = aria[:200]
-        except Exception:
-            logger.debug("Failed to extract address")
+        data_item = details.get("phone_item_id")
+        if data_item and "tel:" in data_item:
+            phone = data_item.split("tel:")[-1].strip()
+            if phone:
+                business_data["Phone Number"] = phone
+        if not business_data["Phone Number"]:
+            aria = details.get("phone_label")
+            if aria and ":" in aria:
+                phone_part = aria.split(":")[-1].strip()
+                if phone_part:
+                    business_data["Phone Number"] = phone_part
+
+        # Most reliable: the Website button, then the first external link
+        business_data["Website"] = (
+            details.get("authority_href") or details.get("external_href") or ""
+        )
 
-        try:
-            body_text = await new_page.evaluate("() => document.body.innerText")
-            body_text_normalized = body_text.translate(UNICODE_DIGITS)
-
-            if not business_data["Phone Number"]:
-                phone_match = re.search(PHONE_REGEX, body_text)
-                if not phone_match:
-                    phone_match = re.search(PHONE_REGEX, body_text_normalized)
-                if phone_match:
-                    business_data["Phone Number"] = phone_match.group(1).strip()
-
-            if not business_data["Phone Number"]:
-                bd_phone_match = re.search(BD_PHONE_REGEX, body_text_normalized)
+        aria = details.get("address_label")
+        if aria and "ঠিকানা:" in aria:
+            address = aria.split("ঠিকানা:")[-1].strip()
+            if address:
+                business_data["Address"] = address[:200]
+        elif aria:
+            business_data["Address"] = aria[:200]
+
+        # The page text is only searched for the fields the DOM didn't supply
+        kinds: list[str] = []
+        if not business_data["Phone Number"]:
+            kinds += ["phone", "bd_phone"]
+        if not business_data["Website"]:
+            kinds.append("website")
+        if not business_data["Address"]:
+            kinds += ["bd_address", "address"]
+        if not kinds:
+            return business_data
+        with metrics.timer("regex_extraction"):
+            contacts = contact_extractor.scan(details.get("body_text") or "", kinds, first=True)
+
+        if not business_data["Phone Number"]:
+            phone_match = contacts.first("phone")
+            if phone_match:
+                business_data["Phone Number"] = phone_match.value
+            else:
+                bd_phone_match = contacts.first("bd_phone")
                 if bd_phone_match:
-                    phone_val = bd_phone_match.group(0).strip()
+                    phone_val = bd_phone_match.value
                     if not phone_val.startswith("+"):
                         phone_val = "+88" + phone_val
                     business_data["Phone Number"] = phone_val
 
-            if not business_data["Phone Number"]:
-                all_phones = re.findall(r"01[3-9][\d]{8}", body_text_normalized)
-                if all_phones:
-                    business_data["Phone Number"] = "+88" + all_phones[0]
-
-            if not business_data["Website"]:
-                website_match = re.search(
-                    r"(?:https?://)?(?:www\.)?([a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}(?!\s*\d)",
-                    body_text,
-                )
-                if website_match:
-                    website = website_match.group(0)
-                    if not website.startswith("http"):
-                        website = "https://" + website
-                    if "google" not in website.lower():
-                        business_data["Website"] = website
-
-            if not business_data["Address"]:
-                address_match = re.search(
-                    r"\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln)[,\s]+[A-Za-z\s]+,?\s*(?:NY|NJ|CT|PA)?\s*\d{5}",
-                    body_text,
-                )
-                if address_match:
-                    business_data["Address"] = address_match.group(0).strip()[:200]
-
-                bd_address_match = re.search(
-                    r"House-?\d+[\s,]+[A-Za-z]+(?:Road|Rd|Street|St|Avenue|Ave|Banani|Gulshan|Dhanmondi|Mirpur|Baridhara)[,\s]*,?\s*Dhaka\s*\d*",
-                    body_text,
-                    re.IGNORECASE,
-                )
-                if bd_address_match:
-                    business_data["Address"] = bd_address_match.group(0).strip()[:200]
-
-        except Exception:
-            logger.debug("Failed to extract details from listing page")
+        if not business_data["Website"]:
+            for website_match in contacts.websites:
+                website = website_match.value
+                if not website.startswith("http"):
+                    website = "https://" + website
+                if "google" not in website.lower():
+                    business_data["Website"] = website
+                    break
 
-        await new_page.close()
+        if not business_data["Address"]:
+            address_match = contacts.first("bd_address", "address")
+            if address_match:
+                business_data["Address"] = address_match.value[:200]
 
     except Exception:
+        metrics.inc("detail_failures")
         logger.debug("Failed to navigate to listing")
 
     return business_data
 
 
-async def _initialize_browser(
-    headless: bool = True, use_stealth: bool = True
-) -> tuple[Any, Any, Any]:
-    """Initialize Playwright browser with stealth settings."""
-    p = await async_playwright().start()
-    user_agent = random.choice(USER_AGENTS)
-    browser = await p.chromium.launch(
+async def _launch_browser(p: Any, headless: bool = True) -> Any:
+    """Launch Chromium with the flags every scraper uses."""
+    return await p.chromium.launch(
         headless=headless,
         args=[
             "--disable-blink-features=AutomationControlled",
@@ -387,31 +774,674 @@ async def _initialize_browser(
             "--disable-web-security",
         ],
     )
-    context = await browser.new_context(
-        viewport=random.choice(
-            [
-                {"width": 1920, "height": 1080},
-                {"width": 1366, "height": 768},
-                {"width": 1536, "height": 864},
-                {"width": 1440, "height": 900},
-            ]
-        ),
-        user_agent=user_agent,
+
+
+# Dhaka, where new contexts start and where leases without a tile go back to
+DEFAULT_GEOLOCATION = {"latitude": 23.8103, "longitude": 90.4125}
+
+
+async def _new_context(browser: Any, user_agent: str | None = None) -> Any:
+    """Create a browser context with a rotated user agent and viewport."""
+    return await browser.new_context(
+        viewport=random.choice(VIEWPORTS),
+        user_agent=user_agent or random.choice(USER_AGENTS),
         locale="en-US,en-GB,en-BD",
         timezone_id="Asia/Dhaka",
         permissions=["geolocation"],
-        geolocation={"latitude": 23.8103, "longitude": 90.4125},
+        geolocation=DEFAULT_GEOLOCATION,
+    )
+
+
+class ResourceBlocker:
+    """Route handler that aborts images, fonts, map tiles and trackers.
+
+    Aborted requests never report a size, so savings are measured by comparing
+    ``allowed_bytes`` (from Content-Length) between runs with blocking on and off.
+    """
+
+    def __init__(
+        self,
+        resource_types: list[str] | None = None,
+        url_patterns: list[str] | None = None,
+    ):
+        self.resource_types = set(
+            BLOCKED_RESOURCE_TYPES if resource_types is None else resource_types
+        )
+        self.url_patterns = tuple(
+            BLOCKED_URL_PATTERNS if url_patterns is None else url_patterns
+        )
+        self.blocked_requests = 0
+        self.blocked_by_reason: dict[str, int] = {}
+        self.allowed_requests = 0
+        self.allowed_bytes = 0
+
+    async def attach(self, context: Any, enabled: Callable[[], bool] | None = None) -> None:
+        """Install the blocker on every page of ``context``.
+
+        With ``enabled``, requests are only blocked while it returns True, so a
+        pooled context can block for one search and not for the next.
+        """
+
+        async def handle(route: Any) -> None:
+            await self._handle_route(route, enabled is None or enabled())
+
+        await context.route("**/*", handle)
+        context.on("response", self._on_response)
+
+    def _block_reason(self, resource_type: str, url: str) -> str | None:
+        if resource_type in self.resource_types:
+            return resource_type
+        url_lower = url.lower()
+        for pattern in self.url_patterns:
+            if pattern in url_lower:
+                return pattern
+        return None
+
+    async def _handle_route(self, route: Any, enabled: bool = True) -> None:
+        request = route.request
+        reason = self._block_reason(request.resource_type, request.url) if enabled else None
+        try:
+            if reason:
+                self.blocked_requests += 1
+                self.blocked_by_reason[reason] = self.blocked_by_reason.get(reason, 0) + 1
+                await route.abort()
+            else:
+                self.allowed_requests += 1
+                # Let a replay router, if any, answer it
+                await route.fallback()
+            return
+        except Exception as e:
+            logger.debug(f"Route handling failed for {request.url[:80]}: {e}")
+        # A request that is neither aborted nor continued would hang its page
+        try:
+            await route.continue_()
+        except Exception:
+            logger.debug(f"Could not continue {request.url[:80]} either")
+
+    def _on_response(self, response: Any) -> None:
+        try:
+            self.allowed_bytes += int(response.headers.get("content-length", 0))
+        except (TypeError, ValueError):
+            pass
+
+    def summary(self) -> dict[str, Any]:
+        """Return the counters collected so far."""
+        return {
+            "blocked_requests": self.blocked_requests,
+            "blocked_by_reason": dict(self.blocked_by_reason),
+            "allowed_requests": self.allowed_requests,
+            "allowed_bytes": self.allowed_bytes,
+        }
+
+
+class _PooledContext:
+    """A browser context owned by BrowserPool plus its usage counters."""
+
+    def __init__(self) -> None:
+        self.context: Any = None
+        self.uses = 0
+        self.errors = 0
+        self.retired = False
+        self.block_resources = False
+        self.user_agent = ""
+        self.geolocation = DEFAULT_GEOLOCATION
+        # Page loads and blocks of the current context, shared with BrowserPool.sessions
+        self.session: dict[str, Any] | None = None
+
+
+class BrowserPool:
+    """Long-lived Chromium instance that leases pre-warmed browser contexts.
+
+    Contexts are recycled after ``max_uses`` leases or ``max_errors`` failures,
+    so user agents and viewports keep rotating across a long batch of searches.
+    With ``block_resources`` every lease blocks images, fonts, map tiles and
+    trackers, unless the batch job leasing it turned blocking off.
+    With a ``replay`` router every request is answered from recorded fixtures
+    instead of the network; a ``recorder`` saves live responses as fixtures.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        headless: bool = True,
+        max_uses: int = 20,
+        max_errors: int = 3,
+        block_resources: bool = False,
+        replay: ReplayRouter | None = None,
+        recorder: SnapshotRecorder | None = None,
+    ):
+        self.size = max(1, size)
+        self.headless = headless
+        self.max_uses = max_uses
+        self.max_errors = max_errors
+        self.block_resources = block_resources
+        self.blocker = ResourceBlocker() if block_resources else None
+        self.replay = replay
+        self.recorder = recorder
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._idle: asyncio.Queue[_PooledContext] = asyncio.Queue()
+        self._leased: dict[Any, _PooledContext] = {}
+        self._start_lock = asyncio.Lock()
+        self.sessions: list[dict[str, Any]] = []
+
+    async def start(self) -> None:
+        """Launch the browser and pre-warm ``size`` contexts."""
+        async with self._start_lock:
+            if self._browser is not None:
+                return
+            with metrics.timer("browser_launch"):
+                self._playwright = await async_playwright().start()
+                self._browser = await _launch_browser(self._playwright, self.headless)
+            for _ in range(self.size):
+                entry = _PooledContext()
+                entry.context = await self._open_context(entry)
+                self._idle.put_nowait(entry)
+            logger.info(
+                f"Browser pool ready ({self.size} contexts, headless={self.headless})"
+            )
+
+    async def _open_context(self, entry: _PooledContext) -> Any:
+        # Never reuse the user agent this slot just had, so a rotated session looks new
+        entry.user_agent = random.choice(
+            [ua for ua in USER_AGENTS if ua != entry.user_agent] or USER_AGENTS
+        )
+        context = await _new_context(self._browser, entry.user_agent)
+        entry.geolocation = DEFAULT_GEOLOCATION
+        entry.session = {
+            "session": len(self.sessions) + 1,
+            "user_agent": entry.user_agent,
+            "pages": 0,
+            "blocks": 0,
+        }
+        self.sessions.append(entry.session)
+        # Routes run newest first, so the blocker sees requests before replay
+        if self.replay is not None:
+            await self.replay.attach(context)
+        if self.recorder is not None:
+            self.recorder.attach(context)
+        if self.blocker is not None:
+            await self.blocker.attach(context, lambda: entry.block_resources)
+        return context
+
+    async def close(self) -> None:
+        """Close the browser and stop Playwright."""
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self._idle = asyncio.Queue()
+        self._leased.clear()
+
+    async def __aenter__(self) -> "BrowserPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def acquire(
+        self, use_stealth: bool = True, geolocation: dict[str, float] | None = None
+    ) -> Any:
+        """Lease a context and return a fresh page in it.
+
+        The context reports ``geolocation`` for this lease only; without one it
+        reports the default location, whatever the previous lease asked for.
+        """
+        await self.start()
+        entry = await self._idle.get()
+        job_blocks = _job_block_resources.get()
+        entry.block_resources = self.block_resources if job_blocks is None else job_blocks
+        try:
+            if entry.context is None:
+                entry.context = await self._open_context(entry)
+            geolocation = geolocation or DEFAULT_GEOLOCATION
+            if geolocation != entry.geolocation:
+                await entry.context.set_geolocation(geolocation)
+                entry.geolocation = geolocation
+            page = await entry.context.new_page()
+        except Exception:
+            entry.errors += 1
+            await self._recycle(entry)
+            raise
+
+        if use_stealth:
+            try:
+                stealth = Stealth()
+                await stealth.apply_stealth_async(page)
+            except Exception:
+                logger.debug("Stealth failed, continuing without it")
+
+        self._leased[entry.context] = entry
+        return page
+
+    def mark_error(self, page: Any) -> None:
+        """Count a failure against the context that owns ``page``."""
+        metrics.inc("page_errors")
+        entry = self._leased.get(page.context)
+        if entry is not None:
+            entry.errors += 1
+
+    def record_page(self, page: Any, blocked: bool = False) -> None:
+        """Count a page load, and whether it was blocked, against ``page``'s session."""
+        entry = self._leased.get(page.context)
+        if entry is None or entry.session is None:
+            return
+        entry.session["pages"] += 1
+        if blocked:
+            entry.session["blocks"] += 1
+
+    def session_summary(self) -> list[dict[str, Any]]:
+        """Page loads, blocks and block rate of every context opened so far."""
+        return [
+            {
+                **session,
+                "block_rate": round(session["blocks"] / session["pages"], 3) if session["pages"] else 0.0,
+            }
+            for session in self.sessions
+        ]
+
+    def log_sessions(self) -> None:
+        """Log how many sessions were opened and which of them got blocked."""
+        sessions = self.session_summary()
+        blocked = [session for session in sessions if session["blocks"]]
+        if not sessions:
+            return
+        logger.info(f"Sessions: {len(sessions)} opened, {len(blocked)} hit a captcha")
+        for session in blocked:
+            logger.info(
+                f"  session {session['session']}: {session['blocks']}/{session['pages']} "
+                f"pages blocked ({session['user_agent'][:60]})"
+            )
+
+    def retire(self, page: Any) -> None:
+        """Force the context that owns ``page`` to be replaced on release."""
+        entry = self._leased.get(page.context)
+        if entry is not None:
+            entry.retired = True
+
+    async def release(self, page: Any) -> None:
+        """Close the lease's pages and return its context to the pool."""
+        entry = self._leased.pop(page.context, None)
+        if entry is None:
+            return
+        entry.uses += 1
+        for open_page in list(entry.context.pages):
+            try:
+                await open_page.close()
+            except Exception:
+                logger.debug("Failed to close leased page")
+        await self._recycle(entry)
+
+    async def _recycle(self, entry: _PooledContext) -> None:
+        """Return ``entry`` to the idle queue, replacing worn-out contexts."""
+        if entry.context is not None and (
+            entry.retired
+            or entry.uses >= self.max_uses
+            or entry.errors >= self.max_errors
+        ):
+            metrics.inc("context_recycles")
+            logger.debug(
+                f"Recycling browser context (uses={entry.uses}, errors={entry.errors})"
+            )
+            try:
+                await entry.context.close()
+            except Exception:
+                logger.debug("Failed to close browser context")
+            entry.context = None
+            entry.uses = entry.errors = 0
+            entry.retired = False
+        self._idle.put_nowait(entry)
+
+
+def normalize_place_href(href: str) -> str:
+    """Strip the query string and fragment, which change between visits to a place."""
+    parsed = urllib.parse.urlsplit(href)
+    return urllib.parse.urlunsplit(
+        (parsed.scheme.lower(), parsed.netloc.lower(), parsed.path, "", "")
     )
-    page = await context.new_page()
 
-    if use_stealth:
+
+# Feature ID ("!1s0x...:0x...") or Place ID ("!19sChIJ...") in a place href.
+# Place IDs are case-sensitive; feature IDs are hex, so only their case is folded.
+PLACE_ID_REGEX = re.compile(r"!1s(0x[0-9a-fA-F]+:0x[0-9a-fA-F]+)|!19s(ChIJ[\w-]+)")
+
+
+def place_id(href: str) -> str:
+    """Identify a place by the ID in its href, which stays the same across searches."""
+    match = PLACE_ID_REGEX.search(href)
+    if match is None:
+        # Without an ID, key on the href minus the "/@lat,lng,zoomz" viewport,
+        # which depends on where the map was when the link was read
+        parts = normalize_place_href(href).split("/")
+        return "/".join(part for part in parts if not part.startswith("@"))
+    if match.group(1):
+        return match.group(1).lower()
+    return match.group(2)
+
+
+def checkpoint_key(search_type: str, search_query: str) -> str:
+    """Identify a search job in the checkpoint store."""
+    kind = "maps" if search_type in ("maps", "google_maps") else "dork"
+    return f"{kind}:{search_query}"
+
+
+def maps_query(keywords: str, location: str, tile: MapTile | None = None) -> str:
+    """The query a Maps search (or one tile of it) is logged and checkpointed under."""
+    query = f"{keywords} in {location}"
+    return f"{query} [{tile.key}]" if tile is not None else query
+
+
+def _has_details(business_data: dict[str, str]) -> bool:
+    """Whether a listing's detail page gave anything beyond its name."""
+    return any(business_data.get(field) for field in ("Phone Number", "Website", "Address"))
+
+
+class _ResultsBudget:
+    """A results limit shared by concurrent searches, like the tiles of one area.
+
+    Once it runs out, every collector that joined it is marked done.
+    """
+
+    def __init__(self, limit: int):
+        self.remaining = limit
+        self._collectors: list["_ListingCollector"] = []
+
+    def join(self, collector: "_ListingCollector") -> None:
+        self._collectors.append(collector)
+        if self.remaining <= 0:
+            collector.done.set()
+
+    def take(self, count: int = 1) -> bool:
+        """Claim ``count`` results; False if none were left."""
+        if self.remaining <= 0:
+            return False
+        self.remaining -= count
+        if self.remaining <= 0:
+            for collector in self._collectors:
+                collector.done.set()
+        return True
+
+
+class _ListingCollector:
+    """Reassemble concurrently scraped listings in the order they were found."""
+
+    def __init__(
+        self,
+        results_limit: int,
+        lead_store: LeadStore | None = None,
+        query: str = "",
+        checkpoint_store: CheckpointStore | None = None,
+        checkpoint_every: int = 10,
+        place_index: PlaceIndex | None = None,
+        budget: _ResultsBudget | None = None,
+    ):
+        self.results: list[dict[str, str]] = []
+        self.results_limit = results_limit
+        self.lead_store = lead_store
+        self.query = query
+        self.checkpoint_store = checkpoint_store
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.place_index = place_index
+        self.scroll_count = 0
+        # What the feed showed, kept with the final checkpoint (see scrape_maps_tiles)
+        self.feed_stats: dict[str, Any] = {}
+        # Place IDs whose details are finished and flushed to results
+        self.completed_places: set[str] = set()
+        self.done = asyncio.Event()
+        self._pending: dict[int, tuple[dict[str, str] | None, str]] = {}
+        self._next_index = 0
+        self._since_checkpoint = 0
+        self.budget = budget
+        if budget is not None:
+            budget.join(self)
+
+    def restore(self, state: dict[str, Any]) -> None:
+        """Pick up the results and finished listings of an interrupted run."""
+        restored = state.get("results", [])
+        self.results.extend(restored)
+        if self.budget is not None and restored:
+            self.budget.take(len(restored))
+        # Checkpoints from before place IDs list normalized hrefs instead
+        self.completed_places.update(
+            state.get("completed_places")
+            or [place_id(href) for href in state.get("completed_hrefs", [])]
+        )
+        if len(self.results) >= self.results_limit:
+            self.done.set()
+
+    def save_checkpoint(self, completed: bool = False) -> None:
+        if self.checkpoint_store is None:
+            return
+        self.checkpoint_store.save(
+            checkpoint_key("maps", self.query),
+            {
+                "results": self.results,
+                "completed_places": sorted(self.completed_places),
+                "scroll_count": self.scroll_count,
+                "feed_stats": self.feed_stats,
+            },
+            completed=completed,
+        )
+        self._since_checkpoint = 0
+
+    def add(self, index: int, business_data: dict[str, str] | None, href: str) -> None:
+        """Record a finished listing and flush every contiguous result."""
+        self._pending[index] = (business_data, href)
+        while self._next_index in self._pending and not self.done.is_set():
+            data, data_href = self._pending.pop(self._next_index)
+            self._next_index += 1
+            listing_id = place_id(data_href)
+            duplicate = listing_id in self.completed_places
+            self.completed_places.add(listing_id)
+            self._since_checkpoint += 1
+
+            if (
+                data
+                and data.get("Business Name")
+                and not duplicate
+                and (self.budget is None or self.budget.take())
+            ):
+                data = {**data, "Place ID": listing_id}
+                self.results.append(data)
+                metrics.inc("leads")
+                if self.lead_store is not None:
+                    self.lead_store.add(data, self.query)
+                # Only complete records, so a failed detail load is retried next run
+                if self.place_index is not None and _has_details(data):
+                    self.place_index.add(listing_id, self.query)
+                logger.info(
+                    f"  + {data['Business Name'][:40]:<40} | "
+                    f"Phone: {data.get('Phone Number', 'N/A')[:15]}"
+                )
+
+            if len(self.results) >= self.results_limit:
+                self.done.set()
+
+        if self._since_checkpoint >= self.checkpoint_every:
+            self.save_checkpoint()
+
+
+async def _listing_detail_worker(
+    queue: asyncio.Queue,
+    page: Any,
+    collector: _ListingCollector,
+    detail_cache: DetailCache | None = None,
+) -> None:
+    """Drain listings from the queue and scrape their detail pages."""
+    while True:
+        index, listing = await queue.get()
         try:
-            stealth = Stealth()
-            await stealth.apply_stealth_async(page)
+            business_data = None
+            if not collector.done.is_set() and not page.is_closed():
+                try:
+                    business_data = await scrape_listing_details(
+                        page, page.context, listing
+                    )
+                except Exception as e:
+                    metrics.inc("detail_failures")
+                    logger.debug(f"Failed to process listing: {e}")
+
+            # Partial records from failed navigations are not worth caching
+            if detail_cache is not None and business_data and _has_details(business_data):
+                detail_cache.put(place_id(listing["href"]), business_data)
+            collector.add(index, business_data, listing["href"])
+        finally:
+            queue.task_done()
+
+
+async def _watch_workers(awaitable: Awaitable[T], workers: list[asyncio.Task]) -> T:
+    """Await ``awaitable``, but re-raise a worker's error instead of waiting forever.
+
+    Workers only stop by failing, and a dead worker leaves its share of the
+    queue unprocessed, so the producer's puts and ``queue.join()`` would hang.
+    """
+    task = asyncio.ensure_future(awaitable)
+    done, _ = await asyncio.wait([task, *workers], return_when=asyncio.FIRST_COMPLETED)
+    if task in done:
+        return task.result()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    for worker in done:
+        worker.result()
+    raise RuntimeError("Listing detail worker stopped")
+
+
+async def _feed_producer(
+    page: Any,
+    queue: asyncio.Queue,
+    collector: _ListingCollector,
+    max_scrolls: int,
+    detail_cache: DetailCache | None = None,
+    shared_places: set[str] | None = None,
+) -> dict[str, Any]:
+    """Keep scrolling the results feed and queue every newly seen listing.
+
+    Listings are identified by place ID. Places in the collector's place index
+    (scraped by an earlier run) and in ``shared_places`` (claimed by another
+    search over the same area) are skipped, and ones with fresh
+    ``detail_cache`` entries go straight to the collector, all without
+    opening a detail tab. Returns how many listings the feed showed, whether
+    it reached its end, and whether there was a feed at all.
+    """
+    scroll_count = 0
+    listing_index = 0
+    processed_places: set[str] = set()
+    resumed_skips = 0
+    known_skips = 0
+    place_index = collector.place_index
+    reached_end = False
+
+    # Find the scrollable container
+    feed_selector = 'div[role="feed"]'
+    if await page.query_selector(feed_selector) is None:
+        # No matches, or a single match that Maps opened as its place page
+        logger.info("No results feed to scroll")
+        return {"listings": 0, "reached_end": False, "feed": False}
+
+    while scroll_count < max_scrolls and not collector.done.is_set():
+        if page.is_closed():
+            logger.error("Main page closed unexpectedly")
+            break
+
+        logger.info(
+            f"[SCROLL {scroll_count + 1}/{max_scrolls}] Finding listings..."
+        )
+
+        with metrics.timer("feed_scroll"):
+            # Scroll the feed container instead of the window
+            child_count = -1
+            try:
+                child_count = await page.evaluate(FEED_SCROLL_JS, feed_selector)
+            except Exception as e:
+                logger.debug(f"Scroll evaluation failed: {e}")
+                # Fallback to window scroll if feed not found
+                await human_like_scroll(page)
+
+            # Lazy loading is done once the feed grows or reports the end of the list
+            waits = current_wait_policy()
+            grew = await waits.wait(
+                "feed growth",
+                page.wait_for_function(
+                    FEED_GREW_JS,
+                    arg=[feed_selector, child_count],
+                    timeout=waits.timeout_ms,
+                ),
+            )
+        if not grew:
+            metrics.inc("feed_scroll_timeouts")
+
+        try:
+            # Refresh listings after scroll
+            with metrics.timer("listing_enumeration"):
+                listings = await page.evaluate(FEED_LISTINGS_JS)
+                new_listings = []
+                for listing in listings:
+                    href = listing.get("href")
+                    if not href:
+                        continue
+                    listing_id = place_id(href)
+                    if listing_id in processed_places:
+                        continue
+                    processed_places.add(listing_id)
+                    # Finished in an earlier, interrupted run
+                    if listing_id in collector.completed_places:
+                        resumed_skips += 1
+                        continue
+                    if place_index is not None and listing_id in place_index:
+                        known_skips += 1
+                        metrics.inc("known_place_skips")
+                        continue
+                    if shared_places is not None:
+                        if listing_id in shared_places:
+                            metrics.inc("shared_place_skips")
+                            continue
+                        shared_places.add(listing_id)
+                    new_listings.append(listing)
+            metrics.inc("listings_found", len(new_listings))
+
+            logger.info(f"Found {len(listings)} listings, {len(new_listings)} are new")
+
+            for listing in new_listings:
+                if collector.done.is_set():
+                    break
+                cached = None
+                if detail_cache is not None:
+                    cached = detail_cache.get(place_id(listing["href"]))
+                if cached is not None:
+                    collector.add(listing_index, cached, listing["href"])
+                else:
+                    # Blocks while the queue is full so scrolling never runs far ahead
+                    await queue.put((listing_index, listing))
+                listing_index += 1
+
+        except Exception as e:
+            logger.debug(f"Failed to find listings: {e}")
+
+        scroll_count += 1
+        collector.scroll_count = scroll_count
+        collector.save_checkpoint()
+        logger.info(
+            f"  Queued {listing_index} listings, collected so far: {len(collector.results)}"
+        )
+        if resumed_skips:
+            logger.info(f"  Skipped {resumed_skips} listings finished before resuming")
+        if known_skips:
+            logger.info(f"  Skipped {known_skips} places already in the lead store")
+
+        # Check if we reached the end of the list
+        try:
+            end_of_results = await page.query_selector("text=\"You've reached the end of the list.\"")
+            if end_of_results:
+                logger.info("Reached end of Google Maps results")
+                reached_end = True
+                break
         except Exception:
-            logger.debug("Stealth failed, continuing without it")
+            pass
 
-    return p, browser, page
+    return {"listings": len(processed_places), "reached_end": reached_end, "feed": True}
 
 
 async def scrape_google_maps(
@@ -420,198 +1450,547 @@ async def scrape_google_maps(
     max_scrolls: int = 15,
     results_limit: int = 100,
     headless: bool = False,
+    detail_concurrency: int = 4,
+    listing_queue_size: int = 20,
+    pool: BrowserPool | None = None,
+    detail_cache: DetailCache | None = None,
+    lead_store: LeadStore | None = None,
+    checkpoint_store: CheckpointStore | None = None,
+    resume: bool = False,
+    checkpoint_every: int = 10,
+    tile: MapTile | None = None,
+    shared_places: set[str] | None = None,
+    feed_stats: dict[str, Any] | None = None,
+    place_index: PlaceIndex | None = None,
+    results_budget: _ResultsBudget | None = None,
 ) -> list[dict[str, str]]:
-    """Scrape business listings from Google Maps."""
-    results: list[dict[str, str]] = []
-
-    p, browser, page = await _initialize_browser(headless=headless)
-    logger.info(f"Browser initialized (headless={headless})")
+    """Scrape business listings from Google Maps.
+
+    Pass a shared ``pool`` to reuse one browser across searches; otherwise a
+    private one is launched and closed again when the search ends. Listings
+    found in ``detail_cache`` skip their detail tab, and every new lead is
+    written to ``lead_store`` as soon as it is collected. Progress is saved to
+    ``checkpoint_store`` and, with ``resume``, picked up from there.
+
+    With a ``tile`` only that map viewport is searched (see scrape_maps_tiles),
+    and places in ``shared_places`` are skipped. ``feed_stats`` is filled with
+    the feed's listing count and whether it reached the end of the list.
+    Every lead also counts against ``results_budget``, which stops the search
+    once the searches sharing it have found enough.
+    Places already in ``place_index`` are skipped before any detail tab opens,
+    and every newly scraped place is added to it.
+    """
+    search_query = maps_query(keywords, location, tile)
+    collector = _ListingCollector(
+        results_limit,
+        lead_store,
+        search_query,
+        checkpoint_store,
+        checkpoint_every,
+        place_index,
+        results_budget,
+    )
+    if checkpoint_store is not None and resume:
+        saved = checkpoint_store.load(checkpoint_key("maps", search_query))
+        if saved is not None and not saved[1]:
+            collector.restore(saved[0])
+            logger.info(
+                f"Resuming '{search_query}': {len(collector.results)} results, "
+                f"{len(collector.completed_places)} listings already done"
+            )
+    if collector.done.is_set():
+        logger.info(f"Results limit already reached for '{search_query}'")
+        return collector.results
+    results = collector.results
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, listing_queue_size))
+    workers: list[asyncio.Task] = []
+
+    own_pool = pool is None
+    if pool is None:
+        pool = BrowserPool(headless=headless)
+    page = None
+    finished = False
 
     try:
-        search_query = f"{keywords} in {location}"
+        geolocation = None
+        if tile is not None:
+            lat, lng = tile.center
+            geolocation = {"latitude": lat, "longitude": lng}
+        page = await pool.acquire(geolocation=geolocation)
+        logger.info("Browser context leased")
+
         logger.info(f"Navigating to Google Maps: {search_query}")
 
-        try:
-            await page.goto(
-                f"https://www.google.com/maps/search/{search_query.replace(' ', '+')}",
-                wait_until="domcontentloaded",
-                timeout=60000,
+        search_url = f"https://www.google.com/maps/search/{search_query.replace(' ', '+')}"
+        if tile is not None:
+            # The viewport, not a place name, picks the area, so Maps doesn't recentre
+            search_url = (
+                f"https://www.google.com/maps/search/{keywords.replace(' ', '+')}/{tile.viewport()}"
             )
+
+        async def load_search() -> None:
+            await current_rate_limiter().wait(search_url)
+            await page.goto(search_url, wait_until="domcontentloaded", timeout=60000)
+            if "/sorry/" in page.url:
+                raise BlockedError(f"Redirected to {page.url[:80]}")
+
+        try:
+            await retry_policy.run(load_search, "Maps search", search_url)
             logger.info("Page loaded successfully")
         except Exception as e:
             logger.warning(f"Initial load issue: {e}")
-            await page.wait_for_timeout(5000)
 
-        await asyncio.sleep(3)
+        waits = current_wait_policy()
+        await waits.wait(
+            "results feed",
+            page.wait_for_selector('div[role="feed"]', timeout=waits.timeout_ms),
+        )
         logger.info(f"Starting scroll loop (max: {max_scrolls} scrolls)")
 
-        scroll_count = 0
-        seen_businesses: set[str] = set()
-        processed_hrefs: set[str] = set()
+        workers = [
+            asyncio.create_task(
+                _listing_detail_worker(queue, page, collector, detail_cache)
+            )
+            for _ in range(max(1, detail_concurrency))
+        ]
+        logger.info(f"Started {len(workers)} detail workers")
 
-        # Find the scrollable container
-        feed_selector = 'div[role="feed"]'
-        
-        while scroll_count < max_scrolls:
-            if page.is_closed():
-                logger.error("Main page closed unexpectedly")
-                break
+        stats = await _watch_workers(
+            _feed_producer(page, queue, collector, max_scrolls, detail_cache, shared_places),
+            workers,
+        )
+        collector.feed_stats = stats
+        if feed_stats is not None:
+            feed_stats.update(stats)
 
-            logger.info(
-                f"[SCROLL {scroll_count + 1}/{max_scrolls}] Finding listings..."
-            )
+        # Let the workers finish whatever the producer already queued
+        await _watch_workers(queue.join(), workers)
 
-            # Scroll the feed container instead of the window
-            try:
-                await page.evaluate(f"""
-                    (selector) => {{
-                        const el = document.querySelector(selector);
-                        if (el) {{
-                            el.scrollBy(0, 2000);
-                        }}
-                    }}
-                """, feed_selector)
-            except Exception as e:
-                logger.debug(f"Scroll evaluation failed: {e}")
-                # Fallback to window scroll if feed not found
-                await human_like_scroll(page)
-            
-            await asyncio.sleep(3)
+        if collector.done.is_set():
+            logger.info(f"Reached results limit: {results_limit}")
 
-            try:
-                # Refresh listings after scroll
-                listings = await page.query_selector_all('a[href*="/maps/place"]')
-                new_listings = []
-                for listing in listings:
-                    try:
-                        href = await listing.get_attribute("href")
-                        if href and href not in processed_hrefs:
-                            new_listings.append(listing)
-                            processed_hrefs.add(href)
-                    except Exception:
-                        continue
+        collector.save_checkpoint(completed=True)
+        finished = True
+        logger.info(f"Scraping complete! Total results: {len(results)}")
 
-                logger.info(f"Found {len(listings)} listings, {len(new_listings)} are new")
+    except Exception:
+        if page is not None:
+            pool.mark_error(page)
+        raise
 
-                for listing in new_listings:
-                    if page.is_closed():
-                        break
-                        
-                    try:
-                        business_data = await scrape_listing_details(
-                            page, page.context, listing
-                        )
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        if not finished:
+            # Keep whatever finished so a --resume run can carry on from here
+            collector.save_checkpoint()
+        if page is not None:
+            await pool.release(page)
+        if own_pool:
+            await pool.close()
 
-                        if business_data and business_data.get("Business Name"):
-                            business_key = (
-                                business_data["Business Name"].strip().lower()
-                            )
-                            if business_key not in seen_businesses:
-                                seen_businesses.add(business_key)
-                                results.append(business_data)
-                                logger.info(
-                                    f"  + {business_data['Business Name'][:40]:<40} | "
-                                    f"Phone: {business_data.get('Phone Number', 'N/A')[:15]}"
-                                )
-                    except Exception as e:
-                        logger.debug(f"Failed to process listing: {e}")
+    return results
 
-                    # Check limit after each listing
-                    if len(results) >= SEARCH_CONFIG["results_limit"]:
-                        break
 
-            except Exception as e:
-                logger.debug(f"Failed to find listings: {e}")
+# One feed stops at roughly 120 places; a tile showing this many probably had more
+DENSE_TILE_LISTINGS = 100
 
-            scroll_count += 1
-            logger.info(f"  Total collected so far: {len(results)}")
 
-            if len(results) >= results_limit:
-                logger.info(f"Reached results limit: {results_limit}")
-                break
-            
-            # Check if we reached the end of the list
-            try:
-                end_of_results = await page.query_selector("text=\"You've reached the end of the list.\"")
-                if end_of_results:
-                    logger.info("Reached end of Google Maps results")
-                    break
-            except Exception:
-                pass
+async def locate_on_maps(pool: BrowserPool, location: str) -> tuple[float, float, float, float]:
+    """Find ``location``'s bounds from the viewport Maps centres on when searching it."""
+    url = f"https://www.google.com/maps/search/{location.replace(' ', '+')}"
+    page = await pool.acquire()
+    try:
+        await current_rate_limiter().wait(url)
+        await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        # Maps rewrites the URL with the viewport once it has found the place
+        waits = current_wait_policy()
+        await waits.wait(
+            "map viewport",
+            page.wait_for_url(re.compile(r"/@-?\d"), timeout=waits.timeout_ms),
+        )
+        viewport = parse_viewport(page.url)
+    finally:
+        await pool.release(page)
+    if viewport is None:
+        raise ValueError(f"Could not locate {location!r} on Maps; set tile_bounds")
+    return bounds_from_viewport(*viewport)
 
-        logger.info(f"Scraping complete! Total results: {len(results)}")
 
+async def scrape_maps_tiles(
+    keywords: str,
+    location: str,
+    max_scrolls: int = 15,
+    results_limit: int = 100,
+    headless: bool = False,
+    detail_concurrency: int = 4,
+    listing_queue_size: int = 20,
+    pool: BrowserPool | None = None,
+    detail_cache: DetailCache | None = None,
+    lead_store: LeadStore | None = None,
+    checkpoint_store: CheckpointStore | None = None,
+    resume: bool = False,
+    checkpoint_every: int = 10,
+    bounds: str = "",
+    grid: int = 3,
+    max_depth: int = 2,
+    max_tiles: int = 48,
+    concurrency: int = 3,
+    place_index: PlaceIndex | None = None,
+) -> list[dict[str, str]]:
+    """Search a whole area tile by tile, past the ~120 places one Maps feed shows.
+
+    The area comes from ``bounds`` ("south,west,north,east"), CITY_BOUNDS, or
+    the viewport Maps shows for ``location``, and is cut into a ``grid`` x
+    ``grid`` of map viewports. Up to ``concurrency`` tiles run at once, each in
+    its own pooled context, and places are deduplicated across tiles by place
+    ID. A tile whose feed doesn't reach its end, or fills up, is split into
+    quadrants, at most ``max_depth`` times and ``max_tiles`` tiles in all;
+    empty tiles and ones without a feed are not. Running tiles share one
+    budget of ``results_limit`` results and stop once it is spent.
+
+    Tiles are checkpointed by their corners, and an area found through Maps
+    is saved with the job, so a resumed run cuts the same tiles and skips
+    the finished ones. The job is marked completed once no tile failed.
+    """
+    own_pool = pool is None
+    if pool is None:
+        pool = BrowserPool(size=concurrency, headless=headless)
+    results: list[dict[str, str]] = []
+    shared_places: set[str] = set()
+    budget = _ResultsBudget(results_limit)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks: set[asyncio.Task] = set()
+    scheduled = 0
+    failures = 0
+    job_key = checkpoint_key("maps", maps_query(keywords, location))
+
+    def schedule(tile: MapTile) -> None:
+        nonlocal scheduled
+        if scheduled >= max_tiles:
+            metrics.inc("tiles_skipped")
+            return
+        scheduled += 1
+        tasks.add(asyncio.create_task(run_tile(tile)))
+
+    async def search_tile(tile: MapTile, stats: dict[str, Any]) -> list[dict[str, str]]:
+        with metrics.timer("maps_tile"):
+            return await scrape_google_maps(
+                keywords=keywords,
+                location=location,
+                max_scrolls=max_scrolls,
+                results_limit=results_limit,
+                headless=headless,
+                detail_concurrency=detail_concurrency,
+                listing_queue_size=listing_queue_size,
+                pool=pool,
+                detail_cache=detail_cache,
+                lead_store=lead_store,
+                checkpoint_store=checkpoint_store,
+                resume=resume,
+                checkpoint_every=checkpoint_every,
+                tile=tile,
+                shared_places=shared_places,
+                feed_stats=stats,
+                place_index=place_index,
+                results_budget=budget,
+            )
+
+    async def run_tile(tile: MapTile) -> None:
+        nonlocal failures
+        label = f"[TILE {tile.viewport()} d{tile.depth}]"
+        async with semaphore:
+            if budget.remaining <= 0:
+                return
+            stats: dict[str, Any] = {}
+            saved = None
+            if checkpoint_store is not None and resume:
+                saved = checkpoint_store.load(
+                    checkpoint_key("maps", maps_query(keywords, location, tile))
+                )
+            if saved is not None and saved[1]:
+                # Its leads are in the store already; only its density is needed
+                stats = saved[0].get("feed_stats", {})
+                leads: list[dict[str, str]] = []
+                logger.info(f"{label} Finished before resuming")
+            else:
+                logger.info(f"{label} Starting")
+                try:
+                    leads = await search_tile(tile, stats)
+                except Exception as e:
+                    failures += 1
+                    metrics.inc("tile_failures")
+                    logger.error(f"{label} Failed: {e}")
+                    return
+            results.extend(leads)
+            metrics.inc("tiles")
+            listings = stats.get("listings", 0)
+            # An empty tile, or one Maps answered with a single place page, has nothing to split
+            dense = (
+                stats.get("feed", True)
+                and listings > 0
+                and (not stats.get("reached_end") or listings >= DENSE_TILE_LISTINGS)
+            )
+            logger.info(
+                f"{label} Done: {len(leads)} leads from {listings} listings"
+                + (" (dense)" if dense else "")
+            )
+        if dense and tile.depth < max_depth and budget.remaining > 0:
+            metrics.inc("tile_splits")
+            for child in tile.split():
+                schedule(child)
+
+    try:
+        area = parse_bounds(bounds) if bounds else known_bounds(location)
+        if area is None and checkpoint_store is not None:
+            # Tiles are keyed by their corners, so a resumed run must cut the same area
+            saved_job = checkpoint_store.load(job_key)
+            if saved_job is not None and saved_job[0].get("bounds"):
+                area = tuple(saved_job[0]["bounds"])  # type: ignore[assignment]
+        if area is None:
+            area = await locate_on_maps(pool, location)
+            if checkpoint_store is not None:
+                checkpoint_store.save(job_key, {"bounds": list(area)})
+        logger.info(f"Tiling {location} {area} into a {grid}x{grid} grid")
+        for tile in grid_tiles(area, grid):
+            schedule(tile)
+        # Dense tiles add their quadrants while others are still running
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            tasks.difference_update(done)
+        # Failed tiles are searched again on --resume; otherwise the job is done
+        if checkpoint_store is not None and not failures:
+            checkpoint_store.save(job_key, {"bounds": list(area)}, completed=True)
     finally:
-        await browser.close()
-        await p.stop()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if own_pool:
+            await pool.close()
 
+    logger.info(f"Tiled search complete: {len(results)} leads from {scheduled} tiles")
     return results
 
 
+async def is_captcha_page(page: Any) -> bool:
+    """Whether ``page`` shows a Google block page, in one small evaluate.
+
+    Redirects to the block page can land mid-check, so a check cut short by
+    navigation is repeated once the new document has loaded.
+    """
+    for _ in range(2):
+        try:
+            return bool(await page.evaluate(CAPTCHA_CHECK_JS))
+        except Exception as e:
+            if "destroyed" not in str(e) and "navigation" not in str(e).lower():
+                raise
+            waits = current_wait_policy()
+            await waits.wait(
+                "navigation",
+                page.wait_for_load_state("domcontentloaded", timeout=waits.timeout_ms),
+            )
+    return bool(await page.evaluate(CAPTCHA_CHECK_JS))
+
+
+async def rotate_past_captcha(
+    pool: BrowserPool,
+    page: Any,
+    url: str,
+    max_rotations: int = 5,
+    cooldown: float = 30.0,
+) -> Any:
+    """Cool down and reload ``url`` in fresh sessions until it is not blocked.
+
+    Each block is counted against the session that hit it, then that context
+    is retired and a new one (with a different user agent) loads the same
+    ``url``. Cool-downs double with every rotation. Returns the page to carry
+    on with; after ``max_rotations`` the page is released and BlockedError raised.
+    """
+    original = page
+    rotations = 0
+    try:
+        while await is_captcha_page(page):
+            pool.record_page(page, blocked=True)
+            metrics.inc("captcha_blocks")
+            current_rate_limiter().report(url, blocked=True)
+            if rotations >= max_rotations:
+                raise BlockedError(f"Still blocked after {rotations} session rotations")
+            rotations += 1
+            delay = min(600.0, cooldown * 2 ** (rotations - 1)) * random.uniform(0.8, 1.2)
+            logger.warning(
+                f"Captcha detected; cooling down {delay:.0f}s, then retrying in a fresh "
+                f"session ({rotations}/{max_rotations})"
+            )
+            pool.retire(page)
+            await pool.release(page)
+            with metrics.timer("captcha_cooldown"):
+                await asyncio.sleep(delay)
+            page = await pool.acquire(use_stealth=False)
+            metrics.inc("session_rotations")
+
+            async def reload() -> None:
+                await current_rate_limiter().wait(url)
+                await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+
+            try:
+                await retry_policy.run(reload, "SERP after rotation", url)
+            except Exception as e:
+                logger.warning(f"Reload after rotation failed: {e}")
+    except BaseException:
+        # The caller only knows about, and will release, the page it passed in
+        if page is not original:
+            await pool.release(page)
+        raise
+    pool.record_page(page)
+    return page
+
+
 async def scrape_google_dork(
     keywords: str,
     dork_query: str,
     max_scrolls: int = 15,
     headless: bool = False,
     target: str = "email",
+    pool: BrowserPool | None = None,
+    results_limit: int = 100,
+    lead_store: LeadStore | None = None,
+    checkpoint_store: CheckpointStore | None = None,
+    resume: bool = False,
+    captcha_mode: str = "auto",
+    captcha_cooldown: float = 30.0,
+    max_captcha_rotations: int = 5,
+    seen_emails: set[str] | None = None,
+    seen_profiles: set[str] | None = None,
 ) -> list[dict[str, str]]:
-    """Scrape using Google Dorking - searches for emails/contacts via Google."""
+    """Scrape using Google Dorking - searches for emails/contacts via Google.
+
+    Progress is saved to ``checkpoint_store`` after every SERP page and, with
+    ``resume``, the search restarts from the saved ``start=`` offset. Searches
+    sharing ``seen_emails`` and ``seen_profiles`` sets skip each other's leads.
+
+    ``captcha_mode`` "manual" waits for someone to solve a captcha in the
+    browser; "rotate" cools down and retries the same page in a fresh session
+    (see rotate_past_captcha), and also checks every later page. "auto" rotates
+    when the browser is headless, since nobody can solve it there.
+    """
     results: list[dict[str, str]] = []
-    seen_emails: set[str] = set()
-    seen_profiles: set[str] = set()
+    seen_emails = set() if seen_emails is None else seen_emails
+    seen_profiles = set() if seen_profiles is None else seen_profiles
+    scroll_count = 0
+    page_num = 1
+
+    search_query = f"{keywords} {dork_query}".strip()
+    job_key = checkpoint_key("dork", search_query)
+
+    def save_checkpoint(completed: bool = False) -> None:
+        if checkpoint_store is not None:
+            checkpoint_store.save(
+                job_key,
+                {
+                    "results": results,
+                    "seen_emails": sorted(seen_emails),
+                    "seen_profiles": sorted(seen_profiles),
+                    "page_num": page_num,
+                    "scroll_count": scroll_count,
+                },
+                completed=completed,
+            )
 
-    p, browser, page = await _initialize_browser(headless=headless, use_stealth=False)
-    logger.info(f"Browser initialized (headless={headless})")
+    if checkpoint_store is not None and resume:
+        saved = checkpoint_store.load(job_key)
+        if saved is not None and not saved[1]:
+            state = saved[0]
+            results.extend(state["results"])
+            seen_emails.update(state["seen_emails"])
+            seen_profiles.update(state["seen_profiles"])
+            page_num = state["page_num"]
+            scroll_count = state["scroll_count"]
+            logger.info(
+                f"Resuming '{search_query}' at page {page_num} with {len(results)} results"
+            )
+
+    own_pool = pool is None
+    if pool is None:
+        pool = BrowserPool(headless=headless)
+    page = None
+    finished = False
 
     try:
-        search_query = f"{keywords} {dork_query}".strip()
+        page = await pool.acquire(use_stealth=False)
+        logger.info("Browser context leased")
+
         logger.info(f"Searching Google: {search_query}")
 
+        base_url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}"
+
+        def current_serp_url() -> str:
+            return base_url + (f"&start={(page_num - 1) * 10}" if page_num > 1 else "")
+
+        search_url = current_serp_url()
+        rotate_on_captcha = captcha_mode == "rotate" or (
+            captcha_mode == "auto" and pool.headless
+        )
+
+        async def load_serp() -> None:
+            await current_rate_limiter().wait(search_url)
+            await page.goto(search_url, wait_until="domcontentloaded", timeout=60000)
+
         try:
-            await page.goto(
-                f"https://www.google.com/search?q={search_query.replace(' ', '+')}",
-                wait_until="domcontentloaded",
-                timeout=60000,
-            )
+            # Captcha pages load fine here; the check below waits them out
+            await retry_policy.run(load_serp, "SERP", search_url)
             logger.info("Search results loaded")
         except Exception as e:
             logger.warning(f"Load issue: {e}")
-            await page.wait_for_timeout(10000)
 
-        await asyncio.sleep(3)
+        waits = current_wait_policy()
+        await waits.wait(
+            "search results",
+            page.wait_for_selector(
+                "#search, form#captcha-form", timeout=waits.timeout_ms
+            ),
+        )
 
-        # CAPTCHA DETECTION AND MANUAL SOLVE LOOP
-        while True:
+        # CAPTCHA DETECTION: rotate sessions unattended, or wait for a manual solve
+        captcha_start = time.perf_counter()
+        if rotate_on_captcha:
+            page = await rotate_past_captcha(
+                pool, page, search_url, max_captcha_rotations, captcha_cooldown
+            )
+        captcha_seen = False
+        while not rotate_on_captcha:
             try:
-                captcha_form = await page.query_selector("form#captcha-form")
-                captcha_iframe = await page.query_selector("iframe[src*='google.com/recaptcha']")
-                
-                # Additional check: If no results AND we see typical captcha text
-                page_text = await page.content()
-                is_blocked = "Our systems have detected unusual traffic" in page_text or "not a robot" in page_text
-                
-                if captcha_form or captcha_iframe or is_blocked:
+                if await is_captcha_page(page):
                     print("\n" + "!" * 60)
                     print("  [ACTION REQUIRED] GOOGLE CAPTCHA DETECTED!")
                     print("  Please solve the CAPTCHA in the browser window.")
                     print("  The bot will wait and check every 10 seconds.")
                     print("!" * 60 + "\n")
                     
+                    metrics.inc("captcha_blocked_checks")
+                    if not captcha_seen:
+                        # Back off once per captcha, not on every re-check
+                        captcha_seen = True
+                        metrics.inc("captcha_blocks")
+                        pool.record_page(page, blocked=True)
+                        current_rate_limiter().report(search_url, blocked=True)
                     logger.warning("Google CAPTCHA detected. Waiting for manual resolution...")
                     
                     # If headless, we should probably warn that it's hard to solve
                     if headless:
                         logger.error("Headless mode is ON. CAPTCHA cannot be solved manually easily.")
-                        logger.info("Consider restarting without headless mode (-n).")
+                        logger.info("Consider restarting without headless mode (-n) or captcha_mode 'rotate'.")
                     
                     await asyncio.sleep(10)
                     # Re-check in the next iteration of the while loop
                 else:
                     # No captcha detected, or it was solved
                     # Wait a moment for page to stabilize after navigation
-                    await asyncio.sleep(2)
-                    if "Our systems have detected unusual traffic" not in await page.content():
+                    await current_wait_policy().network_idle(page, "page to stabilize")
+                    if not await is_captcha_page(page):
                         logger.info("No CAPTCHA detected or CAPTCHA solved. Proceeding...")
+                        if not captcha_seen:
+                            pool.record_page(page)
                         break
                     else:
                         await asyncio.sleep(10)
@@ -625,55 +2004,50 @@ async def scrape_google_dork(
                     logger.warning(f"Error during CAPTCHA check: {e}")
                     await asyncio.sleep(5)
                     continue
+        metrics.observe("captcha_wait", time.perf_counter() - captcha_start)
 
         logger.info(f"Scraping results (max: {max_scrolls} scrolls)")
 
-        scroll_count = 0
-        page_num = 1
-
         while scroll_count < max_scrolls:
             logger.info(f"[PAGE {page_num}/{max_scrolls}] Processing results...")
 
             await human_like_scroll(page)
-            await asyncio.sleep(2)
+            await current_wait_policy().network_idle(page, "SERP to settle")
 
             try:
-                # Even broader selectors for Google results
-                result_blocks = await page.query_selector_all("div.g, div.tF2Cxc, div.kvG71c, div.yuRUbf, div.MjjYud, .sr__group")
-                
-                if not result_blocks:
-                    # Final fallback: try to find anything that looks like a result block
-                    result_blocks = await page.query_selector_all("#search .v7W49e > div, #rso > div")
+                # Even broader selectors for Google results, all read in one round-trip
+                with metrics.timer("serp_extraction"):
+                    result_blocks = await page.evaluate(
+                        SERP_BLOCKS_JS,
+                        [
+                            "div.g, div.tF2Cxc, div.kvG71c, div.yuRUbf, div.MjjYud, .sr__group",
+                            # Final fallback: anything that looks like a result block
+                            "#search .v7W49e > div, #rso > div",
+                        ],
+                    )
 
                 new_count = 0
                 logger.debug(f"Found {len(result_blocks)} potential result blocks")
 
                 for block in result_blocks:
                     try:
-                        text = await block.inner_text()
+                        text = block["text"]
                         if not text or len(text) < 20:
                             continue
-                        
-                        # Extract basic info
-                        title_elem = await block.query_selector("h3")
-                        # Find the main link - usually the one containing the h3 or nearby
-                        link_elem = await block.query_selector("a")
-                        
-                        # Better link detection: look for the one with the most text or an h3
-                        all_links = await block.query_selector_all("a")
+
+                        with metrics.timer("regex_extraction"):
+                            contacts = contact_extractor.scan(text)
+
+                        # Find the main link - prioritize the one containing the h3
                         href = ""
-                        for l in all_links:
-                            h = await l.get_attribute("href")
+                        for link in block["links"]:
+                            h = link["href"]
                             if h and h.startswith("http") and "google.com" not in h:
-                                # Prioritize the link that contains the h3
-                                inner_h3 = await l.query_selector("h3")
-                                if inner_h3:
+                                if link["has_h3"]:
                                     href = h
-                                    link_elem = l
                                     break
                                 if not href: # Fallback to first valid link
                                     href = h
-                                    link_elem = l
 
                         if not href:
                             continue
@@ -686,7 +2060,7 @@ async def scrape_google_dork(
                             # But we'll allow things like /p/ or /reel/ if they have an email in the snippet
                             if not is_valid_profile_url(href):
                                 # Check if it has an email in the snippet before skipping
-                                if not re.search(EMAIL_REGEX, text):
+                                if not contacts.emails:
                                     continue
 
                         # Dedup by URL - but allow update if we find an email for a profile that didn't have one
@@ -709,8 +2083,8 @@ async def scrape_google_dork(
                             "Source": "Google Search",
                         }
 
-                        if title_elem:
-                            result["Business Name"] = (await title_elem.inner_text()).strip()[:100]
+                        if block["title"]:
+                            result["Business Name"] = block["title"].strip()[:100]
                         
                         if not result["Business Name"]:
                             # Fallback to parts of URL for business name
@@ -718,38 +2092,44 @@ async def scrape_google_dork(
                             result["Business Name"] = clean_name.replace("-", " ").replace(".", " ").title()[:100]
 
                         # Robust email extraction (handles some obfuscation)
-                        emails = re.findall(EMAIL_REGEX, text)
+                        emails = [m.value for m in contacts.emails]
                         if not emails:
                             text_clean = text.replace(" (at) ", "@").replace("[at]", "@").replace("(at)", "@").replace(" at ", "@")
                             text_clean = text_clean.replace(" dot ", ".").replace("[dot]", ".").replace("(dot)", ".")
-                            emails = re.findall(EMAIL_REGEX, text_clean)
+                            emails = [m.value for m in contact_extractor.scan(text_clean).emails]
 
                         valid_emails = [e.lower() for e in emails if not e.lower().endswith("@example.com")]
-                        
+
+                        # Already a lead from another page or search sharing seen_emails
+                        if valid_emails and existing_index == -1 and valid_emails[0] in seen_emails:
+                            metrics.inc("duplicate_emails")
+                            continue
+
                         if valid_emails:
                             result["Email"] = valid_emails[0]
                             for e in valid_emails:
                                 seen_emails.add(e)
 
                         # Extract phone numbers
-                        phones = re.findall(PHONE_REGEX, text)
-                        if phones:
-                            result["Phone Number"] = phones[0].strip()
-                        else:
-                            bd_phones = re.findall(BD_PHONE_REGEX, text)
-                            if bd_phones:
-                                result["Phone Number"] = bd_phones[0].strip()
+                        phone_match = contacts.first("phone", "bd_phone")
+                        if phone_match:
+                            result["Phone Number"] = phone_match.value
 
                         # If we found an email for an existing profile, update it
                         if existing_index != -1 and result["Email"]:
                             results[existing_index]["Email"] = result["Email"]
                             if not results[existing_index]["Phone Number"]:
                                 results[existing_index]["Phone Number"] = result["Phone Number"]
+                            if lead_store is not None:
+                                lead_store.add(results[existing_index], search_query)
                             logger.info(f"  * Updated Lead: {results[existing_index]['Business Name'][:30]} | {result['Email']}")
                         elif existing_index == -1:
                             # If we have a valid profile/website and a name, or an email, it's a valid lead
                             if result["Email"] or (result["Business Name"] and result["Website"]):
                                 results.append(result)
+                                metrics.inc("leads")
+                                if lead_store is not None:
+                                    lead_store.add(result, search_query)
                                 new_count += 1
                                 if result["Email"]:
                                     logger.info(f"  + Lead: {result['Business Name'][:30]} | {result['Email']}")
@@ -769,6 +2149,8 @@ async def scrape_google_dork(
 
             next_clicked = False
             if scroll_count < max_scrolls - 1:
+                await current_rate_limiter().wait(search_url)
+                pagination_start = time.perf_counter()
                 next_button = (
                     await page.query_selector("a#pnnext")
                     or await page.query_selector("td.d6ravFHbMDH__button")
@@ -777,12 +2159,17 @@ async def scrape_google_dork(
                 )
                 if next_button:
                     try:
-                        await next_button.click()
-                        await page.wait_for_load_state("networkidle", timeout=30000)
+                        async with page.expect_navigation(
+                            wait_until="domcontentloaded", timeout=30000
+                        ):
+                            await next_button.click()
+                        await current_wait_policy().network_idle(page, "next page")
                         next_clicked = True
                         page_num += 1
+                        current_rate_limiter().report(search_url)
                         logger.info(f"Moved to page {page_num}")
                     except Exception:
+                        metrics.inc("pagination_fallbacks")
                         logger.debug(
                             "Failed to click next button, trying URL navigation"
                         )
@@ -794,15 +2181,22 @@ async def scrape_google_dork(
                                 )
                             else:
                                 new_url = f"{current_url}&start={page_num * 10}"
-                            await page.goto(
-                                new_url, wait_until="networkidle", timeout=60000
+                            await retry_policy.run(
+                                lambda: page.goto(
+                                    new_url, wait_until="domcontentloaded", timeout=60000
+                                ),
+                                "SERP page",
+                                search_url,
                             )
+                            await current_wait_policy().network_idle(page, "next page")
                             page_num += 1
                             next_clicked = True
                             logger.info(f"Moved to page {page_num} via URL")
                         except Exception as e:
+                            metrics.inc("pagination_failures")
                             logger.debug(f"URL navigation also failed: {e}")
                 else:
+                    metrics.inc("pagination_fallbacks")
                     logger.debug("Next button not found with any selector")
                     try:
                         current_url = page.url
@@ -812,36 +2206,237 @@ async def scrape_google_dork(
                             )
                         else:
                             new_url = f"{current_url}&start={page_num * 10}"
-                        await page.goto(
-                            new_url, wait_until="networkidle", timeout=60000
+                        await retry_policy.run(
+                            lambda: page.goto(
+                                new_url, wait_until="domcontentloaded", timeout=60000
+                            ),
+                            "SERP page",
+                            search_url,
                         )
+                        await current_wait_policy().network_idle(page, "next page")
                         page_num += 1
                         next_clicked = True
                         logger.info(f"Moved to page {page_num} via URL")
                     except Exception as e:
+                        metrics.inc("pagination_failures")
                         logger.debug(f"URL navigation failed: {e}")
+                metrics.observe("pagination", time.perf_counter() - pagination_start)
+                if next_clicked and rotate_on_captcha:
+                    # Same start= offset, so a rotated session picks up where this one was blocked
+                    page = await rotate_past_captcha(
+                        pool, page, current_serp_url(), max_captcha_rotations, captcha_cooldown
+                    )
+                elif next_clicked:
+                    pool.record_page(page)
 
             scroll_count += 1
+            save_checkpoint()
 
-            if len(results) >= SEARCH_CONFIG["results_limit"]:
-                logger.info(f"Reached results limit: {SEARCH_CONFIG['results_limit']}")
+            if len(results) >= results_limit:
+                logger.info(f"Reached results limit: {results_limit}")
                 break
 
             if not next_clicked and scroll_count >= max_scrolls:
                 logger.info("No more pages available")
                 break
 
+        save_checkpoint(completed=True)
+        finished = True
         logger.info(f"Scraping complete! Total results: {len(results)}")
 
+    except Exception:
+        if page is not None:
+            pool.mark_error(page)
+        raise
+
+    finally:
+        if not finished:
+            # Keep whatever finished so a --resume run can carry on from here
+            save_checkpoint()
+        if page is not None:
+            await pool.release(page)
+        if own_pool:
+            await pool.close()
+
+    return results
+
+
+EMAIL_INDICATORS = [
+    "@gmail.com",
+    "@yahoo.com",
+    "@hotmail.com",
+    "@outlook.com",
+    "contact@",
+    "site:",
+]
+
+SOCIAL_INDICATORS = [
+    "facebook.com",
+    "instagram.com",
+    "fb.com",
+    "fb.me",
+]
+
+
+# Free-mail domains from the prompt indicators, one shard each
+DORK_EMAIL_DOMAINS = [indicator for indicator in EMAIL_INDICATORS if indicator.startswith("@")]
+DORK_OPERATOR_REGEX = re.compile(r'(?i)(?<!\S)(intext|site):(?:"[^"]*"|\S+)')
+DORK_EMAIL_DOMAIN_REGEX = re.compile(r'(?i)(?<!\S)"?@[\w-]+(?:\.[\w-]+)+"?(?!\S)')
+
+
+def _dork_terms(values: str | list[str]) -> list[str]:
+    """Split a "|"-separated shard list (CSV/JSON friendly), or pass a list through."""
+    if isinstance(values, str):
+        values = values.split("|")
+    return [value.strip() for value in values if value and value.strip()]
+
+
+def _dork_operator(name: str, value: str) -> str:
+    return f'{name}:"{value}"' if " " in value else f"{name}:{value}"
+
+
+def plan_dork_shards(
+    query: str,
+    locations: str | list[str] = "",
+    sites: str | list[str] = "",
+    email_domains: str | list[str] = "",
+    target: str = "email",
+    max_shards: int = 12,
+) -> list[str]:
+    """Expand one dork into variants that each reach a different slice of results.
+
+    Google stops paging one query after a few hundred results, so the query is
+    split per ``intext:`` location, per ``site:`` and per email domain; each
+    given dimension replaces the query's own operator of that kind. Email
+    queries without a domain of their own are split across DORK_EMAIL_DOMAINS
+    when no ``email_domains`` are given. At most ``max_shards`` variants are
+    returned, the unsharded query if there is nothing to split on.
+    """
+    base = query
+    dimensions: list[list[str]] = []
+
+    location_terms = _dork_terms(locations)
+    if location_terms:
+        base = DORK_OPERATOR_REGEX.sub(lambda m: "" if m.group(1).lower() == "intext" else m.group(), base)
+        dimensions.append([_dork_operator("intext", location) for location in location_terms])
+
+    site_terms = _dork_terms(sites)
+    if site_terms:
+        base = DORK_OPERATOR_REGEX.sub(lambda m: "" if m.group(1).lower() == "site" else m.group(), base)
+        dimensions.append([_dork_operator("site", site) for site in site_terms])
+
+    domain_terms = _dork_terms(email_domains)
+    if not domain_terms and target == "email" and not DORK_EMAIL_DOMAIN_REGEX.search(base):
+        domain_terms = DORK_EMAIL_DOMAINS
+    if domain_terms:
+        base = DORK_EMAIL_DOMAIN_REGEX.sub("", base)
+        dimensions.append(['"@' + domain.lstrip("@") + '"' for domain in domain_terms])
+
+    base = " ".join(base.split())
+    # Vary the first dimension fastest, so a cap trims email domains before locations
+    shards = [
+        " ".join(part for part in (base, *reversed(combination)) if part)
+        for combination in itertools.product(*reversed(dimensions))
+    ]
+    return list(dict.fromkeys(shards))[: max(1, max_shards)]
+
+
+async def scrape_dork_shards(
+    queries: list[str],
+    max_scrolls: int = 15,
+    headless: bool = False,
+    target: str = "email",
+    pool: BrowserPool | None = None,
+    results_limit: int = 100,
+    lead_store: LeadStore | None = None,
+    checkpoint_store: CheckpointStore | None = None,
+    resume: bool = False,
+    concurrency: int = 3,
+    captcha_mode: str = "auto",
+    captcha_cooldown: float = 30.0,
+    max_captcha_rotations: int = 5,
+    job_query: str = "",
+) -> list[dict[str, str]]:
+    """Run several dork queries at once, each in its own pooled context.
+
+    Emails and profiles are deduplicated across all of them, and
+    ``results_limit`` applies to each query. One query failing (a captcha
+    that won't clear, say) doesn't stop the others. Once every query has
+    finished, ``job_query`` (the unsharded query) is checkpointed as
+    completed, so a resumed batch skips the whole job.
+    """
+    seen_emails: set[str] = set()
+    seen_profiles: set[str] = set()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    failures = 0
+    own_pool = pool is None
+    if pool is None:
+        pool = BrowserPool(size=concurrency, headless=headless)
+
+    async def run_shard(index: int, query: str) -> list[dict[str, str]]:
+        nonlocal failures
+        label = f"[SHARD {index + 1}/{len(queries)}]"
+        if checkpoint_store is not None and resume:
+            saved = checkpoint_store.load(checkpoint_key("dork", query))
+            if saved is not None and saved[1]:
+                logger.info(f"{label} Skipping completed shard: {query}")
+                return []
+        async with semaphore:
+            logger.info(f"{label} Starting: {query}")
+            try:
+                leads = await scrape_google_dork(
+                    keywords=query,
+                    dork_query="",
+                    max_scrolls=max_scrolls,
+                    headless=headless,
+                    target=target,
+                    pool=pool,
+                    results_limit=results_limit,
+                    lead_store=lead_store,
+                    checkpoint_store=checkpoint_store,
+                    resume=resume,
+                    captcha_mode=captcha_mode,
+                    captcha_cooldown=captcha_cooldown,
+                    max_captcha_rotations=max_captcha_rotations,
+                    seen_emails=seen_emails,
+                    seen_profiles=seen_profiles,
+                )
+            except Exception as e:
+                failures += 1
+                metrics.inc("dork_shard_failures")
+                logger.error(f"{label} Failed: {e}")
+                return []
+            logger.info(f"{label} Done: {len(leads)} leads")
+            return leads
+
+    try:
+        shard_leads = await asyncio.gather(
+            *(run_shard(index, query) for index, query in enumerate(queries))
+        )
+        if checkpoint_store is not None and job_query and not failures:
+            checkpoint_store.save(checkpoint_key("dork", job_query), {"shards": queries}, completed=True)
     finally:
-        await browser.close()
-        await p.stop()
+        if own_pool:
+            await pool.close()
 
+    results = [lead for leads in shard_leads for lead in leads]
+    logger.info(f"Sharded dork complete: {len(results)} leads from {len(queries)} queries")
     return results
 
 
-def process_and_clean_data(raw_data: list[dict[str, Any]]) -> pd.DataFrame:
-    """Process and clean scraped data."""
+def process_and_clean_data(
+    raw_data: list[dict[str, Any]],
+    fuzzy_threshold: float = 0.0,
+    default_country: str | None = None,
+    dedup_phones: bool = True,
+) -> pd.DataFrame:
+    """Process and clean scraped data.
+
+    Phones are compared by their E.164 form, reading numbers without a country
+    code as ``default_country`` numbers. With a ``fuzzy_threshold`` above zero,
+    near-duplicate names that survive the exact dedup are also merged (see
+    dedup.merge_near_duplicates).
+    """
     if not raw_data:
         return pd.DataFrame(
             columns=["Business Name", "Phone Number", "Website", "Address", "Email"]
@@ -855,81 +2450,151 @@ def process_and_clean_data(raw_data: list[dict[str, Any]]) -> pd.DataFrame:
         if col not in df.columns:
             df[col] = ""
 
+    # Every step below is a row mask or a reordering, so work on row positions
+    # and only select rows from the frame at the end, instead of reshuffling it
+    # with concat and sort after every step.
+    order = np.arange(len(df))
+
     # 1. Normalize Business Name for branch deduplication
-    def normalize_name(name: str) -> str:
-        if not name:
-            return ""
-        # Convert to lowercase and remove common branch indicators/locations
-        n = str(name).lower()
-        # Remove common separators and everything after them (often locations)
-        n = re.split(r"[-|,(]", n)[0].strip()
-        # Remove common business suffixes and generic location words
-        n = re.sub(r"\b(ltd|limited|corp|corporation|group|inc|bd|bangladesh)\b", "", n)
-        # Remove extra whitespace and punctuation
-        n = re.sub(r"[^\w\s]", "", n)
-        return " ".join(n.split())
-
-    df["normalized_name"] = df["Business Name"].apply(normalize_name)
+    normalized_names = normalize_names(df["Business Name"])
 
     # 2. Deduplicate based on Email (if present)
-    email_mask = (df["Email"] != "") & (df["Email"].notna())
+    email_mask = ((df["Email"] != "") & (df["Email"].notna())).to_numpy()
     if email_mask.any():
-        emails_df = df[email_mask].drop_duplicates(subset=["Email"], keep="first")
-        others_df = df[~email_mask]
-        df = pd.concat([emails_df, others_df])
+        email_rows = np.flatnonzero(email_mask)
+        first_email = ~df["Email"].take(email_rows).duplicated(keep="first").to_numpy()
+        order = np.concatenate([email_rows[first_email], np.flatnonzero(~email_mask)])
 
     # 3. Deduplicate based on Website (if present)
-    website_mask = (df["Website"] != "") & (df["Website"].notna())
-    # Filter out common generic websites before using for dedup
-    def is_generic_site(url: str) -> bool:
-        generic = ["facebook.com", "instagram.com", "linkedin.com", "sites.google.com"]
-        return any(g in str(url).lower() for g in generic)
-    
+    website_mask = ((df["Website"] != "") & (df["Website"].notna())).to_numpy()
     # We only dedup by unique business websites, not social profiles
-    site_dedup_mask = website_mask & ~df["Website"].apply(is_generic_site)
+    site_dedup_mask = (website_mask & ~generic_site_mask(df["Website"]))[order]
     if site_dedup_mask.any():
-        sites_df = df[site_dedup_mask].drop_duplicates(subset=["Website"], keep="first")
-        no_sites_df = df[~site_dedup_mask]
-        df = pd.concat([sites_df, no_sites_df])
-
-    # 4. Deduplicate based on Normalized Name
+        site_rows = order[site_dedup_mask]
+        first_site = ~df["Website"].take(site_rows).duplicated(keep="first").to_numpy()
+        order = np.concatenate([site_rows[first_site], order[~site_dedup_mask]])
+
+    # 4. Deduplicate based on Phone, so "+880 1711-222333" and "01711222333" match
+    if dedup_phones:
+        phone_keys = canonical_phones(df["Phone Number"], default_country)
+        phone_dedup_mask = (phone_keys != "")[order]
+        if phone_dedup_mask.any():
+            phone_rows = order[phone_dedup_mask]
+            first_phone = ~pd.Series(phone_keys[phone_rows]).duplicated(keep="first").to_numpy()
+            order = np.concatenate([phone_rows[first_phone], order[~phone_dedup_mask]])
+
+    # 5. Deduplicate based on Normalized Name
     # Keep the one with most contact info
-    df["info_score"] = (
-        (df["Phone Number"].fillna("").str.len() > 0).astype(int) + 
-        (df["Website"].fillna("").str.len() > 0).astype(int) + 
+    info_score = (
+        (df["Phone Number"].fillna("").str.len() > 0).astype(int) +
+        (df["Website"].fillna("").str.len() > 0).astype(int) +
         (df["Email"].fillna("").str.len() > 0).astype(int)
-    )
-    df = df.sort_values(by="info_score", ascending=False)
+    ).to_numpy()
+    # Same sort call as sorting the frame, so ties keep the same order
+    by_score = pd.Series(info_score[order]).sort_values(ascending=False).index.to_numpy()
+    order = order[by_score]
     # Drop duplicates by normalized name, but keep ones with different phone numbers if they are likely different businesses?
     # No, the request is specifically about branches, so we keep one.
-    df = df.drop_duplicates(subset=["normalized_name"], keep="first")
+    order = order[~pd.Series(normalized_names[order]).duplicated(keep="first").to_numpy()]
 
     # Final cleanup
-    df = df.drop(columns=["normalized_name", "info_score"])
-
-    df["has_contact"] = (
-        (df["Phone Number"].fillna("").str.len() > 0)
-        | (df["Website"].fillna("").str.len() > 0)
-        | (df["Email"].fillna("").str.len() > 0)
-    )
+    has_contact = info_score > 0
+    df = df.take(order[has_contact[order]])
 
-    df = df[df["has_contact"]].drop(columns=["has_contact"])
-
-    def validate_phone(phone: Any) -> str:
-        if pd.isna(phone) or phone == "":
-            return str(phone)
-        cleaned = re.sub(r"[^\d\+]", "", str(phone))
-        if 10 <= len(cleaned) <= 15:
-            return str(phone)
-        return ""
-
-    df["Phone Number"] = df["Phone Number"].apply(validate_phone)  # type: ignore[union-attr]
+    df["Phone Number"] = validate_phones(df["Phone Number"])
     business_names = df["Business Name"].fillna("")  # type: ignore[union-attr]
     df = df[business_names.str.len() > 0]
 
+    if fuzzy_threshold > 0:
+        df, fuzzy_stats = merge_near_duplicates(  # type: ignore[arg-type]
+            df, fuzzy_threshold, default_country=default_country
+        )
+        logger.info(f"Near-duplicate merge: {fuzzy_stats}")
+
     return df  # type: ignore[return-value]
 
 
+async def fetch_rendered_html(pool: BrowserPool, url: str) -> str | None:
+    """Load ``url`` in a pooled tab and return the rendered HTML.
+
+    This is the browser tier of the enricher's TieredFetcher, used only for
+    pages a plain HTTP GET can't read.
+    """
+    page = await pool.acquire()
+    try:
+        await current_rate_limiter().wait(url)
+        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        await current_wait_policy().network_idle(page, "rendered page")
+        return await page.content()
+    except Exception:
+        pool.mark_error(page)
+        raise
+    finally:
+        await pool.release(page)
+
+
+async def enrich_leads(
+    leads: list[dict[str, Any]],
+    enricher: WebsiteEnricher,
+    lead_store: LeadStore | None = None,
+    query: str = "",
+    max_pages: int | None = None,
+    max_depth: int | None = None,
+) -> int:
+    """Crawl the websites of leads without an email and fill in what they list.
+
+    Enriched leads are written back with ``LeadStore.update``, so the more
+    complete copy replaces the original even when it only gained social
+    profiles. Returns how many leads gained a field.
+    """
+    missing = [lead for lead in leads if not lead.get("Email") and lead.get("Website")]
+    if not missing:
+        return 0
+    logger.info(f"Enriching {len(missing)} leads from their websites...")
+
+    async def enrich_one(lead: dict[str, Any]) -> bool:
+        try:
+            changed = await enricher.enrich(lead, max_pages, max_depth)
+        except Exception as e:
+            logger.debug(f"Enrichment failed for {lead.get('Website')}: {e}")
+            return False
+        if changed:
+            if lead_store is not None:
+                lead_store.update(lead, query)
+            logger.info(
+                f"  * Enriched: {str(lead.get('Business Name', ''))[:30]} | "
+                f"{lead.get('Email') or lead.get('Facebook') or lead.get('Instagram')}"
+            )
+        return changed
+
+    with metrics.timer("enrichment"):
+        enriched = sum(await asyncio.gather(*(enrich_one(lead) for lead in missing)))
+    logger.info(f"Enriched {enriched}/{len(missing)} leads: {enricher.summary()}")
+    return enriched
+
+
+def import_excel_leads(lead_store: LeadStore, excel_file: str) -> int:
+    """Seed an empty lead store from a workbook written by older versions."""
+    existing_df = pd.read_excel(excel_file)
+    # Fill NaN with empty string to match our processing logic
+    existing_records = existing_df.fillna("").to_dict("records")
+    lead_store.add_many(existing_records)
+    return len(existing_records)
+
+
+def export_leads(
+    lead_store: LeadStore, output_file: str, fuzzy_threshold: float = 0.0
+) -> pd.DataFrame:
+    """Clean the store's current leads and write them to an Excel workbook."""
+    with metrics.timer("cleaning"):
+        df = process_and_clean_data(
+            lead_store.current_records(), fuzzy_threshold, lead_store.default_country
+        )
+    with metrics.timer("export"):
+        df.to_excel(output_file, index=False, engine="openpyxl")
+    return df
+
+
 def parse_search_prompt(search_prompt: str) -> dict[str, str]:
     """Parse user search prompt to determine search type and parameters."""
     config = {
@@ -939,29 +2604,13 @@ def parse_search_prompt(search_prompt: str) -> dict[str, str]:
         "target": "email",
     }
 
-    email_indicators = [
-        "@gmail.com",
-        "@yahoo.com",
-        "@hotmail.com",
-        "@outlook.com",
-        "contact@",
-        "site:",
-    ]
-
-    social_indicators = [
-        "facebook.com",
-        "instagram.com",
-        "fb.com",
-        "fb.me",
-    ]
-
     prompt_lower = search_prompt.lower()
 
-    if any(indicator in prompt_lower for indicator in social_indicators):
+    if any(indicator in prompt_lower for indicator in SOCIAL_INDICATORS):
         config["search_type"] = "dork"
         config["keywords"] = search_prompt
         config["target"] = "profile"
-    elif any(indicator in prompt_lower for indicator in email_indicators):
+    elif any(indicator in prompt_lower for indicator in EMAIL_INDICATORS):
         config["search_type"] = "dork"
         config["keywords"] = search_prompt
         config["target"] = "email"
@@ -982,7 +2631,532 @@ def parse_search_prompt(search_prompt: str) -> dict[str, str]:
     return config
 
 
-async def main() -> None:
+def load_jobs(path: str, defaults: SearchConfig | None = None) -> list[SearchConfig]:
+    """Read SearchConfig records from a JSONL or CSV file.
+
+    Fields a record leaves out take their value from ``defaults``.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = [row for row in csv.DictReader(f)]
+    else:
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    defaults = defaults or SearchConfig()
+    jobs = []
+    for row in rows:
+        # CSV cells arrive as strings, so coerce them to the field's type
+        values: dict[str, Any] = {}
+        for key, value in row.items():
+            if key not in SearchConfig.__annotations__ or value in (None, ""):
+                continue
+            default = getattr(defaults, key)
+            if isinstance(value, str) and isinstance(default, bool):
+                value = value.strip().lower() in ("1", "true", "yes", "y")
+            elif isinstance(value, str) and isinstance(default, (int, float)):
+                value = type(default)(value)
+            values[key] = value
+        jobs.append(SearchConfig.from_dict({**defaults.to_dict(), **values}))
+    return jobs
+
+
+def describe_job(job: SearchConfig) -> str:
+    """Short human-readable label for a job."""
+    if job.search_type in ("maps", "google_maps"):
+        return f"{job.keywords} in {job.location}"
+    return f"{job.keywords} {job.dork_query}".strip()
+
+
+def job_phone_country(job: SearchConfig) -> str | None:
+    """The country a job's phone numbers without a country code belong to.
+
+    Dork jobs have no location, so their query and shard locations are read
+    instead (``intext:dhaka`` gives BD).
+    """
+    searched = job.location or " ".join((job.keywords, job.dork_query, job.dork_locations))
+    return job.phone_country or country_for_location(searched)
+
+
+@contextmanager
+def job_policies(job: SearchConfig) -> Iterator[None]:
+    """Run the code inside with ``job``'s waits, request rates and resource blocking."""
+    wait_token = _job_wait_policy.set(
+        WaitPolicy(
+            job.wait_timeout_ms, job.network_idle_timeout_ms, job.min_jitter, job.max_jitter
+        )
+    )
+    block_token = _job_block_resources.set(job.block_resources)
+    rate_token = _job_rate_limiter.set(rate_limiter_for(job))
+    try:
+        yield
+    finally:
+        _job_rate_limiter.reset(rate_token)
+        _job_block_resources.reset(block_token)
+        _job_wait_policy.reset(wait_token)
+
+
+async def run_job(
+    job: SearchConfig,
+    pool: BrowserPool,
+    detail_cache: DetailCache | None = None,
+    lead_store: LeadStore | None = None,
+    checkpoint_store: CheckpointStore | None = None,
+    resume: bool = False,
+    enricher: WebsiteEnricher | None = None,
+    place_index: PlaceIndex | None = None,
+) -> list[dict[str, str]]:
+    """Run a single search on a shared browser pool.
+
+    The job's waits and request rates follow its own SearchConfig (see
+    job_policies). When resuming, jobs whose checkpoint is marked completed
+    are skipped. With ``job.enrich_websites`` and an ``enricher``, leads
+    without an email are then enriched from their websites. Maps jobs with ``skip_known_places``
+    pass over the places already in ``place_index``.
+    """
+    if not job.skip_known_places:
+        place_index = None
+    if checkpoint_store is not None and resume:
+        saved = checkpoint_store.load(checkpoint_key(job.search_type, describe_job(job)))
+        if saved is not None and saved[1]:
+            logger.info(f"Skipping completed job: {describe_job(job)}")
+            return []
+    if lead_store is not None:
+        lead_store = lead_store.for_country(job_phone_country(job) or lead_store.default_country)
+
+    with job_policies(job):
+        leads = await _search(
+            job, pool, detail_cache, lead_store, checkpoint_store, resume, place_index
+        )
+
+    if job.enrich_websites and enricher is not None:
+        await enrich_leads(
+            leads, enricher, lead_store, describe_job(job), job.enrich_max_pages, job.enrich_max_depth
+        )
+    return leads
+
+
+async def _search(
+    job: SearchConfig,
+    pool: BrowserPool,
+    detail_cache: DetailCache | None,
+    lead_store: LeadStore | None,
+    checkpoint_store: CheckpointStore | None,
+    resume: bool,
+    place_index: PlaceIndex | None,
+) -> list[dict[str, str]]:
+    """Run ``job`` with the scraper its search type and options call for."""
+    if job.search_type in ("maps", "google_maps") and job.tile_maps:
+        leads = await scrape_maps_tiles(
+            keywords=job.keywords,
+            location=job.location,
+            max_scrolls=job.max_scrolls,
+            results_limit=job.results_limit,
+            detail_concurrency=job.detail_concurrency,
+            listing_queue_size=job.listing_queue_size,
+            pool=pool,
+            detail_cache=detail_cache,
+            lead_store=lead_store,
+            checkpoint_store=checkpoint_store,
+            resume=resume,
+            checkpoint_every=job.checkpoint_every,
+            bounds=job.tile_bounds,
+            grid=job.tile_grid,
+            max_depth=job.max_tile_depth,
+            max_tiles=job.max_tiles,
+            concurrency=job.tile_concurrency,
+            place_index=place_index,
+        )
+    elif job.search_type in ("maps", "google_maps"):
+        leads = await scrape_google_maps(
+            keywords=job.keywords,
+            location=job.location,
+            max_scrolls=job.max_scrolls,
+            results_limit=job.results_limit,
+            detail_concurrency=job.detail_concurrency,
+            listing_queue_size=job.listing_queue_size,
+            pool=pool,
+            detail_cache=detail_cache,
+            lead_store=lead_store,
+            checkpoint_store=checkpoint_store,
+            resume=resume,
+            checkpoint_every=job.checkpoint_every,
+            place_index=place_index,
+        )
+    elif job.search_type in ("dork", "google_dork") and job.shard_dork:
+        queries = plan_dork_shards(
+            f"{job.keywords} {job.dork_query}".strip(),
+            job.dork_locations,
+            job.dork_sites,
+            job.dork_email_domains,
+            job.target,
+            job.max_dork_shards,
+        )
+        leads = await scrape_dork_shards(
+            queries,
+            max_scrolls=job.max_scrolls,
+            target=job.target,
+            pool=pool,
+            results_limit=job.results_limit,
+            lead_store=lead_store,
+            checkpoint_store=checkpoint_store,
+            resume=resume,
+            concurrency=job.dork_shard_concurrency,
+            captcha_mode=job.captcha_mode,
+            captcha_cooldown=job.captcha_cooldown,
+            max_captcha_rotations=job.max_captcha_rotations,
+            job_query=describe_job(job),
+        )
+    elif job.search_type in ("dork", "google_dork"):
+        leads = await scrape_google_dork(
+            keywords=job.keywords,
+            dork_query=job.dork_query,
+            max_scrolls=job.max_scrolls,
+            target=job.target,
+            pool=pool,
+            results_limit=job.results_limit,
+            lead_store=lead_store,
+            checkpoint_store=checkpoint_store,
+            resume=resume,
+            captcha_mode=job.captcha_mode,
+            captcha_cooldown=job.captcha_cooldown,
+            max_captcha_rotations=job.max_captcha_rotations,
+        )
+    else:
+        raise ValueError(f"Unknown search_type: {job.search_type}")
+    return leads
+
+
+async def run_batch(
+    jobs: list[SearchConfig],
+    output_file: str,
+    concurrency: int = 2,
+    headless: bool = True,
+    lead_store: LeadStore | None = None,
+    checkpoint_store: CheckpointStore | None = None,
+    resume: bool = False,
+    replay_path: str | None = None,
+    record_path: str | None = None,
+    enrich_concurrency: int = 8,
+    place_index: PlaceIndex | None = None,
+) -> int:
+    """Run many searches concurrently, streaming each job's leads to JSONL.
+
+    With a ``lead_store`` every lead is also appended to it the moment it is found.
+    ``replay_path`` serves every page from recorded fixtures (a snapshot
+    directory or HAR file) instead of Google; ``record_path`` saves the pages
+    of a live run there. Jobs with ``enrich_websites`` share one website
+    crawler with ``enrich_concurrency`` requests in flight. Maps jobs skip
+    places already in ``place_index``. Browser contexts are recycled after the
+    smallest ``context_max_uses`` / ``context_max_errors`` any job sets. Each
+    job reads and fills the detail cache its ``detail_cache_path`` names, with
+    its own ``detail_cache_ttl_hours``. The crawler keeps its findings in the
+    first enrich job's cache file, in a SiteCache with the shortest
+    ``enrich_cache_ttl_hours`` of those jobs.
+    """
+    concurrency = max(1, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    total = 0
+    detail_caches: dict[tuple[str, float], DetailCache] = {}
+
+    def cache_for(job: SearchConfig) -> DetailCache | None:
+        if not job.detail_cache_path:
+            return None
+        key = (job.detail_cache_path, job.detail_cache_ttl_hours)
+        if key not in detail_caches:
+            detail_caches[key] = DetailCache(*key)
+        return detail_caches[key]
+
+    async def run_one(index: int, job: SearchConfig) -> tuple[int, list[dict[str, str]]]:
+        async with semaphore:
+            logger.info(f"[JOB {index + 1}/{len(jobs)}] Starting: {describe_job(job)}")
+            try:
+                leads = await run_job(
+                    job,
+                    pool,
+                    cache_for(job),
+                    lead_store,
+                    checkpoint_store,
+                    resume,
+                    enricher,
+                    place_index,
+                )
+                return index, leads
+            except Exception as e:
+                metrics.inc("job_failures")
+                logger.error(f"[JOB {index + 1}/{len(jobs)}] Failed: {e}")
+                return index, []
+
+    replay = ReplayRouter(SnapshotStore.load(replay_path)) if replay_path else None
+    recorder = SnapshotRecorder(record_path) if record_path else None
+    enricher = None
+    site_cache = None
+    enrich_jobs = [job for job in jobs if job.enrich_websites]
+    if enrich_jobs:
+        site_cache_path = next(
+            (job.detail_cache_path for job in enrich_jobs if job.detail_cache_path), ""
+        )
+        if site_cache_path:
+            # One crawler serves every job, so the shortest TTL is fresh enough for all
+            site_cache = SiteCache(
+                site_cache_path, min(job.enrich_cache_ttl_hours for job in enrich_jobs)
+            )
+        enricher = WebsiteEnricher(
+            contact_extractor,
+            is_valid_profile_url,
+            concurrency=enrich_concurrency,
+            user_agent=random.choice(USER_AGENTS),
+            cache=site_cache,
+            metrics=metrics,
+            browser_fetch=lambda url: fetch_rendered_html(pool, url),
+        )
+        await enricher.start()
+    # Sharded dork and tiled Maps jobs lease one context per shard or tile they run at once
+    leases_per_job = max(
+        [job.dork_shard_concurrency for job in jobs if job.shard_dork]
+        + [job.tile_concurrency for job in jobs if job.tile_maps],
+        default=1,
+    )
+    # Jobs share the pool's contexts, so the strictest recycling limits apply to all
+    async with BrowserPool(
+        size=concurrency * max(1, leases_per_job),
+        headless=headless,
+        max_uses=min((job.context_max_uses for job in jobs), default=SearchConfig.context_max_uses),
+        max_errors=min((job.context_max_errors for job in jobs), default=SearchConfig.context_max_errors),
+        # Leases only block for the jobs that set block_resources
+        block_resources=any(job.block_resources for job in jobs),
+        replay=replay,
+        recorder=recorder,
+    ) as pool:
+        tasks = [asyncio.create_task(run_one(i, job)) for i, job in enumerate(jobs)]
+        try:
+            with open(output_file, "a", encoding="utf-8") as out:
+                for finished in asyncio.as_completed(tasks):
+                    index, leads = await finished
+                    query = describe_job(jobs[index])
+                    for lead in leads:
+                        out.write(json.dumps({**lead, "Query": query}, ensure_ascii=False) + "\n")
+                    out.flush()
+                    total += len(leads)
+                    logger.info(
+                        f"[JOB {index + 1}/{len(jobs)}] Done: {len(leads)} leads "
+                        f"(total {total}) -> {output_file}"
+                    )
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if pool.blocker is not None:
+            logger.info(f"Resource blocking: {pool.blocker.summary()}")
+        pool.log_sessions()
+    if enricher is not None:
+        logger.info(f"Website enrichment: {enricher.summary()}")
+        await enricher.close()
+    if site_cache is not None:
+        logger.info(f"Website cache {site_cache.path}: {site_cache.summary()}")
+        site_cache.close()
+    if replay is not None:
+        logger.info(f"Replay: {replay.summary()}")
+        replay.close()
+    if recorder is not None:
+        recorder.save()
+    for (cache_path, _), detail_cache in detail_caches.items():
+        logger.info(f"Detail cache {cache_path}: {detail_cache.summary()}")
+        detail_cache.close()
+    if place_index is not None:
+        logger.info(f"Known places: {place_index.summary()}")
+
+    return total
+
+
+def report_metrics(json_path: str | None = None, prometheus_path: str | None = None) -> None:
+    """Log where the run's time went and optionally write the metrics to files."""
+    metrics.log_summary()
+    if retry_policy.calls:
+        logger.info(f"Retries: {retry_policy.summary()}")
+    if rate_limiter.summary():
+        logger.info(f"Request rates (per second): {rate_limiter.summary()}")
+    for (rate, burst, max_rate), limiter in _job_rate_limiters.items():
+        if limiter.summary():
+            logger.info(
+                f"Request rates (per second) for jobs at {rate}/s, burst {burst}, "
+                f"max {max_rate}/s: {limiter.summary()}"
+            )
+    if json_path:
+        metrics.write_json(json_path)
+        logger.info(f"Metrics written to {json_path}")
+    if prometheus_path:
+        metrics.write_prometheus(prometheus_path)
+        logger.info(f"Prometheus metrics written to {prometheus_path}")
+
+
+# Flags that set a SearchConfig field when given: SEARCH_CONFIG in interactive
+# runs, and the defaults of every batch job that doesn't set the field itself
+CONFIG_FLAGS = {
+    "block_resources": "block_resources",
+    "detail_cache": "detail_cache_path",
+    "cache_ttl_hours": "detail_cache_ttl_hours",
+    "wait_timeout_ms": "wait_timeout_ms",
+    "network_idle_ms": "network_idle_timeout_ms",
+    "min_jitter": "min_jitter",
+    "max_jitter": "max_jitter",
+    "fuzzy_dedup": "fuzzy_dedup_threshold",
+    "phone_country": "phone_country",
+    "requests_per_second": "requests_per_second",
+    "request_burst": "request_burst",
+    "max_requests_per_second": "max_requests_per_second",
+    "enrich_cache_ttl_hours": "enrich_cache_ttl_hours",
+}
+
+
+def config_overrides(args: argparse.Namespace) -> dict[str, Any]:
+    """The SearchConfig fields set on the command line."""
+    return {
+        field_name: getattr(args, flag)
+        for flag, field_name in CONFIG_FLAGS.items()
+        if getattr(args, flag) is not None
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line flags for non-interactive runs."""
+    parser = argparse.ArgumentParser(description="Lead scraping agent")
+    parser.add_argument(
+        "--jobs", help="JSONL or CSV file of SearchConfig records to run without prompts"
+    )
+    parser.add_argument(
+        "--output", default="leads_batch.jsonl", help="JSONL file leads are appended to"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=2, help="Searches to run at the same time"
+    )
+    parser.add_argument(
+        "--visible", action="store_true", help="Show the browser instead of running headless"
+    )
+    parser.add_argument(
+        "--block-resources",
+        action="store_true",
+        default=None,
+        help="Block images, fonts, map tiles and trackers (jobs can set block_resources themselves)",
+    )
+    parser.add_argument(
+        "--detail-cache",
+        help="SQLite cache of listing details (default listing_cache.sqlite, empty string disables it)",
+    )
+    parser.add_argument(
+        "--cache-ttl-hours",
+        type=float,
+        help="How long cached listing details stay fresh (default 168)",
+    )
+    parser.add_argument(
+        "--lead-store", default="leads.sqlite", help="SQLite store every lead is appended to"
+    )
+    parser.add_argument(
+        "--export", help="Write the lead store's deduplicated leads to this Excel file"
+    )
+    parser.add_argument(
+        "--fuzzy-dedup",
+        type=float,
+        help="Also merge near-duplicate names at this similarity (0-1) when exporting "
+        "(default: the jobs' fuzzy_dedup_threshold, 0 = off)",
+    )
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        help="Starting request rate per host (default 1); adapts between 0.05 and "
+        "--max-requests-per-second",
+    )
+    parser.add_argument(
+        "--max-requests-per-second",
+        type=float,
+        help="Ceiling the per-host rate climbs back to while responses stay clean (default 4)",
+    )
+    parser.add_argument(
+        "--request-burst", type=int, help="Requests a host may get back to back (default 4)"
+    )
+    parser.add_argument(
+        "--wait-timeout-ms",
+        type=int,
+        help="Longest to wait for a page element before moving on (default 10000)",
+    )
+    parser.add_argument(
+        "--network-idle-ms",
+        type=int,
+        help="Longest to wait for the network to go quiet after a page loads (default 3000)",
+    )
+    parser.add_argument(
+        "--min-jitter",
+        type=float,
+        help="Shortest random pause in seconds between actions (default 0.2)",
+    )
+    parser.add_argument(
+        "--max-jitter",
+        type=float,
+        help="Longest random pause in seconds between actions (default 0.6)",
+    )
+    parser.add_argument(
+        "--replay",
+        help="Serve every page from a recorded snapshot directory or HAR file",
+    )
+    parser.add_argument(
+        "--record",
+        help="Save the pages of this live run as replay fixtures in this directory",
+    )
+    parser.add_argument(
+        "--metrics-json", help="Write per-phase timings and counters to this JSON file"
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        help="Write per-phase timings and counters to this Prometheus text file",
+    )
+    parser.add_argument(
+        "--enrich",
+        action="store_true",
+        help="Crawl every job's lead websites for emails and Facebook/Instagram links",
+    )
+    parser.add_argument(
+        "--enrich-cache-ttl-hours",
+        type=float,
+        help="How long a site's enrichment findings stay cached (default 720)",
+    )
+    parser.add_argument(
+        "--enrich-concurrency",
+        type=int,
+        default=8,
+        help="Website requests in flight at once while enriching",
+    )
+    parser.add_argument(
+        "--rescan-known",
+        action="store_true",
+        help="Scrape Maps places again even if the lead store already has them",
+    )
+    parser.add_argument(
+        "--phone-country",
+        type=str.upper,
+        help="Country (e.g. BD, US) for phone numbers written without a country code",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue interrupted searches from their last checkpoint",
+    )
+    parser.add_argument(
+        "--dedup-archive",
+        help="Deduplicate a large CSV/JSONL/Excel/SQLite lead archive chunk by chunk",
+    )
+    parser.add_argument(
+        "--dedup-output",
+        default="leads_deduped.csv",
+        help="CSV or JSONL file --dedup-archive writes to",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=50_000, help="Rows read at a time by --dedup-archive"
+    )
+    return parser.parse_args(argv)
+
+
+async def main(resume: bool = False) -> None:
     """Main entry point for the lead scraper."""
     print("=" * 60)
     print("              LEAD SCRAPING AGENT")
@@ -1032,6 +3206,11 @@ async def main() -> None:
             SEARCH_CONFIG["keywords"] = search_prompt
             SEARCH_CONFIG["location"] = os.getenv("DEFAULT_LOCATION", "New York")
 
+        tile_input = input(
+            "Cover the whole area tile by tile (past the ~120 results of one search)? (y/n, default n): "
+        )
+        SEARCH_CONFIG["tile_maps"] = tile_input.strip().lower() == "y"
+
     else:
         print("\n[ENTER SEARCH PROMPT]")
         print("Examples:")
@@ -1051,6 +3230,13 @@ async def main() -> None:
         SEARCH_CONFIG["keywords"] = parsed["keywords"]
         SEARCH_CONFIG["target"] = parsed["target"]
 
+        shard_input = input(
+            "Split into parallel searches per location (e.g. dhaka|chittagong, blank for one search): "
+        ).strip()
+        if shard_input:
+            SEARCH_CONFIG["shard_dork"] = True
+            SEARCH_CONFIG["dork_locations"] = shard_input
+
     print("\n[HEADLESS MODE]")
     print("  y - Run in headless mode (faster, more likely blocked)")
     print("  n - Run with visible browser (slower, harder to detect)")
@@ -1061,6 +3247,19 @@ async def main() -> None:
     if headless_input != "y" and headless_input != "n":
         headless_mode = False
 
+    block_default = "y" if SEARCH_CONFIG["block_resources"] else "n"
+    block_input = input(
+        f"Block images, fonts, map tiles and trackers? (y/n, default {block_default}): "
+    )
+    SEARCH_CONFIG["block_resources"] = (block_input.strip().lower() or block_default) == "y"
+
+    enrich_input = input("Crawl lead websites for emails and social links? (y/n, default n): ")
+    SEARCH_CONFIG["enrich_websites"] = enrich_input.strip().lower() == "y"
+
+    fuzzy_input = input("Merge near-duplicate business names on export? (y/n, default n): ")
+    if fuzzy_input.strip().lower() == "y":
+        SEARCH_CONFIG["fuzzy_dedup_threshold"] = SEARCH_CONFIG["fuzzy_dedup_threshold"] or 0.65
+
     try:
         SEARCH_CONFIG["max_scrolls"] = int(
             input(f"\nMax scrolls/pages (default 15): ").strip() or "15"
@@ -1081,6 +3280,8 @@ async def main() -> None:
         target_name = "Social Profiles" if target_type == "profile" else "Emails"
         print(f"  Target:        {target_name}")
     print(f"  Headless:      {'Yes' if headless_mode else 'No'}")
+    print(f"  Block Assets:  {'Yes' if SEARCH_CONFIG['block_resources'] else 'No'}")
+    print(f"  Enrich Sites:  {'Yes' if SEARCH_CONFIG['enrich_websites'] else 'No'}")
     print(f"  Max Scrolls:   {SEARCH_CONFIG['max_scrolls']}")
     print(f"  Results Limit: {SEARCH_CONFIG['results_limit']}")
     print("=" * 60 + "\n")
@@ -1093,15 +3294,110 @@ async def main() -> None:
 
     logger.info("Initializing browser...")
 
+    wait_policy.timeout_ms = SEARCH_CONFIG["wait_timeout_ms"]
+    wait_policy.network_idle_ms = SEARCH_CONFIG["network_idle_timeout_ms"]
+    wait_policy.min_jitter = SEARCH_CONFIG["min_jitter"]
+    wait_policy.max_jitter = SEARCH_CONFIG["max_jitter"]
+    rate_limiter.rate = SEARCH_CONFIG["requests_per_second"]
+    rate_limiter.burst = SEARCH_CONFIG["request_burst"]
+    rate_limiter.max_rate = SEARCH_CONFIG["max_requests_per_second"]
+
+    detail_cache = None
+    site_cache = None
+    if SEARCH_CONFIG["detail_cache_path"]:
+        detail_cache = DetailCache(
+            SEARCH_CONFIG["detail_cache_path"], SEARCH_CONFIG["detail_cache_ttl_hours"]
+        )
+
+    # Every lead goes to the store as it is found; the workbook is an export of it
+    phone_country = job_phone_country(SearchConfig.from_dict(SEARCH_CONFIG))
+    lead_store = LeadStore(os.path.splitext(output_file)[0] + ".sqlite", phone_country)
+    checkpoint_store = CheckpointStore(lead_store.path)
+    place_index = PlaceIndex(lead_store.path) if SEARCH_CONFIG["skip_known_places"] else None
+    if lead_store.count() == 0 and os.path.exists(output_file):
+        try:
+            imported = import_excel_leads(lead_store, output_file)
+            logger.info(f"Imported {imported} existing leads from {output_file}")
+        except Exception as e:
+            logger.warning(f"Could not read existing {output_file}: {e}")
+
+    pool = BrowserPool(
+        size=(
+            SEARCH_CONFIG["dork_shard_concurrency"] if SEARCH_CONFIG["shard_dork"]
+            else SEARCH_CONFIG["tile_concurrency"] if SEARCH_CONFIG["tile_maps"]
+            else 1
+        ),
+        headless=headless_mode,
+        max_uses=SEARCH_CONFIG["context_max_uses"],
+        max_errors=SEARCH_CONFIG["context_max_errors"],
+        block_resources=SEARCH_CONFIG["block_resources"],
+    )
     raw_results: list[dict[str, str]] = []
     try:
-        if SEARCH_CONFIG["search_type"] == "google_maps":
+        if SEARCH_CONFIG["search_type"] == "google_maps" and SEARCH_CONFIG["tile_maps"]:
+            raw_results = await scrape_maps_tiles(
+                keywords=SEARCH_CONFIG["keywords"],
+                location=SEARCH_CONFIG["location"],
+                max_scrolls=SEARCH_CONFIG["max_scrolls"],
+                results_limit=SEARCH_CONFIG["results_limit"],
+                headless=headless_mode,
+                detail_concurrency=SEARCH_CONFIG["detail_concurrency"],
+                listing_queue_size=SEARCH_CONFIG["listing_queue_size"],
+                pool=pool,
+                detail_cache=detail_cache,
+                lead_store=lead_store,
+                checkpoint_store=checkpoint_store,
+                resume=resume,
+                checkpoint_every=SEARCH_CONFIG["checkpoint_every"],
+                bounds=SEARCH_CONFIG["tile_bounds"],
+                grid=SEARCH_CONFIG["tile_grid"],
+                max_depth=SEARCH_CONFIG["max_tile_depth"],
+                max_tiles=SEARCH_CONFIG["max_tiles"],
+                concurrency=SEARCH_CONFIG["tile_concurrency"],
+                place_index=place_index,
+            )
+        elif SEARCH_CONFIG["search_type"] == "google_maps":
             raw_results = await scrape_google_maps(
                 keywords=SEARCH_CONFIG["keywords"],
                 location=SEARCH_CONFIG["location"],
                 max_scrolls=SEARCH_CONFIG["max_scrolls"],
                 results_limit=SEARCH_CONFIG["results_limit"],
                 headless=headless_mode,
+                detail_concurrency=SEARCH_CONFIG["detail_concurrency"],
+                listing_queue_size=SEARCH_CONFIG["listing_queue_size"],
+                pool=pool,
+                detail_cache=detail_cache,
+                lead_store=lead_store,
+                checkpoint_store=checkpoint_store,
+                resume=resume,
+                checkpoint_every=SEARCH_CONFIG["checkpoint_every"],
+                place_index=place_index,
+            )
+        elif SEARCH_CONFIG["search_type"] == "google_dork" and SEARCH_CONFIG["shard_dork"]:
+            queries = plan_dork_shards(
+                SEARCH_CONFIG["keywords"],
+                SEARCH_CONFIG["dork_locations"],
+                SEARCH_CONFIG["dork_sites"],
+                SEARCH_CONFIG["dork_email_domains"],
+                SEARCH_CONFIG.get("target", "email"),
+                SEARCH_CONFIG["max_dork_shards"],
+            )
+            logger.info(f"Running {len(queries)} dork variants: {queries}")
+            raw_results = await scrape_dork_shards(
+                queries,
+                max_scrolls=SEARCH_CONFIG["max_scrolls"],
+                headless=headless_mode,
+                target=SEARCH_CONFIG.get("target", "email"),
+                pool=pool,
+                results_limit=SEARCH_CONFIG["results_limit"],
+                lead_store=lead_store,
+                checkpoint_store=checkpoint_store,
+                resume=resume,
+                concurrency=SEARCH_CONFIG["dork_shard_concurrency"],
+                captcha_mode=SEARCH_CONFIG["captcha_mode"],
+                captcha_cooldown=SEARCH_CONFIG["captcha_cooldown"],
+                max_captcha_rotations=SEARCH_CONFIG["max_captcha_rotations"],
+                job_query=SEARCH_CONFIG["keywords"],
             )
         elif SEARCH_CONFIG["search_type"] == "google_dork":
             raw_results = await scrape_google_dork(
@@ -1110,37 +3406,70 @@ async def main() -> None:
                 max_scrolls=SEARCH_CONFIG["max_scrolls"],
                 headless=headless_mode,
                 target=SEARCH_CONFIG.get("target", "email"),
+                pool=pool,
+                results_limit=SEARCH_CONFIG["results_limit"],
+                lead_store=lead_store,
+                checkpoint_store=checkpoint_store,
+                resume=resume,
+                captcha_mode=SEARCH_CONFIG["captcha_mode"],
+                captcha_cooldown=SEARCH_CONFIG["captcha_cooldown"],
+                max_captcha_rotations=SEARCH_CONFIG["max_captcha_rotations"],
             )
+        if SEARCH_CONFIG["enrich_websites"] and raw_results:
+            if SEARCH_CONFIG["detail_cache_path"]:
+                site_cache = SiteCache(
+                    SEARCH_CONFIG["detail_cache_path"], SEARCH_CONFIG["enrich_cache_ttl_hours"]
+                )
+            async with WebsiteEnricher(
+                contact_extractor,
+                is_valid_profile_url,
+                max_pages=SEARCH_CONFIG["enrich_max_pages"],
+                max_depth=SEARCH_CONFIG["enrich_max_depth"],
+                user_agent=random.choice(USER_AGENTS),
+                cache=site_cache,
+                metrics=metrics,
+                browser_fetch=lambda url: fetch_rendered_html(pool, url),
+            ) as enricher:
+                await enrich_leads(
+                    raw_results, enricher, lead_store, SEARCH_CONFIG["keywords"]
+                )
     except KeyboardInterrupt:
         print("\n[!] Scraping interrupted by user")
     except Exception as e:
         logger.error(f"Error during scraping: {e}")
     finally:
+        await pool.close()
+        checkpoint_store.close()
+        if place_index is not None:
+            logger.info(f"Known places: {place_index.summary()}")
+            place_index.close()
+        if pool.blocker is not None:
+            logger.info(f"Resource blocking: {pool.blocker.summary()}")
+        pool.log_sessions()
+        if detail_cache is not None:
+            logger.info(f"Detail cache: {detail_cache.summary()}")
+            detail_cache.close()
+        if site_cache is not None:
+            logger.info(f"Website cache: {site_cache.summary()}")
+            site_cache.close()
+
         if not raw_results:
             logger.warning("No results found. Check your search parameters.")
-            return
+            # Leads written before an interruption are still in the store
+            if lead_store.count() == 0:
+                lead_store.close()
+                return
 
         logger.info(f"Scraping finished or interrupted! Total raw results: {len(raw_results)}")
+        logger.info(
+            f"Lead store {lead_store.path}: {lead_store.count()} rows, "
+            f"{lead_store.count(current_only=True)} unique"
+        )
 
-        all_results = raw_results
-
-        # Load existing data to append
-        if os.path.exists(output_file):
-            try:
-                existing_df = pd.read_excel(output_file)
-                # Fill NaN with empty string to match our processing logic
-                existing_df = existing_df.fillna("")
-                existing_records = existing_df.to_dict("records")
-                all_results = existing_records + raw_results
-                logger.info(f"Loaded {len(existing_records)} existing leads from {output_file}")
-            except Exception as e:
-                logger.warning(f"Could not read existing {output_file}: {e}")
-
-        df = process_and_clean_data(all_results)
+        df = export_leads(lead_store, output_file, SEARCH_CONFIG["fuzzy_dedup_threshold"])
+        lead_store.close()
         logger.info(f"After processing and deduplication: {len(df)} total leads")
 
-        df.to_excel(output_file, index=False, engine="openpyxl")
-
         logger.info(f"Results exported to {output_file}")
         print("=" * 60)
         print("\nSample results:")
@@ -1148,4 +3477,67 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    SEARCH_CONFIG.update(config_overrides(args))
+    try:
+        rate_limiter.rate = SEARCH_CONFIG["requests_per_second"]
+        rate_limiter.burst = SEARCH_CONFIG["request_burst"]
+        rate_limiter.max_rate = SEARCH_CONFIG["max_requests_per_second"]
+        if args.dedup_archive:
+            stats = dedup_archive(
+                args.dedup_archive, args.dedup_output, args.chunk_size, args.phone_country
+            )
+            logger.info(
+                f"Deduplicated {stats['rows']} rows to {stats['written']} leads in "
+                f"{args.dedup_output} (peak memory {stats['peak_memory_mb']} MB)"
+            )
+        elif args.jobs or args.export:
+            batch_store = LeadStore(args.lead_store, args.phone_country)
+            batch_checkpoints = CheckpointStore(args.lead_store)
+            batch_places = PlaceIndex(args.lead_store)
+            try:
+                batch_jobs = []
+                if args.jobs:
+                    batch_jobs = load_jobs(args.jobs, SearchConfig.from_dict(SEARCH_CONFIG))
+                    logger.info(f"Loaded {len(batch_jobs)} jobs from {args.jobs}")
+                    for job in batch_jobs:
+                        if args.enrich:
+                            job.enrich_websites = True
+                        if args.rescan_known:
+                            job.skip_known_places = False
+                    asyncio.run(
+                        run_batch(
+                            batch_jobs,
+                            output_file=args.output,
+                            concurrency=args.concurrency,
+                            headless=not args.visible,
+                            lead_store=batch_store,
+                            checkpoint_store=batch_checkpoints,
+                            resume=args.resume,
+                            replay_path=args.replay,
+                            record_path=args.record,
+                            enrich_concurrency=args.enrich_concurrency,
+                            place_index=batch_places,
+                        )
+                    )
+                if args.export:
+                    # The flag already became every job's default; a job may still ask for more
+                    fuzzy_threshold = max(
+                        (job.fuzzy_dedup_threshold for job in batch_jobs),
+                        default=SEARCH_CONFIG["fuzzy_dedup_threshold"],
+                    )
+                    # Without --phone-country, a batch of jobs in one country exports as that country
+                    job_countries = {job_phone_country(job) for job in batch_jobs}
+                    export_store = batch_store
+                    if not args.phone_country and len(job_countries) == 1:
+                        export_store = batch_store.for_country(job_countries.pop())
+                    exported = export_leads(export_store, args.export, fuzzy_threshold)
+                    logger.info(f"Exported {len(exported)} leads to {args.export}")
+            finally:
+                batch_store.close()
+                batch_checkpoints.close()
+                batch_places.close()
+        else:
+            asyncio.run(main(resume=args.resume))
+    finally:
+        report_metrics(args.metrics_json, args.metrics_prom)
@@ -0,0 +1,160 @@
+import json
+import logging
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds, from quick DOM reads up to slow page loads and captcha waits
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations, like a Prometheus histogram.
+
+    Memory stays constant however many observations a long run makes;
+    quantiles are interpolated within the bucket they fall in.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One count per bucket plus the +Inf overflow bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile (0-1), or 0.0 with no observations."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "total": round(self.sum, 4),
+            "mean": round(self.sum / self.count, 4) if self.count else 0.0,
+            "min": round(self.min, 4) if self.count else 0.0,
+            "p50": round(self.quantile(0.5), 4),
+            "p90": round(self.quantile(0.9), 4),
+            "p99": round(self.quantile(0.99), 4),
+            "max": round(self.max, 4),
+        }
+
+
+class Metrics:
+    """Per-phase duration histograms and event counters for one run.
+
+    Phases are timed with ``timer``, which also works around awaits:
+
+        with metrics.timer("detail_goto"):
+            await page.goto(href)
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.phases: dict[str, Histogram] = {}
+        self.counters: dict[str, int] = {}
+        self.started_at = time.time()
+
+    def observe(self, phase: str, seconds: float) -> None:
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, phase: str) -> Iterator[None]:
+        """Time the block as one ``phase`` observation, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - start)
+
+    def inc(self, counter: str, amount: int = 1) -> None:
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def reset(self) -> None:
+        self.phases.clear()
+        self.counters.clear()
+        self.started_at = time.time()
+
+    def summary(self) -> dict[str, Any]:
+        """Every phase's histogram summary and every counter, as plain data."""
+        return {
+            "started_at": self.started_at,
+            "elapsed_seconds": round(time.time() - self.started_at, 3),
+            "phases": {name: h.summary() for name, h in sorted(self.phases.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def log_summary(self) -> None:
+        """Log a table of where the run's time went, busiest phase first."""
+        summary = self.summary()
+        if not summary["phases"] and not summary["counters"]:
+            return
+        logger.info(f"Run metrics ({summary['elapsed_seconds']:.1f}s elapsed):")
+        logger.info(
+            f"  {'phase':<22} {'count':>7} {'total s':>9} {'mean s':>8} {'p50 s':>8} {'p90 s':>8} {'max s':>8}"
+        )
+        for name, phase in sorted(
+            summary["phases"].items(), key=lambda item: item[1]["total"], reverse=True
+        ):
+            logger.info(
+                f"  {name:<22} {phase['count']:>7} {phase['total']:>9.2f} {phase['mean']:>8.3f} "
+                f"{phase['p50']:>8.3f} {phase['p90']:>8.3f} {phase['max']:>8.3f}"
+            )
+        if summary["counters"]:
+            logger.info(
+                "  counters: "
+                + ", ".join(f"{name}={value}" for name, value in summary["counters"].items())
+            )
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def write_prometheus(self, path: str, prefix: str = "lead_scraper") -> None:
+        """Write the metrics in the Prometheus text format (for node_exporter's textfile collector)."""
+        lines = [
+            f"# HELP {prefix}_phase_seconds Time spent in each scraper phase.",
+            f"# TYPE {prefix}_phase_seconds histogram",
+        ]
+        for name, histogram in sorted(self.phases.items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*histogram.buckets, math.inf), histogram.counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == math.inf else repr(bound)
+                lines.append(f'{prefix}_phase_seconds_bucket{{phase="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'{prefix}_phase_seconds_sum{{phase="{name}"}} {histogram.sum!r}')
+            lines.append(f'{prefix}_phase_seconds_count{{phase="{name}"}} {histogram.count}')
+        lines += [
+            f"# HELP {prefix}_events_total Retries, failures and other run events.",
+            f"# TYPE {prefix}_events_total counter",
+        ]
+        for name, value in sorted(self.counters.items()):
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {value}')
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
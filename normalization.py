@@ -0,0 +1,229 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from extraction import UNICODE_DIGITS
+
+GENERIC_SITES = ["facebook.com", "instagram.com", "linkedin.com", "sites.google.com"]
+
+NAME_SEPARATOR_REGEX = re.compile(r"[-|,(]")
+NAME_SUFFIX_REGEX = re.compile(r"\b(ltd|limited|corp|corporation|group|inc|bd|bangladesh)\b")
+NAME_PUNCTUATION_REGEX = re.compile(r"[^\w\s]")
+PHONE_STRIP_REGEX = re.compile(r"[^\d\+]")
+
+
+def _normalize_name_text(n: str) -> str:
+    # Convert to lowercase and remove common branch indicators/locations
+    n = n.lower()
+    # Remove common separators and everything after them (often locations)
+    n = NAME_SEPARATOR_REGEX.split(n, 1)[0].strip()
+    # Remove common business suffixes and generic location words
+    n = NAME_SUFFIX_REGEX.sub("", n)
+    # Remove extra whitespace and punctuation
+    n = NAME_PUNCTUATION_REGEX.sub("", n)
+    return " ".join(n.split())
+
+
+def normalize_name(name: Any) -> str:
+    """Normalize a business name for branch deduplication."""
+    if not name:
+        return ""
+    return _normalize_name_text(str(name))
+
+
+def is_generic_site(url: Any) -> bool:
+    """Check if a website is a shared platform rather than the business's own site."""
+    return any(g in str(url).lower() for g in GENERIC_SITES)
+
+
+def map_unique(func: Callable[[str], Any], values: Any) -> np.ndarray:
+    """Apply ``func`` to ``str(value)`` once per distinct value instead of once per row.
+
+    Lead tables repeat the same names, sites and numbers many times, so this is
+    much cheaper than ``Series.apply`` on large tables while giving the same
+    result for every row.
+    """
+    results: dict[str, Any] = {}
+    mapped = np.empty(len(values), dtype=object)
+    mapped[:] = [
+        results[key] if key in results else results.setdefault(key, func(key))
+        for key in map(str, np.asarray(values, dtype=object))
+    ]
+    return mapped
+
+
+def normalize_names(names: Any) -> np.ndarray:
+    """``normalize_name`` for a whole column."""
+    values = np.asarray(names, dtype=object)
+    normalized = np.full(len(values), "", dtype=object)
+    present = values.astype(bool)
+    normalized[present] = map_unique(_normalize_name_text, values[present])
+    return normalized
+
+
+def generic_site_mask(urls: Any) -> np.ndarray:
+    """``is_generic_site`` for a whole column."""
+    return map_unique(is_generic_site, urls).astype(bool)
+
+
+def _validate_phone_text(phone: str) -> str:
+    cleaned = PHONE_STRIP_REGEX.sub("", phone)
+    if 10 <= len(cleaned) <= 15:
+        return phone
+    return ""
+
+
+def validate_phones(phones: pd.Series) -> pd.Series:
+    """Blank out phone numbers that are too short or too long to be real."""
+    if phones.empty:
+        return phones.copy()
+    values = phones.to_numpy(dtype=object)
+    # Missing and empty values pass through as str(value), like the old per-row check
+    keep = pd.isna(values) | (values == "")
+    validated = np.empty(len(values), dtype=object)
+    validated[keep] = [str(value) for value in values[keep]]
+    validated[~keep] = map_unique(_validate_phone_text, values[~keep])
+    return pd.Series(validated, index=phones.index).infer_objects()
+
+
+# Calling code, national trunk prefix and allowed national number lengths
+PHONE_COUNTRIES = {
+    "BD": ("880", "0", (8, 10)),
+    "US": ("1", "1", (10, 10)),
+    "CA": ("1", "1", (10, 10)),
+    "GB": ("44", "0", (9, 10)),
+    "IN": ("91", "0", (10, 10)),
+    "PK": ("92", "0", (9, 10)),
+    "AE": ("971", "0", (8, 9)),
+    "SA": ("966", "0", (8, 9)),
+    "MY": ("60", "0", (8, 10)),
+    "SG": ("65", "", (8, 8)),
+    "AU": ("61", "0", (9, 9)),
+}
+_COUNTRY_BY_CODE = {code: country for country, (code, _, _) in reversed(PHONE_COUNTRIES.items())}
+
+LOCATION_COUNTRIES = {
+    "bangladesh": "BD", "dhaka": "BD", "chittagong": "BD", "chattogram": "BD",
+    "sylhet": "BD", "khulna": "BD", "rajshahi": "BD", "barisal": "BD",
+    "rangpur": "BD", "mymensingh": "BD", "comilla": "BD", "gazipur": "BD",
+    "narayanganj": "BD", "chuadanga": "BD", "cox's bazar": "BD", "bogra": "BD",
+    "usa": "US", "united states": "US", "new york": "US", "brooklyn": "US",
+    "manhattan": "US", "los angeles": "US", "chicago": "US", "houston": "US",
+    "new jersey": "US", "california": "US", "texas": "US", "florida": "US",
+    "canada": "CA", "toronto": "CA", "vancouver": "CA", "montreal": "CA",
+    "united kingdom": "GB", "uk": "GB", "london": "GB", "manchester": "GB",
+    "india": "IN", "kolkata": "IN", "delhi": "IN", "mumbai": "IN", "bangalore": "IN",
+    "pakistan": "PK", "karachi": "PK", "lahore": "PK",
+    "dubai": "AE", "abu dhabi": "AE", "uae": "AE",
+    "saudi": "SA", "riyadh": "SA", "jeddah": "SA",
+    "malaysia": "MY", "kuala lumpur": "MY", "singapore": "SG",
+    "australia": "AU", "sydney": "AU", "melbourne": "AU",
+}
+_LOCATION_REGEX = re.compile(
+    r"\b(" + "|".join(re.escape(place) for place in sorted(LOCATION_COUNTRIES, key=len, reverse=True)) + r")\b"
+)
+
+
+def country_for_location(location: str) -> str | None:
+    """Guess the phone country for a search location like "restaurants in Dhaka"."""
+    match = _LOCATION_REGEX.search(str(location).lower())
+    return LOCATION_COUNTRIES[match.group(1)] if match else None
+
+
+def _guess_country(digits: str) -> str | None:
+    if len(digits) == 11 and digits.startswith("01") or len(digits) == 13 and digits.startswith("8801"):
+        return "BD"
+    if len(digits) == 10 and digits[0] not in "01":
+        return "US"
+    if len(digits) == 11 and digits.startswith("1"):
+        return "US"
+    return None
+
+
+def _national_number(digits: str, country: str) -> str | None:
+    code, trunk, (shortest, longest) = PHONE_COUNTRIES[country]
+    for prefix in (code + trunk, code, trunk) if trunk else (code,):
+        if digits.startswith(prefix) and shortest <= len(digits) - len(prefix) <= longest:
+            return digits[len(prefix):]
+    if shortest <= len(digits) <= longest:
+        return digits
+    return None
+
+
+@lru_cache(maxsize=65536)
+def canonical_phone(raw: str, default_country: str | None = None) -> str:
+    """E.164 form (``+8801711222333``) of a scraped phone number, or "" if it isn't one.
+
+    Numbers written without a country code are read as ``default_country``
+    numbers, or guessed from their shape when it is None (11 digits starting
+    with 01 is Bangladeshi, 10 digits is North American).
+    """
+    text = raw.translate(UNICODE_DIGITS).strip()
+    if text.endswith(".0") and text[:-2].isdigit():  # numeric Excel cell
+        text = text[:-2]
+    digits = "".join(str(unicodedata.decimal(ch)) for ch in text if ch.isdecimal())
+    if not digits:
+        return ""
+
+    lead_in = text[: next(i for i, ch in enumerate(text) if ch.isdecimal())]
+    if "+" in lead_in or digits.startswith("00"):
+        digits = digits.removeprefix("00")
+        for length in (1, 2, 3):
+            country = _COUNTRY_BY_CODE.get(digits[:length])
+            if country is not None:
+                national = _national_number(digits, country)
+                return f"+{digits[:length]}{national}" if national else ""
+        return f"+{digits}" if 8 <= len(digits) <= 15 else ""
+
+    country = default_country or _guess_country(digits)
+    if country not in PHONE_COUNTRIES:
+        return ""
+    national = _national_number(digits, country)
+    return f"+{PHONE_COUNTRIES[country][0]}{national}" if national else ""
+
+
+def canonical_phones(phones: Any, default_country: str | None = None) -> np.ndarray:
+    """``canonical_phone`` for a whole column; missing values give ""."""
+    values = np.asarray(phones, dtype=object)
+    canonical = np.full(len(values), "", dtype=object)
+    present = ~pd.isna(values)
+    canonical[present] = map_unique(lambda p: canonical_phone(p, default_country), values[present])
+    return canonical
+
+
+def _text(value: Any) -> str:
+    if value is None or value != value:  # None or NaN
+        return ""
+    return str(value)
+
+
+def info_score(lead: dict[str, Any]) -> int:
+    """Count how many contact fields a lead has filled in."""
+    return sum(
+        1 for field in ("Phone Number", "Website", "Email") if _text(lead.get(field))
+    )
+
+
+def dedup_keys(lead: dict[str, Any], default_country: str | None = None) -> list[str]:
+    """Keys two leads must share to count as the same business."""
+    keys = []
+    place = _text(lead.get("Place ID"))
+    if place:
+        keys.append(f"place:{place}")
+    email = _text(lead.get("Email"))
+    if email:
+        keys.append(f"email:{email}")
+    website = _text(lead.get("Website"))
+    if website and not is_generic_site(website):
+        keys.append(f"site:{website}")
+    phone = canonical_phone(_text(lead.get("Phone Number")), default_country)
+    if phone:
+        keys.append(f"phone:{phone}")
+    name = normalize_name(_text(lead.get("Business Name")))
+    if name:
+        keys.append(f"name:{name}")
+    return keys
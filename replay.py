@@ -0,0 +1,300 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import urllib.parse
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Query parameters Google adds per visit that don't change the page we get back
+VOLATILE_PARAMS = {
+    "authuser", "ei", "gs_lcrp", "gs_lp", "ie", "oq", "sa", "sca_esv", "sca_upv",
+    "sclient", "source", "sourceid", "sxsrf", "uact", "ved",
+}
+
+
+def snapshot_key(url: str) -> str:
+    """Key a URL by host, path and the query parameters that select content."""
+    parts = urllib.parse.urlsplit(url)
+    host = parts.netloc.lower().removeprefix("www.")
+    query = sorted(
+        (name, value)
+        for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if name not in VOLATILE_PARAMS
+    )
+    path = urllib.parse.unquote_plus(parts.path).rstrip("/") or "/"
+    return f"{host}{path}?{urllib.parse.urlencode(query)}" if query else f"{host}{path}"
+
+
+@dataclass
+class Snapshot:
+    """One recorded response."""
+
+    url: str
+    body: bytes
+    status: int = 200
+    content_type: str = "text/html; charset=utf-8"
+
+
+class SnapshotStore:
+    """Recorded responses, looked up by ``snapshot_key``.
+
+    Saved as a directory of body files plus an ``index.json``; HAR files
+    exported from DevTools or Playwright can be loaded as well.
+    """
+
+    def __init__(self) -> None:
+        self._snapshots: dict[str, Snapshot] = {}
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def add(
+        self,
+        url: str,
+        body: bytes | str,
+        status: int = 200,
+        content_type: str = "text/html; charset=utf-8",
+    ) -> None:
+        """Record ``body`` as the response for ``url``, replacing any earlier one."""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self._snapshots[snapshot_key(url)] = Snapshot(url, body, status, content_type)
+
+    def lookup(self, url: str) -> Snapshot | None:
+        return self._snapshots.get(snapshot_key(url))
+
+    @classmethod
+    def load(cls, path: str) -> "SnapshotStore":
+        """Read a snapshot directory, or a ``.har`` file."""
+        if path.lower().endswith(".har"):
+            return cls.from_har(path)
+        store = cls()
+        with open(os.path.join(path, "index.json"), encoding="utf-8") as f:
+            entries = json.load(f)["entries"]
+        for entry in entries:
+            with open(os.path.join(path, entry["file"]), "rb") as f:
+                store.add(entry["url"], f.read(), entry["status"], entry["content_type"])
+        return store
+
+    @classmethod
+    def from_har(cls, path: str) -> "SnapshotStore":
+        """Read every response with a body from a HAR file; later entries win."""
+        with open(path, encoding="utf-8") as f:
+            har = json.load(f)
+        store = cls()
+        for entry in har["log"]["entries"]:
+            content = entry["response"].get("content", {})
+            text = content.get("text")
+            if text is None:
+                continue
+            body = (
+                base64.b64decode(text)
+                if content.get("encoding") == "base64"
+                else text.encode("utf-8")
+            )
+            store.add(
+                entry["request"]["url"],
+                body,
+                entry["response"]["status"],
+                content.get("mimeType") or "application/octet-stream",
+            )
+        return store
+
+    def save(self, path: str) -> None:
+        """Write the store as a snapshot directory that ``load`` can read back."""
+        os.makedirs(path, exist_ok=True)
+        entries = []
+        for key, snapshot in sorted(self._snapshots.items()):
+            extension = ".html" if "html" in snapshot.content_type else ".bin"
+            file_name = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16] + extension
+            with open(os.path.join(path, file_name), "wb") as f:
+                f.write(snapshot.body)
+            entries.append(
+                {
+                    "url": snapshot.url,
+                    "status": snapshot.status,
+                    "content_type": snapshot.content_type,
+                    "file": file_name,
+                }
+            )
+        with open(os.path.join(path, "index.json"), "w", encoding="utf-8") as f:
+            json.dump({"entries": entries}, f, ensure_ascii=False, indent=1)
+
+
+class ReplayServer:
+    """Local HTTP stand-in for Google that serves a SnapshotStore.
+
+    The original URL is passed in the ``url`` query parameter of
+    ``/replay``; anything that was never recorded gets an empty 404.
+    """
+
+    def __init__(self, store: SnapshotStore, host: str = "127.0.0.1", port: int = 0):
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.missed_urls: list[str] = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def replay_url(self, url: str) -> str:
+        """Where the server answers for the original ``url``."""
+        return f"{self.url}/replay?{urllib.parse.urlencode({'url': url})}"
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "ReplayServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _record(self, url: str, found: bool) -> None:
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+                if len(self.missed_urls) < 50:
+                    self.missed_urls.append(url)
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _serve(self, send_body: bool = True) -> None:
+                query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+                url = query.get("url", [""])[0]
+                snapshot = server.store.lookup(url) if url else None
+                server._record(url, snapshot is not None)
+                # Drain POST bodies so keep-alive connections stay in sync
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                if snapshot is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(snapshot.status)
+                self.send_header("Content-Type", snapshot.content_type)
+                self.send_header("Content-Length", str(len(snapshot.body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(snapshot.body)
+
+            def do_GET(self) -> None:
+                self._serve()
+
+            def do_POST(self) -> None:
+                self._serve()
+
+            def do_HEAD(self) -> None:
+                self._serve(send_body=False)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+class ReplayRouter:
+    """Route handler that answers every request of a context from a ReplayServer.
+
+    Pages keep their real google.com URLs, so the scrapers' selectors and
+    URL handling run exactly as they do live.
+    """
+
+    def __init__(self, store: SnapshotStore):
+        self.server = ReplayServer(store)
+
+    async def attach(self, context: Any) -> None:
+        """Route every request of ``context`` to the replay server."""
+        self.server.start()
+        await context.route("**/*", self._handle_route)
+
+    async def _handle_route(self, route: Any) -> None:
+        request = route.request
+        try:
+            response = await route.fetch(
+                url=self.server.replay_url(request.url), max_redirects=0
+            )
+            await route.fulfill(response=response)
+        except Exception:
+            logger.debug(f"Replay failed for {request.url[:80]}")
+            try:
+                await route.abort()
+            except Exception:
+                pass
+
+    def summary(self) -> dict[str, Any]:
+        """Return the hit/miss counters collected so far."""
+        return {
+            "hits": self.server.hits,
+            "misses": self.server.misses,
+            "missed_urls": list(self.server.missed_urls),
+        }
+
+    def close(self) -> None:
+        self.server.close()
+
+
+class SnapshotRecorder:
+    """Saves the pages and data requests of a live run as replay fixtures.
+
+    Images, fonts, scripts and other subresources are left out: the scrapers
+    only read the DOM, and leaving them out keeps fixture sets small.
+    """
+
+    RESOURCE_TYPES = ("document", "xhr", "fetch")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.store = SnapshotStore()
+        if os.path.exists(os.path.join(path, "index.json")):
+            self.store = SnapshotStore.load(path)
+
+    def attach(self, context: Any) -> None:
+        """Record responses from every page of ``context``."""
+        context.on("response", self._on_response)
+
+    async def _on_response(self, response: Any) -> None:
+        if response.request.resource_type not in self.RESOURCE_TYPES:
+            return
+        if not 200 <= response.status < 300:
+            return
+        try:
+            body = await response.body()
+        except Exception:
+            logger.debug(f"No body to record for {response.url[:80]}")
+            return
+        content_type = response.headers.get("content-type", "application/octet-stream")
+        self.store.add(response.url, body, response.status, content_type)
+
+    def save(self) -> None:
+        """Write everything recorded so far to ``path``."""
+        self.store.save(self.path)
+        logger.info(f"Recorded {len(self.store)} responses to {self.path}")
@@ -0,0 +1,346 @@
+import copy
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from typing import Any
+
+from normalization import dedup_keys, info_score
+
+logger = logging.getLogger(__name__)
+
+
+class DetailCache:
+    """SQLite cache of scraped listing details keyed by Maps place ID (see place_id)."""
+
+    table = "listing_details"
+
+    def __init__(self, path: str = "listing_cache.sqlite", ttl_hours: float = 168.0):
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                key TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        columns = [row[1] for row in self._conn.execute(f"PRAGMA table_info({self.table})")]
+        if "place_key" in columns:
+            # Caches written when entries were keyed by place URL
+            self._conn.execute(f"ALTER TABLE {self.table} RENAME COLUMN place_key TO key")
+        self._conn.commit()
+
+    def get(self, key: str) -> dict[str, str] | None:
+        """Return cached details for ``key`` if they are still fresh."""
+        row = self._conn.execute(
+            f"SELECT data, fetched_at FROM {self.table} WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        data, fetched_at = row
+        if time.time() - fetched_at > self.ttl_seconds:
+            self.expired += 1
+            return None
+        self.hits += 1
+        return json.loads(data)
+
+    def put(self, key: str, business_data: dict[str, str]) -> None:
+        """Store ``business_data`` for ``key``, replacing any older entry."""
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, data, fetched_at) VALUES (?, ?, ?)",
+            (key, json.dumps(business_data, ensure_ascii=False), time.time()),
+        )
+        self._conn.commit()
+
+    def summary(self) -> dict[str, Any]:
+        """Return the hit/miss/expired counters for this run."""
+        return {"hits": self.hits, "misses": self.misses, "expired": self.expired}
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class SiteCache(DetailCache):
+    """What website enrichment found on each site, keyed by enrichment.site_key.
+
+    Kept in its own table with its own TTL, so site entries don't count
+    towards the listing cache's hits and misses.
+    """
+
+    table = "site_findings"
+
+    def __init__(self, path: str = "listing_cache.sqlite", ttl_hours: float = 720.0):
+        super().__init__(path, ttl_hours)
+
+
+class LeadStore:
+    """Append-only SQLite store that every lead is written to as it is found.
+
+    A key index (Maps place ID, email, non-generic website, E.164 phone,
+    normalized name) is updated on each insert, so the current deduplicated
+    set can be read back without reprocessing the whole history. Phones
+    without a country code are read as ``default_country`` numbers.
+    """
+
+    def __init__(self, path: str = "leads.sqlite", default_country: str | None = None):
+        self.path = path
+        self.default_country = default_country
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS leads (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                data TEXT NOT NULL,
+                query TEXT NOT NULL DEFAULT '',
+                created_at REAL NOT NULL,
+                info_score INTEGER NOT NULL,
+                is_current INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS leads_current ON leads (is_current);
+            CREATE TABLE IF NOT EXISTS lead_keys (
+                key TEXT PRIMARY KEY,
+                lead_id INTEGER NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def for_country(self, default_country: str | None) -> "LeadStore":
+        """This store, reading phones without a country code as ``default_country`` numbers.
+
+        The view shares the store's connection, so only the store itself is closed.
+        """
+        if default_country == self.default_country:
+            return self
+        view = copy.copy(self)
+        view.default_country = default_country
+        return view
+
+    def add(self, lead: dict[str, Any], query: str = "", commit: bool = True) -> bool:
+        """Append ``lead`` and return True if it is now the best copy of its business."""
+        return self._append(lead, query, commit, replace_ties=False)
+
+    def update(self, lead: dict[str, Any], query: str = "") -> bool:
+        """Append a more complete copy of a stored lead, such as an enriched one.
+
+        Unlike ``add``, a tie on info_score goes to this copy: it carries fields
+        the score doesn't count (social profiles), which would otherwise stay
+        out of ``current_records``.
+        """
+        return self._append(lead, query, commit=True, replace_ties=True)
+
+    def _append(self, lead: dict[str, Any], query: str, commit: bool, replace_ties: bool) -> bool:
+        keys = dedup_keys(lead, self.default_country)
+        score = info_score(lead)
+
+        matches: dict[int, int] = {}
+        if keys:
+            placeholders = ",".join("?" * len(keys))
+            for lead_id, match_score in self._conn.execute(
+                "SELECT l.id, l.info_score FROM lead_keys k "
+                f"JOIN leads l ON l.id = k.lead_id WHERE k.key IN ({placeholders})",
+                keys,
+            ):
+                matches[lead_id] = match_score
+
+        cursor = self._conn.execute(
+            "INSERT INTO leads (data, query, created_at, info_score) VALUES (?, ?, ?, ?)",
+            (json.dumps(lead, ensure_ascii=False, default=str), query, time.time(), score),
+        )
+        new_id = cursor.lastrowid
+
+        # Ties go to the lead we already had, like keep="first" in a batch dedup
+        best_id = max(matches, key=lambda i: (matches[i], -i)) if matches else None
+        is_winner = (
+            best_id is None
+            or score > matches[best_id]
+            or (replace_ties and score == matches[best_id])
+        )
+        winner_id = new_id if is_winner else best_id
+
+        if is_winner:
+            self._conn.execute("UPDATE leads SET is_current = 1 WHERE id = ?", (new_id,))
+            self._conn.executemany(
+                "UPDATE leads SET is_current = 0 WHERE id = ?",
+                [(lead_id,) for lead_id in matches],
+            )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO lead_keys (key, lead_id) VALUES (?, ?)",
+            [(key, winner_id) for key in keys],
+        )
+        if commit:
+            self._conn.commit()
+        return is_winner
+
+    def add_many(self, leads: list[dict[str, Any]], query: str = "") -> int:
+        """Append several leads in one transaction and return how many became current."""
+        current = sum(self.add(lead, query, commit=False) for lead in leads)
+        self._conn.commit()
+        return current
+
+    def count(self, current_only: bool = False) -> int:
+        sql = "SELECT COUNT(*) FROM leads"
+        if current_only:
+            sql += " WHERE is_current = 1"
+        return self._conn.execute(sql).fetchone()[0]
+
+    def current_records(self) -> list[dict[str, Any]]:
+        """Return the best copy of every business, oldest first."""
+        return [
+            json.loads(data)
+            for (data,) in self._conn.execute(
+                "SELECT data FROM leads WHERE is_current = 1 ORDER BY id"
+            )
+        ]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class CheckpointStore:
+    """SQLite table of in-progress scraper state, keyed by search job."""
+
+    def __init__(self, path: str = "leads.sqlite"):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                job_key TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                completed INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def load(self, job_key: str) -> tuple[dict[str, Any], bool] | None:
+        """Return ``(state, completed)`` for ``job_key``, or None if it never ran."""
+        row = self._conn.execute(
+            "SELECT state, completed FROM checkpoints WHERE job_key = ?", (job_key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), bool(row[1])
+
+    def save(self, job_key: str, state: dict[str, Any], completed: bool = False) -> None:
+        """Overwrite the checkpoint for ``job_key``."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO checkpoints (job_key, state, completed, updated_at) "
+            "VALUES (?, ?, ?, ?)",
+            (job_key, json.dumps(state, ensure_ascii=False), int(completed), time.time()),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class PlaceIndex:
+    """Persistent set of the Maps place IDs already scraped into the lead store.
+
+    Lookups go through an in-memory Bloom filter first, so the usual "never
+    seen" answer costs a few bit probes and no query; only possible hits are
+    confirmed in SQLite. The filter is rebuilt from the table on open, and
+    rebuilt twice as large whenever it fills up.
+    """
+
+    BITS_PER_PLACE = 10
+    HASHES = 7
+
+    def __init__(self, path: str = "leads.sqlite"):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.false_positives = 0
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS known_places (
+                place_id TEXT PRIMARY KEY,
+                query TEXT NOT NULL DEFAULT '',
+                seen_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM known_places").fetchone()[0]
+        self._rebuild(max(1024, self._count * 2))
+
+    def _positions(self, place_id: str) -> list[int]:
+        # Double hashing: k probe positions from one 128-bit digest
+        digest = hashlib.blake2b(place_id.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self._size for i in range(self.HASHES)]
+
+    def _set(self, place_id: str) -> None:
+        for position in self._positions(place_id):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def _rebuild(self, capacity: int) -> None:
+        self._capacity = capacity
+        self._size = capacity * self.BITS_PER_PLACE
+        self._bits = bytearray((self._size + 7) // 8)
+        for (place_id,) in self._conn.execute("SELECT place_id FROM known_places"):
+            self._set(place_id)
+
+    def __contains__(self, place_id: object) -> bool:
+        if not isinstance(place_id, str):
+            return False
+        if not all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(place_id)
+        ):
+            self.misses += 1
+            return False
+        row = self._conn.execute(
+            "SELECT 1 FROM known_places WHERE place_id = ?", (place_id,)
+        ).fetchone()
+        if row is None:
+            self.false_positives += 1
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, place_id: str, query: str = "") -> None:
+        """Remember ``place_id`` as scraped."""
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO known_places (place_id, query, seen_at) VALUES (?, ?, ?)",
+            (place_id, query, time.time()),
+        )
+        self._conn.commit()
+        if not cursor.rowcount:
+            return
+        self._count += 1
+        if self._count > self._capacity:
+            self._rebuild(self._capacity * 2)
+        else:
+            self._set(place_id)
+
+    def summary(self) -> dict[str, int]:
+        """Return the index size and this run's lookup counters."""
+        return {
+            "known": self._count,
+            "hits": self.hits,
+            "misses": self.misses,
+            "false_positives": self.false_positives,
+        }
+
+    def close(self) -> None:
+        self._conn.close()
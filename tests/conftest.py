@@ -0,0 +1,24 @@
+import os
+import sys
+from typing import Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+def lead(
+    name: str = "Star Kabab",
+    phone: str = "",
+    website: str = "",
+    email: str = "",
+    address: str = "",
+    **extra: Any,
+) -> dict[str, Any]:
+    """A lead row with every export column, plus any ``extra`` fields."""
+    return {
+        "Business Name": name,
+        "Phone Number": phone,
+        "Website": website,
+        "Address": address,
+        "Email": email,
+        **extra,
+    }
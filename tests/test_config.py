@@ -0,0 +1,18 @@
+from config import SearchConfig
+from lead_scraper import SEARCH_CONFIG, config_overrides, parse_args
+
+
+def test_search_config_starts_from_the_dataclass_defaults():
+    assert SEARCH_CONFIG.keys() == SearchConfig().to_dict().keys()
+
+
+def test_from_dict_ignores_unknown_fields():
+    job = SearchConfig.from_dict({"keywords": "dentists", "wait_timeout_ms": 2000, "note": "x"})
+    assert job.keywords == "dentists"
+    assert job.wait_timeout_ms == 2000
+    assert SearchConfig.from_dict(job.to_dict()) == job
+
+
+def test_only_given_flags_override_the_config():
+    args = parse_args(["--wait-timeout-ms", "5000", "--min-jitter", "0"])
+    assert config_overrides(args) == {"wait_timeout_ms": 5000, "min_jitter": 0.0}
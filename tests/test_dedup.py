@@ -0,0 +1,93 @@
+import csv
+import json
+
+import pandas as pd
+
+from conftest import lead
+from dedup import KeyIndex, dedup_archive, merge_near_duplicates
+
+
+def test_key_index_follows_the_lead_store_winner_rule():
+    index = KeyIndex()
+    assert index.add(["email:a@x.com"], 1)
+    # Ties keep the first copy
+    assert not index.add(["email:a@x.com"], 1)
+    assert index.add(["email:a@x.com", "phone:+8801711222333"], 2)
+    assert not index.add(["phone:+8801711222333"], 1)
+    assert index.add(["name:other"], 0)
+    assert list(index.current) == [0, 0, 1, 0, 1]
+    assert len(index) == 5
+    assert index.key_count == 3
+
+
+def test_dedup_archive_keeps_the_best_copy_in_order(tmp_path):
+    source = tmp_path / "leads.jsonl"
+    rows = [
+        lead("Star Kabab", phone="01711222333"),
+        lead("Green Dental", website="https://greendental.com"),
+        lead("Star Kabab", phone="+880 1711-222333", email="info@starkabab.com"),
+        lead("No Contact"),
+        lead("Green Dental Care", website="https://greendental.com"),
+    ]
+    source.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    output = tmp_path / "deduped.csv"
+
+    stats = dedup_archive(str(source), str(output), chunk_size=2, default_country="BD")
+
+    with open(output, newline="") as f:
+        written = list(csv.DictReader(f))
+    assert [row["Business Name"] for row in written] == ["Green Dental", "Star Kabab"]
+    assert written[1]["Email"] == "info@starkabab.com"
+    assert stats["rows"] == 5
+    # The contactless lead wins its own key but is dropped on the way out
+    assert stats["unique"] == 3
+    assert stats["written"] == 2
+
+
+def test_dedup_archive_writes_jsonl(tmp_path):
+    source = tmp_path / "leads.csv"
+    pd.DataFrame([lead("A", email="a@x.com"), lead("A", email="a@x.com")]).to_csv(source, index=False)
+    output = tmp_path / "deduped.jsonl"
+    dedup_archive(str(source), str(output))
+    assert [json.loads(line)["Email"] for line in output.read_text().splitlines()] == ["a@x.com"]
+
+
+def test_merge_near_duplicates_merges_branch_variants():
+    df = pd.DataFrame(
+        [
+            lead("Star Kabab & Restaurant", phone="01711222333"),
+            lead("Green Dental Care", website="https://greendental.com"),
+            lead("Star Kabab Restaurant Dhanmondi", email="info@starkabab.com"),
+        ]
+    )
+    merged, stats = merge_near_duplicates(df, threshold=0.65)
+    assert stats["merged"] == 1
+    assert merged["Business Name"].tolist() == ["Star Kabab & Restaurant", "Green Dental Care"]
+    # The kept row takes the fields only the merged copy had
+    assert merged.iloc[0]["Email"] == "info@starkabab.com"
+
+
+def test_merge_near_duplicates_keeps_numbered_branches_apart():
+    df = pd.DataFrame([lead("Dine One 1", phone="01711222333"), lead("Dine One 2", phone="01811222333")])
+    merged, stats = merge_near_duplicates(df, threshold=0.3)
+    assert stats["merged"] == 0
+    assert len(merged) == 2
+
+
+def test_merge_near_duplicates_lowers_the_bar_for_a_shared_phone():
+    df = pd.DataFrame(
+        [
+            lead("Rahman Pharmacy", phone="01711222333"),
+            lead("Rahman Medical Hall", phone="+880 1711-222333"),
+        ]
+    )
+    _, strict = merge_near_duplicates(df, threshold=0.99, contact_threshold=0.99, default_country="BD")
+    _, shared = merge_near_duplicates(df, threshold=0.99, contact_threshold=0.2, default_country="BD")
+    assert strict["merged"] == 0
+    assert shared["merged"] == 1
+
+
+def test_merge_near_duplicates_skips_oversized_blocks():
+    df = pd.DataFrame([lead(f"Shop {chr(65 + i)}", phone="01711222333") for i in range(4)])
+    _, stats = merge_near_duplicates(df, max_block_size=3, default_country="BD")
+    assert stats["skipped_blocks"] >= 1
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from fetcher import TieredFetcher, escalation_reason
+
+ARTICLE = "<html><body><main>" + "Call us on 01711-222333 for bookings. " * 20 + "</main></body></html>"
+
+
+def test_plain_page_needs_no_browser():
+    assert escalation_reason(200, ARTICLE) is None
+
+
+def test_challenge_statuses():
+    for status in (403, 429, 503):
+        assert escalation_reason(status, ARTICLE) == "challenge"
+
+
+def test_javascript_notice():
+    html = "<html><body><noscript>Please enable JavaScript to continue.</noscript></body></html>"
+    assert escalation_reason(200, html) == "js_required"
+
+
+def test_empty_app_shell():
+    html = '<html><body><div id="__next"></div><script src="/app.js"></script></body></html>'
+    assert escalation_reason(200, html) == "app_shell"
+
+
+def test_script_page_with_little_text():
+    html = "<html><body><h1>Loading</h1><script>render()</script></body></html>"
+    assert escalation_reason(200, html) == "js_gated"
+    assert escalation_reason(200, html, min_text_chars=5) is None
+
+
+def test_little_text_without_scripts_is_kept():
+    assert escalation_reason(200, "<html><body><p>Closed for Eid.</p></body></html>") is None
+
+
+class FakeResponse:
+    def __init__(self, url, status, html):
+        self.url = url
+        self.status = status
+        self.headers = {"content-type": "text/html"}
+        self._html = html
+
+    async def text(self):
+        return self._html
+
+    async def dispose(self):
+        pass
+
+
+class FakeClient:
+    def __init__(self, pages):
+        self.pages = pages
+
+    async def get(self, url, **kwargs):
+        status, html = self.pages[url]
+        return FakeResponse(url, status, html)
+
+
+def fetcher_for(pages, browser_pages=None):
+    async def browser_fetch(url):
+        return (browser_pages or {}).get(url)
+
+    fetcher = TieredFetcher(browser_fetch)
+    fetcher._client = FakeClient(pages)
+    return fetcher
+
+
+def test_unstarted_fetcher_raises():
+    with pytest.raises(RuntimeError, match="start"):
+        asyncio.run(TieredFetcher().fetch("https://example.com"))
+
+
+def test_static_pages_never_reach_the_browser():
+    fetcher = fetcher_for({"https://a.com": (200, ARTICLE)})
+    result = asyncio.run(fetcher.fetch("https://a.com"))
+    assert result.tier == "http"
+    assert fetcher.counts["browser"] == 0 and fetcher.counts["served_http"] == 1
+
+
+def test_app_shells_are_rendered_in_the_browser():
+    shell = '<html><body><div id="root"></div><script src="/app.js"></script></body></html>'
+    fetcher = fetcher_for({"https://a.com": (200, shell)}, {"https://a.com": ARTICLE})
+    result = asyncio.run(fetcher.fetch("https://a.com"))
+    assert result.tier == "browser" and result.html == ARTICLE
+    assert fetcher.counts["escalated"] == 1
+
+
+def test_real_errors_are_not_escalated():
+    fetcher = fetcher_for({"https://a.com/gone": (404, "<html>Not found</html>")})
+    assert asyncio.run(fetcher.fetch("https://a.com/gone")) is None
+    assert fetcher.counts["failed"] == 1 and fetcher.counts["browser"] == 0
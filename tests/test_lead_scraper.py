@@ -0,0 +1,163 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from config import SearchConfig
+from lead_scraper import (
+    DEFAULT_GEOLOCATION,
+    DORK_EMAIL_DOMAINS,
+    BrowserPool,
+    _listing_detail_worker,
+    _PooledContext,
+    _watch_workers,
+    job_phone_country,
+    place_id,
+    plan_dork_shards,
+)
+
+
+class ClosedPage:
+    def is_closed(self):
+        return True
+
+
+class BrokenCollector:
+    def __init__(self):
+        self.done = asyncio.Event()
+
+    def add(self, index, business_data, href):
+        raise ValueError("collector failed")
+
+
+def test_failed_workers_surface_instead_of_hanging_the_join():
+    async def run():
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        workers = [
+            asyncio.create_task(_listing_detail_worker(queue, ClosedPage(), BrokenCollector()))
+            for _ in range(2)
+        ]
+
+        async def produce():
+            for index in range(5):
+                await queue.put((index, {"href": f"/maps/place/{index}"}))
+
+        try:
+            await asyncio.wait_for(_watch_workers(produce(), workers), timeout=5)
+            await asyncio.wait_for(_watch_workers(queue.join(), workers), timeout=5)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    with pytest.raises(ValueError, match="collector failed"):
+        asyncio.run(run())
+
+
+def test_watch_workers_returns_the_result_while_workers_run():
+    async def run():
+        worker = asyncio.create_task(asyncio.sleep(60))
+        try:
+            return await _watch_workers(asyncio.sleep(0, result="stats"), [worker])
+        finally:
+            worker.cancel()
+
+    assert asyncio.run(run()) == "stats"
+
+
+def test_job_phone_country():
+    assert job_phone_country(SearchConfig(keywords="dentists", location="Dhaka")) == "BD"
+    assert job_phone_country(SearchConfig(location="Dhaka", phone_country="US")) == "US"
+    # Dork jobs have no location, so the query names the place
+    dork = SearchConfig(search_type="dork", keywords='"real estate" "@gmail.com" intext:dhaka')
+    assert job_phone_country(dork) == "BD"
+    sharded = SearchConfig(search_type="dork", keywords='"dentist"', dork_locations="london|manchester")
+    assert job_phone_country(sharded) == "GB"
+    assert job_phone_country(SearchConfig(keywords="dentists")) is None
+
+
+def test_shards_per_location_and_site():
+    shards = plan_dork_shards(
+        '"real estate" intext:dhaka', locations="dhaka|chittagong", sites="facebook.com", target="phone"
+    )
+    assert shards == [
+        '"real estate" intext:dhaka site:facebook.com',
+        '"real estate" intext:chittagong site:facebook.com',
+    ]
+
+
+def test_email_dorks_split_across_domains():
+    shards = plan_dork_shards('"real estate"', max_shards=50)
+    assert shards == [f'"real estate" "{domain}"' for domain in DORK_EMAIL_DOMAINS]
+
+
+def test_email_dork_with_its_own_domain_is_not_split():
+    assert plan_dork_shards('"real estate" "@gmail.com"') == ['"real estate" "@gmail.com"']
+
+
+def test_quoted_multiword_locations_and_cap():
+    shards = plan_dork_shards(
+        "dentists", locations=["cox's bazar", "new york"], email_domains="@gmail.com|yahoo.com", max_shards=3
+    )
+    # Locations vary fastest, so the cap trims email domains before locations
+    assert shards == [
+        'dentists intext:"cox\'s bazar" "@gmail.com"',
+        'dentists intext:"new york" "@gmail.com"',
+        'dentists intext:"cox\'s bazar" "@yahoo.com"',
+    ]
+
+
+@pytest.mark.parametrize(
+    "href, expected",
+    [
+        (
+            "https://www.google.com/maps/place/Star+Kabab/@23.74,90.37,17z/data=!4m7!3m6!1s0x3755B8:0x1A2B!8m2",
+            "0x3755b8:0x1a2b",
+        ),
+        ("/maps/place/Star+Kabab/data=!4m2!19sChIJAbC-d_xYz?authuser=0", "ChIJAbC-d_xYz"),
+    ],
+)
+def test_place_id_from_the_href(href, expected):
+    assert place_id(href) == expected
+
+
+def test_place_ids_keep_their_case():
+    assert place_id("/maps/place/A/data=!19sChIJabc") != place_id("/maps/place/A/data=!19sChIJABC")
+
+
+def test_place_id_fallback_ignores_viewport_and_query():
+    first = place_id("https://www.google.com/maps/place/Star+Kabab/@23.74,90.37,17z?hl=en")
+    second = place_id("https://www.google.com/maps/place/Star+Kabab/@23.70,90.40,15z")
+    assert first == second == "https://www.google.com/maps/place/Star+Kabab"
+
+
+class FakeContext:
+    def __init__(self):
+        self.geolocations = []
+        self.pages = []
+
+    async def set_geolocation(self, geolocation):
+        self.geolocations.append(geolocation)
+
+    async def new_page(self):
+        return SimpleNamespace(context=self)
+
+
+def test_pool_applies_geolocation_per_lease():
+    async def run():
+        pool = BrowserPool()
+        pool._browser = object()
+        entry = _PooledContext()
+        entry.context = FakeContext()
+        pool._idle.put_nowait(entry)
+
+        tile = {"latitude": 1.0, "longitude": 2.0}
+        page = await pool.acquire(use_stealth=False, geolocation=tile)
+        await pool.release(page)
+        page = await pool.acquire(use_stealth=False)
+        await pool.release(page)
+        return entry.context.geolocations
+
+    assert asyncio.run(run()) == [
+        {"latitude": 1.0, "longitude": 2.0},
+        DEFAULT_GEOLOCATION,
+    ]
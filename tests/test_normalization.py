@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from normalization import canonical_phone, canonical_phones, country_for_location
+
+
+@pytest.mark.parametrize(
+    "raw",
+    ["+880 1711-222333", "01711222333", "8801711222333", "00880 1711 222333", "০১৭১১২২২৩৩৩"],
+)
+def test_bangladeshi_formats_agree(raw):
+    assert canonical_phone(raw, "BD") == "+8801711222333"
+
+
+def test_trunk_zero_after_country_code_is_dropped():
+    assert canonical_phone("+880 01711-222333") == "+8801711222333"
+    assert canonical_phone("+44 (0)20 7946 0018") == "+442079460018"
+
+
+def test_local_numbers_follow_default_country():
+    assert canonical_phone("020 7946 0018", "GB") == "+442079460018"
+    assert canonical_phone("(212) 555-0187", "US") == "+12125550187"
+    assert canonical_phone("1 212 555 0187", "US") == "+12125550187"
+
+
+def test_local_numbers_guessed_without_default_country():
+    assert canonical_phone("01711222333") == "+8801711222333"
+    assert canonical_phone("212-555-0187") == "+12125550187"
+    # Too ambiguous to place without a country
+    assert canonical_phone("020 7946 0018") == ""
+
+
+def test_excel_float_cell():
+    assert canonical_phone("1711222333.0", "BD") == "+8801711222333"
+
+
+@pytest.mark.parametrize("raw", ["", "n/a", "12345", "+880 17", "0171122233344556677", "+999"])
+def test_invalid_numbers(raw):
+    assert canonical_phone(raw, "BD") == ""
+
+
+def test_unknown_default_country():
+    assert canonical_phone("020 7946 0018", "ZZ") == ""
+
+
+def test_canonical_phones_column():
+    phones = np.array(["01711222333", None, float("nan"), "+880 1711-222333", "12"], dtype=object)
+    assert canonical_phones(phones, "BD").tolist() == [
+        "+8801711222333",
+        "",
+        "",
+        "+8801711222333",
+        "",
+    ]
+
+
+def test_country_for_location():
+    assert country_for_location("restaurants in Dhaka") == "BD"
+    assert country_for_location("dentists, Brooklyn NY") == "US"
+    assert country_for_location("somewhere else") is None
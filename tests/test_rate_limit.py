@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from lead_scraper import RateLimiter, TokenBucket
+
+
+def test_bucket_hands_out_its_burst_without_waiting():
+    async def take_burst():
+        bucket = TokenBucket(rate=0.01, burst=3)
+        return [await bucket.acquire() for _ in range(3)], bucket.tokens
+
+    waits, tokens = asyncio.run(take_burst())
+    assert all(wait < 0.05 for wait in waits)
+    assert tokens < 1
+
+
+def test_bucket_waits_for_a_refill_once_empty():
+    async def take_past_burst():
+        bucket = TokenBucket(rate=50, burst=1)
+        await bucket.acquire()
+        return await bucket.acquire()
+
+    assert asyncio.run(take_past_burst()) >= 0.01
+
+
+def test_drain_drops_saved_tokens():
+    bucket = TokenBucket(rate=1, burst=4)
+    bucket.drain()
+    assert bucket.tokens <= 0
+
+
+def test_burst_is_at_least_one():
+    assert TokenBucket(rate=1, burst=0).burst == 1
+
+
+def test_clean_responses_raise_the_rate_additively_up_to_the_ceiling():
+    limiter = RateLimiter(rate=1.0, max_rate=1.2, increase=0.05)
+    for _ in range(3):
+        limiter.report("https://www.google.com/search?q=a")
+    assert limiter.bucket("google.com").rate == pytest.approx(1.15)
+    for _ in range(10):
+        limiter.report("https://www.google.com/maps")
+    assert limiter.bucket("google.com").rate == 1.2
+
+
+def test_errors_halve_the_rate_down_to_the_floor():
+    limiter = RateLimiter(rate=1.0, min_rate=0.2, decrease=0.5)
+    limiter.report("https://example.com/a", ok=False)
+    assert limiter.bucket("example.com").rate == 0.5
+    for _ in range(5):
+        limiter.report("https://example.com/a", ok=False)
+    assert limiter.bucket("example.com").rate == 0.2
+
+
+def test_captcha_also_empties_the_bucket():
+    limiter = RateLimiter(rate=1.0, burst=4)
+    limiter.report("https://www.google.com/sorry", blocked=True)
+    bucket = limiter.bucket("google.com")
+    assert bucket.rate == 0.5
+    assert bucket.tokens <= 0
+
+
+def test_hosts_are_limited_separately():
+    limiter = RateLimiter(rate=1.0)
+    limiter.report("https://www.google.com/", ok=False)
+    limiter.report("https://example.com/")
+    assert limiter.summary() == {"google.com": 0.5, "example.com": 1.05}
+
+
+def test_starting_rate_is_clamped_to_the_limits():
+    assert RateLimiter(rate=10, max_rate=4).bucket("a.com").rate == 4
+    assert RateLimiter(rate=0, min_rate=0.05).bucket("a.com").rate == 0.05
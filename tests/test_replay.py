@@ -0,0 +1,124 @@
+import asyncio
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from replay import ReplayServer, SnapshotRecorder, SnapshotStore, snapshot_key
+
+SERP = "https://www.google.com/search?q=dentists+dhaka&start=10&ei=abc&ved=0ahUKE"
+
+
+def test_snapshot_key_drops_per_visit_params():
+    assert snapshot_key(SERP) == snapshot_key("https://google.com/search?start=10&q=dentists+dhaka")
+    assert snapshot_key(SERP) != snapshot_key("https://www.google.com/search?q=dentists+dhaka")
+
+
+def test_snapshot_key_normalizes_host_and_path():
+    assert snapshot_key("https://WWW.Google.com/maps/search/star+kabab/") == "google.com/maps/search/star kabab"
+    assert snapshot_key("https://www.google.com") == "google.com/"
+
+
+class FakeRequest:
+    def __init__(self, resource_type):
+        self.resource_type = resource_type
+
+
+class FakeResponse:
+    def __init__(self, url, body, status=200, resource_type="document", content_type="text/html"):
+        self.url = url
+        self.status = status
+        self.request = FakeRequest(resource_type)
+        self.headers = {"content-type": content_type}
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+
+def test_recorded_run_replays_from_disk(tmp_path):
+    recorder = SnapshotRecorder(str(tmp_path / "fixtures"))
+    responses = [
+        FakeResponse(SERP, b"<html>page 2</html>"),
+        FakeResponse("https://www.google.com/maps/rpc", b'{"ok":1}', resource_type="xhr",
+                     content_type="application/json"),
+        # Subresources and failed loads are not recorded
+        FakeResponse("https://www.google.com/logo.png", b"png", resource_type="image"),
+        FakeResponse("https://www.google.com/sorry/index", b"captcha", status=429),
+    ]
+
+    async def record():
+        for response in responses:
+            await recorder._on_response(response)
+
+    asyncio.run(record())
+    recorder.save()
+
+    store = SnapshotStore.load(str(tmp_path / "fixtures"))
+    assert len(store) == 2
+    # A later visit to the same page carries different per-visit params
+    replayed = store.lookup("https://www.google.com/search?q=dentists+dhaka&start=10&ei=xyz")
+    assert replayed is not None and replayed.body == b"<html>page 2</html>"
+    assert store.lookup("https://www.google.com/maps/rpc").content_type == "application/json"
+    assert store.lookup("https://www.google.com/logo.png") is None
+
+    # Recording again into the same directory keeps what was there
+    assert len(SnapshotRecorder(str(tmp_path / "fixtures")).store) == 2
+
+
+def test_har_files_load_with_later_entries_winning(tmp_path):
+    def entry(url, text, **content):
+        return {"request": {"url": url}, "response": {"status": 200, "content": {"text": text, **content}}}
+
+    har = {
+        "log": {
+            "entries": [
+                entry(SERP, "old", mimeType="text/html"),
+                entry(SERP, "PGh0bWw+bmV3PC9odG1sPg==", encoding="base64", mimeType="text/html"),
+                {"request": {"url": "https://www.google.com/empty"}, "response": {"status": 204}},
+            ]
+        }
+    }
+    path = tmp_path / "run.har"
+    path.write_text(json.dumps(har))
+    store = SnapshotStore.load(str(path))
+    assert len(store) == 1
+    assert store.lookup(SERP).body == b"<html>new</html>"
+
+
+@pytest.fixture
+def server():
+    store = SnapshotStore()
+    store.add(SERP, "<html>results</html>")
+    store.add("https://www.google.com/maps/rpc", b'{"ok":1}', 201, "application/json")
+    with ReplayServer(store) as server:
+        yield server
+
+
+def test_server_answers_with_the_recorded_response(server):
+    with urllib.request.urlopen(server.replay_url(SERP)) as response:
+        assert response.status == 200
+        assert response.headers["Content-Type"] == "text/html; charset=utf-8"
+        assert response.read() == b"<html>results</html>"
+
+    post = urllib.request.Request(
+        server.replay_url("https://www.google.com/maps/rpc"), data=b"payload", method="POST"
+    )
+    with urllib.request.urlopen(post) as response:
+        assert response.status == 201
+        assert response.read() == b'{"ok":1}'
+
+    head = urllib.request.Request(server.replay_url(SERP), method="HEAD")
+    with urllib.request.urlopen(head) as response:
+        assert response.headers["Content-Length"] == str(len(b"<html>results</html>"))
+        assert response.read() == b""
+    assert server.hits == 3
+
+
+def test_server_404s_what_was_never_recorded(server):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(server.replay_url("https://www.google.com/search?q=other"))
+    assert error.value.code == 404
+    assert server.misses == 1
+    assert server.missed_urls == ["https://www.google.com/search?q=other"]
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from lead_scraper import BlockedError, RetryPolicy, classify_error
+
+
+@pytest.mark.parametrize(
+    "exc, expected",
+    [
+        (BlockedError("captcha"), "blocked"),
+        (PlaywrightTimeoutError("Timeout 30000ms exceeded"), "timeout"),
+        (asyncio.TimeoutError(), "timeout"),
+        (Exception("Target page, context or browser has been closed"), "target_closed"),
+        (Exception("page.goto: net::ERR_CONNECTION_RESET"), "network"),
+        (KeyError("href"), "parse"),
+        (Exception("page.evaluate: TypeError: Cannot read properties of null"), "parse"),
+        (Exception("navigation timeout"), "timeout"),
+        (RuntimeError("something else"), "other"),
+    ],
+)
+def test_classify_error(exc, expected):
+    assert classify_error(exc) == expected
+
+
+class Flaky:
+    """Fails with ``error`` ``failures`` times, then returns "ok"."""
+
+    def __init__(self, error: Exception, failures: int):
+        self.error = error
+        self.failures = failures
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return "ok"
+
+
+def test_retries_until_success():
+    policy = RetryPolicy(base_delay=0)
+    operation = Flaky(Exception("net::ERR_TIMED_OUT"), failures=2)
+    assert asyncio.run(policy.run(operation)) == "ok"
+    assert operation.calls == 3
+    assert policy.summary() == {
+        "calls": 1,
+        "retries": 2,
+        "recovered": 1,
+        "gave_up": 0,
+        "budget_exhausted": 0,
+        "errors": {"network": 2},
+    }
+
+
+def test_gives_up_after_the_error_class_attempts():
+    policy = RetryPolicy(base_delay=0)
+    operation = Flaky(KeyError("href"), failures=5)
+    with pytest.raises(KeyError):
+        asyncio.run(policy.run(operation))
+    # Parse errors are never retried
+    assert operation.calls == 1
+    assert policy.gave_up == 1
+
+
+def test_budget_caps_retries_across_calls():
+    policy = RetryPolicy(base_delay=0, min_budget=1, budget_ratio=0)
+    assert asyncio.run(policy.run(Flaky(Exception("net::ERR_FAILED"), failures=1))) == "ok"
+    operation = Flaky(Exception("net::ERR_FAILED"), failures=1)
+    with pytest.raises(Exception):
+        asyncio.run(policy.run(operation))
+    assert operation.calls == 1
+    assert policy.budget_exhausted == 1
+
+
+def test_backoff_grows_exponentially_with_jitter_and_a_cap():
+    policy = RetryPolicy(base_delay=1.0, max_delay=30.0)
+    for attempt, cap in ((1, 1.0), (2, 2.0), (3, 4.0)):
+        assert cap / 2 <= policy.backoff("timeout", attempt) <= cap
+    assert 15.0 <= policy.backoff("blocked", 3) <= 30.0
+    assert policy.backoff("parse", 1) == 0.0
+    # Unknown classes back off like "other"
+    assert 0.5 <= policy.backoff("mystery", 1) <= 1.0
@@ -0,0 +1,116 @@
+import sqlite3
+import time
+
+from conftest import lead
+from storage import DetailCache, LeadStore, SiteCache
+
+
+def test_richer_copy_replaces_the_current_one(tmp_path):
+    store = LeadStore(str(tmp_path / "leads.sqlite"), "BD")
+    assert store.add(lead(phone="01711222333"))
+    assert store.add(lead(phone="+880 1711-222333", website="https://starkabab.com"))
+    assert store.count() == 2
+    assert store.current_records() == [
+        lead(phone="+880 1711-222333", website="https://starkabab.com")
+    ]
+    store.close()
+
+
+def test_ties_keep_the_lead_already_stored(tmp_path):
+    store = LeadStore(str(tmp_path / "leads.sqlite"))
+    assert store.add(lead(email="info@starkabab.com"))
+    assert not store.add(lead(name="Star Kabab Dhanmondi", email="info@starkabab.com"))
+    assert [r["Business Name"] for r in store.current_records()] == ["Star Kabab"]
+    store.close()
+
+
+def test_poorer_copy_is_kept_but_not_current(tmp_path):
+    store = LeadStore(str(tmp_path / "leads.sqlite"))
+    store.add(lead(phone="01711222333", website="https://starkabab.com"))
+    assert not store.add(lead(website="https://starkabab.com"))
+    assert store.count() == 2
+    assert store.count(current_only=True) == 1
+    store.close()
+
+
+def test_new_lead_linking_two_businesses_keeps_one_current(tmp_path):
+    store = LeadStore(str(tmp_path / "leads.sqlite"))
+    store.add(lead(name="A", email="a@x.com"))
+    store.add(lead(name="B", website="https://b.com"))
+    assert store.add(lead(name="A", email="a@x.com", website="https://b.com", phone="01711222333"))
+    assert store.count(current_only=True) == 1
+    store.close()
+
+
+def test_place_id_matches_across_names(tmp_path):
+    store = LeadStore(str(tmp_path / "leads.sqlite"))
+    store.add(lead(name="Star Kabab", **{"Place ID": "0x1:0x2"}))
+    assert store.add(lead(name="Star Kabab & Restaurant", phone="01711222333", **{"Place ID": "0x1:0x2"}))
+    assert store.count(current_only=True) == 1
+    store.close()
+
+
+def test_country_view_reads_local_numbers_as_its_country(tmp_path):
+    store = LeadStore(str(tmp_path / "leads.sqlite"))
+    uk = store.for_country("GB")
+    assert uk.default_country == "GB" and store.default_country is None
+    uk.add(lead(name="Shop One", phone="020 7946 0018"))
+    assert not uk.add(lead(name="Shop Two", phone="+44 20 7946 0018"))
+    assert store.for_country(None) is store
+    store.close()
+
+
+def test_enriched_copy_with_only_new_socials_becomes_current(tmp_path):
+    store = LeadStore(str(tmp_path / "leads.sqlite"), "BD")
+    place = {"Place ID": "0x1:0x2"}
+    store.add(lead(phone="01711222333", website="https://starkabab.com", **place))
+    enriched = lead(
+        phone="01711222333",
+        website="https://starkabab.com",
+        Facebook="https://facebook.com/starkabab",
+        **place,
+    )
+    # The same score as the stored copy, so add() keeps the old one
+    assert store.update(enriched)
+    assert store.current_records() == [enriched]
+    assert store.count(current_only=True) == 1
+    store.close()
+
+
+def test_detail_cache_round_trip_and_expiry(tmp_path):
+    cache = DetailCache(str(tmp_path / "cache.sqlite"), ttl_hours=1)
+    cache.put("0x1:0x2", {"Phone Number": "01711222333"})
+    assert cache.get("0x1:0x2") == {"Phone Number": "01711222333"}
+    assert cache.get("0x1:0x3") is None
+    cache._conn.execute("UPDATE listing_details SET fetched_at = ?", (time.time() - 7200,))
+    assert cache.get("0x1:0x2") is None
+    assert cache.summary() == {"hits": 1, "misses": 1, "expired": 1}
+    cache.close()
+
+
+def test_detail_cache_opens_files_with_the_old_key_column(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE listing_details (place_key TEXT PRIMARY KEY, data TEXT NOT NULL, fetched_at REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO listing_details VALUES ('0x1:0x2', '{\"Website\": \"a.com\"}', ?)", (time.time(),))
+    conn.commit()
+    conn.close()
+    cache = DetailCache(path)
+    assert cache.get("0x1:0x2") == {"Website": "a.com"}
+    cache.put("0x1:0x3", {})
+    cache.close()
+
+
+def test_site_cache_is_separate_from_the_listing_cache(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    listings = DetailCache(path, ttl_hours=1)
+    sites = SiteCache(path, ttl_hours=24)
+    sites.put("site:starkabab.com", {"Email": "info@starkabab.com"})
+    assert listings.get("site:starkabab.com") is None
+    assert sites.get("site:starkabab.com") == {"Email": "info@starkabab.com"}
+    assert listings.summary()["misses"] == 1 and sites.summary()["hits"] == 1
+    assert sites.ttl_seconds == 24 * 3600
+    listings.close()
+    sites.close()
@@ -0,0 +1,43 @@
+import pytest
+
+from tiling import MapTile, grid_tiles, parse_bounds
+
+
+def test_grid_covers_the_bounds_row_by_row():
+    tiles = grid_tiles((0.0, 10.0, 2.0, 13.0), 2, 3)
+    assert len(tiles) == 6
+    assert tiles[0] == MapTile(0.0, 10.0, 1.0, 11.0)
+    assert tiles[-1] == MapTile(1.0, 12.0, 2.0, 13.0)
+    assert min(t.south for t in tiles) == 0.0 and max(t.north for t in tiles) == 2.0
+    assert min(t.west for t in tiles) == 10.0 and max(t.east for t in tiles) == 13.0
+
+
+def test_grid_is_square_by_default_and_at_least_one_tile():
+    assert len(grid_tiles((0, 0, 1, 1), 3)) == 9
+    assert grid_tiles((0, 0, 1, 1), 0) == [MapTile(0, 0, 1, 1)]
+
+
+def test_split_gives_four_deeper_quadrants():
+    quadrants = MapTile(0, 0, 2, 2).split()
+    assert [(q.south, q.west, q.north, q.east) for q in quadrants] == [
+        (0, 0, 1, 1),
+        (0, 1, 1, 2),
+        (1, 0, 2, 1),
+        (1, 1, 2, 2),
+    ]
+    assert {q.depth for q in quadrants} == {1}
+
+
+def test_tile_key_is_its_corners():
+    assert MapTile(23.69, 90.33, 23.9, 90.51, depth=2).key == "23.69000,90.33000,23.90000,90.51000"
+
+
+def test_parse_bounds():
+    assert parse_bounds("23.69, 90.33, 23.90, 90.51") == (23.69, 90.33, 23.90, 90.51)
+    assert parse_bounds("23.69;90.33;23.90;90.51") == (23.69, 90.33, 23.90, 90.51)
+
+
+@pytest.mark.parametrize("text", ["23.69,90.33,23.90", "23.90,90.33,23.69,90.51", "1,2,3,x"])
+def test_parse_bounds_rejects_bad_input(text):
+    with pytest.raises(ValueError):
+        parse_bounds(text)
@@ -0,0 +1,125 @@
+import math
+import re
+from dataclasses import dataclass
+
+# Rough south, west, north, east bounds of the areas searched most often, so
+# tiling them needs no geocoding round-trip
+CITY_BOUNDS = {
+    "dhaka": (23.69, 90.33, 23.90, 90.51),
+    "chittagong": (22.23, 91.72, 22.46, 91.90),
+    "chattogram": (22.23, 91.72, 22.46, 91.90),
+    "sylhet": (24.85, 91.82, 24.93, 91.92),
+    "khulna": (22.76, 89.50, 22.87, 89.60),
+    "rajshahi": (24.34, 88.55, 24.40, 88.65),
+    "brooklyn": (40.57, -74.04, 40.74, -73.83),
+    "new york": (40.49, -74.26, 40.92, -73.70),
+    "los angeles": (33.70, -118.67, 34.34, -118.15),
+}
+
+# "@23.8103,90.4125,14z" in a Maps URL
+VIEWPORT_REGEX = re.compile(r"@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?),(\d+(?:\.\d+)?)z")
+
+# Maps renders 256px world tiles; the map is assumed to fill a typical laptop viewport
+TILE_PX = 256
+VIEWPORT_SIZE = (1366, 768)
+
+
+@dataclass(frozen=True)
+class MapTile:
+    """A rectangle of the map searched as one Maps viewport."""
+
+    south: float
+    west: float
+    north: float
+    east: float
+    depth: int = 0
+
+    @property
+    def center(self) -> tuple[float, float]:
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    @property
+    def key(self) -> str:
+        """The tile's corners, which identify it in checkpoints."""
+        return f"{self.south:.5f},{self.west:.5f},{self.north:.5f},{self.east:.5f}"
+
+    @property
+    def zoom(self) -> int:
+        """The closest zoom at which the whole tile fits in the viewport."""
+        lat, _ = self.center
+        width, height = VIEWPORT_SIZE
+        lng_zoom = math.log2(width * 360 / (TILE_PX * max(self.east - self.west, 1e-6)))
+        lat_zoom = math.log2(
+            height * 360 * math.cos(math.radians(lat)) / (TILE_PX * max(self.north - self.south, 1e-6))
+        )
+        return max(3, min(20, math.floor(min(lng_zoom, lat_zoom))))
+
+    def viewport(self) -> str:
+        """The ``@lat,lng,zoomz`` part of a Maps URL centred on this tile."""
+        lat, lng = self.center
+        return f"@{lat:.6f},{lng:.6f},{self.zoom}z"
+
+    def split(self) -> list["MapTile"]:
+        """The tile's four quadrants, one level deeper."""
+        lat, lng = self.center
+        return [
+            MapTile(south, west, north, east, self.depth + 1)
+            for south, north in ((self.south, lat), (lat, self.north))
+            for west, east in ((self.west, lng), (lng, self.east))
+        ]
+
+
+def grid_tiles(bounds: tuple[float, float, float, float], rows: int, cols: int | None = None) -> list[MapTile]:
+    """Cut ``(south, west, north, east)`` into a ``rows`` x ``cols`` grid."""
+    south, west, north, east = bounds
+    rows = max(1, rows)
+    cols = max(1, rows if cols is None else cols)
+    lat_step = (north - south) / rows
+    lng_step = (east - west) / cols
+    return [
+        MapTile(
+            south + row * lat_step,
+            west + col * lng_step,
+            south + (row + 1) * lat_step,
+            west + (col + 1) * lng_step,
+        )
+        for row in range(rows)
+        for col in range(cols)
+    ]
+
+
+def parse_bounds(text: str) -> tuple[float, float, float, float]:
+    """Read "south,west,north,east" into a bounds tuple."""
+    parts = [float(part) for part in text.replace(";", ",").split(",")]
+    if len(parts) != 4:
+        raise ValueError(f"Expected south,west,north,east, got {text!r}")
+    south, west, north, east = parts
+    if south >= north or west >= east:
+        raise ValueError(f"Bounds {text!r} are empty; expected south,west,north,east")
+    return south, west, north, east
+
+
+def parse_viewport(url: str) -> tuple[float, float, float] | None:
+    """Return the ``(lat, lng, zoom)`` a Maps URL is centred on, if it has one."""
+    match = VIEWPORT_REGEX.search(url)
+    if match is None:
+        return None
+    return float(match.group(1)), float(match.group(2)), float(match.group(3))
+
+
+def bounds_from_viewport(lat: float, lng: float, zoom: float) -> tuple[float, float, float, float]:
+    """The area a viewport of VIEWPORT_SIZE shows at ``zoom`` around ``lat, lng``."""
+    width, height = VIEWPORT_SIZE
+    degrees_per_px = 360 / (TILE_PX * 2**zoom)
+    lng_half = width * degrees_per_px / 2
+    lat_half = height * degrees_per_px * math.cos(math.radians(lat)) / 2
+    return lat - lat_half, lng - lng_half, lat + lat_half, lng + lng_half
+
+
+def known_bounds(location: str) -> tuple[float, float, float, float] | None:
+    """Bounds from CITY_BOUNDS for the first city named in ``location``."""
+    location = location.lower()
+    for city, bounds in CITY_BOUNDS.items():
+        if city in location:
+            return bounds
+    return None